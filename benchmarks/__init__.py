@@ -0,0 +1,13 @@
+# coding=utf-8
+"""Benchmarks of the parser and the writers on synthetic ixf files.
+
+Run them with `python -m benchmarks.run`, see `benchmarks/README.md`.
+"""
+from pathlib import Path
+
+# Root directory
+BENCHMARKS_DIR = Path(__file__).resolve().parent  # PROJECT_DIR/benchmarks
+ROOT_DIR = BENCHMARKS_DIR.parent
+
+# Target directory of the generated files and of the results
+TARGET_DIR = ROOT_DIR / "target" / "benchmarks"
@@ -0,0 +1,395 @@
+# coding=utf-8
+"""Generator of synthetic PC/IXF files.
+
+The files contain the header (H), table (T), column descriptor (C) and data
+(D) records read by the parser. The number of rows, the width of the table,
+the mix of data types, the rate of nulls, the distribution of the varchar
+lengths and the code pages of the character columns are configurable. The
+values are drawn from a seeded random generator: `iter_rows` gives back the
+values written to a file, e.g. to check what the parser reads.
+"""
+import random
+import string
+from datetime import datetime, time, timedelta
+from db2ixf.packers import DATA_RECORD_SIZE, DBCS_CODE_PAGE, get_ixf_columns
+from decimal import Decimal
+from itertools import islice
+from os import PathLike
+from pathlib import Path
+from typing import (
+    Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union,
+)
+
+TYPE_MIXES: Dict[str, List[int]] = {
+    "all": [
+        496, 500, 492, 484, 480, 452, 448, 456, 464, 408, 404, 912, 384, 388,
+        392,
+    ],
+    "numeric": [496, 500, 492, 484, 480],
+    "text": [452, 448, 456, 464, 408],
+    "binary": [912, 404],
+    "temporal": [384, 388, 392],
+}
+"""IXF data types of each mix, cycled over the columns of the table. `all`
+contains every data type having a collector."""
+
+CODE_PAGES = (1208, 819, 1252, 37, 500)
+"""Single-byte code pages of the character columns, cycled over the columns:
+UTF-8, latin-1, windows latin-1 and two EBCDIC code pages."""
+
+VARCHAR_LENGTHS: Dict[str, Callable[[random.Random, int], int]] = {
+    "uniform": lambda rng, m: rng.randint(0, m),
+    "short": lambda rng, m: min(m, int(rng.expovariate(1 / 8))),
+    "long": lambda rng, m: rng.randint(m * 3 // 4, m),
+    "skewed": lambda rng, m: m if rng.random() < 0.05
+    else rng.randint(0, max(m // 10, 1)),
+}
+"""Distributions of the lengths of the varying-length strings and binaries,
+as functions of the random generator and of the maximum length."""
+
+LENGTHS: Dict[int, int] = {
+    384: 10, 388: 8, 392: 6, 404: 1024, 408: 1024, 448: 64, 452: 16,
+    456: 256, 464: 32, 480: 8, 492: 8, 496: 4, 500: 2, 912: 16,
+}
+"""Default length of each data type: maximum length of the strings and the
+binaries, fractional digits of the timestamps, bytes of the numbers."""
+
+DECIMAL_PRECISION = (15, 2)
+"""Precision and scale of the decimals."""
+
+NAMES: Dict[int, str] = {
+    384: "DATE", 388: "TIME", 392: "TIMESTAMP", 404: "BLOB", 408: "CLOB",
+    448: "VARCHAR", 452: "CHAR", 456: "LONGVARCHAR", 464: "VARGRAPHIC",
+    480: "FLOAT", 484: "DECIMAL", 492: "BIGINT", 496: "INTEGER",
+    500: "SMALLINT", 912: "BINARY",
+}
+
+_ALPHABET = string.ascii_letters + string.digits
+_LATIN = _ALPHABET + "éèàçüöäß"
+_ALPHABETS = {1208: _LATIN + "€漢字", 1200: _LATIN + "漢字かなカナ"}
+_EPOCH = datetime(2000, 1, 1)
+
+
+def _arrow_type(col_type: int, length: Any):
+    """Arrow data type of the values of an IXF data type."""
+    import pyarrow as pa
+
+    arrow_types = {
+        384: pa.date32(), 388: pa.time32("s"), 392: pa.timestamp("us"),
+        404: pa.large_binary(), 408: pa.large_string(), 448: pa.string(),
+        452: pa.string(), 456: pa.string(), 464: pa.string(),
+        492: pa.int64(), 496: pa.int32(), 500: pa.int16(),
+    }
+    if col_type == 484:
+        return pa.decimal128(*length)
+    if col_type == 480:
+        return pa.float32() if length == 4 else pa.float64()
+    if col_type == 912:
+        return pa.binary(length)
+    return arrow_types[col_type]
+
+
+def make_schema(
+    width: Optional[int] = None,
+    mix: Union[str, Sequence[int]] = "all",
+    nullable: bool = True,
+    code_pages: Sequence[int] = CODE_PAGES,
+    lengths: Optional[Dict[int, int]] = None
+) -> Tuple[Any, Dict[str, Dict[str, Any]]]:
+    """Describes a synthetic table for the IXF writer.
+
+    Parameters
+    ----------
+    width : int
+        Number of columns, defaults to the number of data types of the mix.
+    mix : Union[str, Sequence[int]]
+        Name of a mix of `TYPE_MIXES` or IXF data types, cycled over the
+        columns.
+    nullable : bool
+        If True, every other column is nullable.
+    code_pages : Sequence[int]
+        Single-byte code pages cycled over the character columns.
+    lengths : Dict[int, int]
+        Lengths overriding `LENGTHS` per data type.
+
+    Returns
+    -------
+    Tuple[Schema, Dict[str, Dict[str, Any]]]
+        Pyarrow schema and the IXF data type, length and code page of each
+        column (see `db2ixf.packers.get_ixf_columns`).
+    """
+    import pyarrow as pa
+
+    types = TYPE_MIXES[mix] if isinstance(mix, str) else list(mix)
+    width = width or len(types)
+    lengths = {**LENGTHS, **(lengths or {})}
+
+    fields, overrides, character = [], {}, 0
+    for i in range(width):
+        col_type = types[i % len(types)]
+        length = DECIMAL_PRECISION if col_type == 484 else lengths[col_type]
+        name = f"C{i + 1:03d}_{NAMES[col_type]}"
+        fields.append(
+            pa.field(name, _arrow_type(col_type, length),
+                     nullable=nullable and i % 2 == 1)
+        )
+        overrides[name] = {"type": col_type, "length": length}
+        if col_type in (408, 448, 452, 456):
+            overrides[name]["code_page"] = \
+                code_pages[character % len(code_pages)]
+            character += 1
+        elif col_type == 464:
+            overrides[name]["code_page"] = DBCS_CODE_PAGE
+    return pa.schema(fields), overrides
+
+
+def make_columns(
+    width: Optional[int] = None,
+    mix: Union[str, Sequence[int]] = "all",
+    nullable: bool = True,
+    code_pages: Sequence[int] = CODE_PAGES,
+    lengths: Optional[Dict[int, int]] = None,
+    record_size: int = DATA_RECORD_SIZE
+) -> List[Dict[str, Any]]:
+    """Describes the columns of a synthetic table.
+
+    Parameters
+    ----------
+    width : int
+        Number of columns, defaults to the number of data types of the mix.
+    mix : Union[str, Sequence[int]]
+        Name of a mix of `TYPE_MIXES` or IXF data types, cycled over the
+        columns.
+    nullable : bool
+        If True, every other column is nullable.
+    code_pages : Sequence[int]
+        Single-byte code pages cycled over the character columns.
+    lengths : Dict[int, int]
+        Lengths overriding `LENGTHS` per data type.
+    record_size : int
+        Maximum size of the columns of a data record, the columns of a row
+        are spread over several data records beyond it.
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        One description per column: `name`, `type`, `length`, `nullable`,
+        `sbcp`, `dbcp`, `drid` (data record) and `posn` (position in it).
+    """
+    schema, overrides = make_schema(width, mix, nullable, code_pages, lengths)
+    return get_ixf_columns(schema, overrides, record_size=record_size)
+
+
+def _text(rng: random.Random, size: int, code_page: int, max_bytes: int,
+          units: int = 1) -> str:
+    """Random text of `size` characters fitting in `max_bytes` bytes."""
+    alphabet = _ALPHABETS.get(code_page, _LATIN)
+    value = "".join(rng.choice(alphabet) for _ in range(size))
+    while len(value.encode(f"cp{code_page}")) > max_bytes * units:
+        value = value[:-1]
+    return value
+
+
+def _binary(rng: random.Random, size: int) -> bytes:
+    """Random bytes."""
+    return rng.getrandbits(8 * size).to_bytes(size, "little") if size else b""
+
+
+def _decimal(rng: random.Random, column: Dict[str, Any], _) -> Decimal:
+    """Random decimal of the precision and the scale of the column."""
+    precision, scale = column["length"]
+    unscaled = rng.randint(-10 ** precision + 1, 10 ** precision - 1)
+    return Decimal(unscaled).scaleb(-scale)
+
+
+def _varchar(
+    rng: random.Random,
+    column: Dict[str, Any],
+    varchar_lengths: Callable[[random.Random, int], int]
+) -> str:
+    """Random string of a varying-length column."""
+    length = column["length"]
+    if column["type"] == 464:
+        return _text(
+            rng, varchar_lengths(rng, length), column["dbcp"], length, 2
+        )
+    return _text(rng, varchar_lengths(rng, length), column["sbcp"], length)
+
+
+def _timestamp(rng: random.Random, *_) -> datetime:
+    """Random timestamp."""
+    return _EPOCH + timedelta(
+        seconds=rng.randint(0, 15000 * 86400),
+        microseconds=rng.randint(0, 999999)
+    )
+
+
+GENERATORS: Dict[int, Callable[..., Any]] = {
+    500: lambda rng, *_: rng.randint(-2 ** 15, 2 ** 15 - 1),
+    496: lambda rng, *_: rng.randint(-2 ** 31, 2 ** 31 - 1),
+    492: lambda rng, *_: rng.randint(-2 ** 63, 2 ** 63 - 1),
+    484: _decimal,
+    480: lambda rng, *_: rng.uniform(-1e6, 1e6),
+    452: lambda rng, c, _: _text(
+        rng, rng.randint(1, c["length"]), c["sbcp"], c["length"]
+    ),
+    408: _varchar,
+    448: _varchar,
+    456: _varchar,
+    464: _varchar,
+    912: lambda rng, c, _: _binary(rng, c["length"]),
+    404: lambda rng, c, lengths: _binary(rng, lengths(rng, c["length"])),
+    384: lambda rng, *_: (_EPOCH + timedelta(days=rng.randint(0, 15000)))
+    .date(),
+    388: lambda rng, *_: time(
+        rng.randint(0, 23), rng.randint(0, 59), rng.randint(0, 59)
+    ),
+    392: _timestamp,
+}
+"""Random value generator of each IXF data type, called with the random
+generator, the column and the distribution of the varchar lengths."""
+
+
+def _value(
+    rng: random.Random,
+    column: Dict[str, Any],
+    varchar_lengths: Callable[[random.Random, int], int]
+) -> Any:
+    """Random value of a column."""
+    generator = GENERATORS.get(column["type"])
+    if generator is None:
+        raise ValueError(f"No generator for the data type {column['type']}")
+    return generator(rng, column, varchar_lengths)
+
+
+def iter_rows(
+    columns: List[Dict[str, Any]],
+    rows: int,
+    null_rate: float = 0.1,
+    varchar_lengths: str = "uniform",
+    seed: int = 0
+) -> Iterator[List[Any]]:
+    """Yields the values of the rows of a synthetic table.
+
+    Parameters
+    ----------
+    columns : List[Dict[str, Any]]
+        Columns of the table, see `make_columns`.
+    rows : int
+        Number of rows.
+    null_rate : float
+        Probability of a null in a nullable column.
+    varchar_lengths : str
+        Distribution of the lengths of the varying-length columns, see
+        `VARCHAR_LENGTHS`.
+    seed : int
+        Seed of the random generator.
+
+    Yields
+    ------
+    List[Any]
+        Values of a row, None for nulls.
+    """
+    rng = random.Random(seed)
+    lengths = VARCHAR_LENGTHS[varchar_lengths]
+    for _ in range(rows):
+        yield [
+            None if c["nullable"] and rng.random() < null_rate
+            else _value(rng, c, lengths)
+            for c in columns
+        ]
+
+
+def generate_ixf(
+    path: Union[str, Path, PathLike],
+    rows: int,
+    width: Optional[int] = None,
+    mix: Union[str, Sequence[int]] = "all",
+    null_rate: float = 0.1,
+    varchar_lengths: str = "uniform",
+    code_pages: Sequence[int] = CODE_PAGES,
+    lengths: Optional[Dict[int, int]] = None,
+    record_size: int = DATA_RECORD_SIZE,
+    seed: int = 0,
+    batch_size: int = 10000
+) -> List[Dict[str, Any]]:
+    """Writes a synthetic ixf file.
+
+    Parameters
+    ----------
+    path : Union[str, Path, PathLike]
+        Path of the ixf file.
+    rows : int
+        Number of rows.
+    width : int
+        Number of columns, defaults to the number of data types of the mix.
+    mix : Union[str, Sequence[int]]
+        Name of a mix of `TYPE_MIXES` or IXF data types.
+    null_rate : float
+        Probability of a null in a nullable column (every other column).
+    varchar_lengths : str
+        Distribution of the lengths of the varying-length columns, see
+        `VARCHAR_LENGTHS`.
+    code_pages : Sequence[int]
+        Single-byte code pages cycled over the character columns.
+    lengths : Dict[int, int]
+        Lengths overriding `LENGTHS` per data type.
+    record_size : int
+        Maximum size of the columns of a data record.
+    seed : int
+        Seed of the random generator.
+    batch_size : int
+        Number of rows packed at once by the writer.
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        Columns of the table, see `make_columns`.
+    """
+    import pyarrow as pa
+    from db2ixf.writers import IXFBatchWriter
+
+    schema, overrides = make_schema(
+        width=width,
+        mix=mix,
+        nullable=null_rate > 0,
+        code_pages=code_pages,
+        lengths=lengths
+    )
+    writer = IXFBatchWriter(
+        path,
+        schema,
+        table_name=Path(path).name,
+        columns=overrides,
+        record_size=record_size
+    )
+    values = iter_rows(
+        writer.columns,
+        rows,
+        null_rate=null_rate,
+        varchar_lengths=varchar_lengths,
+        seed=seed
+    )
+    try:
+        while True:
+            batch = list(islice(values, batch_size))
+            if not batch:
+                break
+            writer.write(
+                pa.RecordBatch.from_arrays(
+                    [pa.array(c, f.type) for c, f in zip(zip(*batch), schema)],
+                    schema=schema
+                )
+            )
+    except BaseException as error:
+        writer.abort(error)
+        raise
+    writer.close()
+    return writer.columns
+
+
+__all__ = [
+    "CODE_PAGES", "DECIMAL_PRECISION", "GENERATORS", "LENGTHS", "NAMES",
+    "TYPE_MIXES", "VARCHAR_LENGTHS", "generate_ixf", "iter_rows",
+    "make_columns", "make_schema",
+]
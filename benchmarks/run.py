@@ -0,0 +1,316 @@
+# coding=utf-8
+"""Measures the rows/s and the peak memory of the parser and of the writers.
+
+Every case parses a synthetic ixf file (see `benchmarks.generator`) in a
+fresh process, the best time of `--repeat` runs and the highest peak memory
+are kept. Results are stored as json, `--compare` checks them against the
+results of a previous release:
+
+    python -m benchmarks.run --rows 100000 --output results.json
+    python -m benchmarks.run --compare target/benchmarks/results-0.17.0.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+from benchmarks import TARGET_DIR
+from benchmarks.generator import (
+    CODE_PAGES, TYPE_MIXES, VARCHAR_LENGTHS, generate_ixf,
+)
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+def _count_rows(parser, output: Path) -> int:  # noqa
+    return sum(1 for _ in parser.get_row())
+
+
+def _count_batch_rows(parser, output: Path) -> int:  # noqa
+    return sum(b.num_rows for b in parser.get_pyarrow_record_batch())
+
+
+CASES: Dict[str, Callable[[Any, Path], Any]] = {
+    "get_row": _count_rows,
+    "get_pyarrow_record_batch": _count_batch_rows,
+    "to_json": lambda p, o: p.to_json(o / "output.json"),
+    "to_jsonline": lambda p, o: p.to_jsonline(o / "output.jsonl"),
+    "to_csv": lambda p, o: p.to_csv(o / "output.csv"),
+    "to_parquet": lambda p, o: p.to_parquet(o / "output.parquet"),
+    "to_parquet_dataset": lambda p, o: p.to_parquet_dataset(o / "dataset"),
+    "to_arrow_ipc": lambda p, o: p.to_arrow_ipc(o / "output.arrow"),
+    "to_orc": lambda p, o: p.to_orc(o / "output.orc"),
+    "to_deltalake": lambda p, o: p.to_deltalake(str(o / "deltalake")),
+}
+"""Benchmarked methods of the parser: the two ways of reading the rows and
+every writer."""
+
+
+def _peak_rss() -> Optional[int]:
+    """Peak resident memory of the process in bytes (None if unknown)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_case(
+    case: str,
+    path: Path,
+    directory: Path,
+    batch_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """Runs a case, it is meant to run in a fresh process.
+
+    Parameters
+    ----------
+    case : str
+        Name of the case, see `CASES`.
+    path : Path
+        Path of the ixf file.
+    directory : Path
+        Empty directory of the outputs.
+    batch_size : int
+        Batch size of the parser, defaults to its estimation.
+
+    Returns
+    -------
+    Dict[str, Any]
+        `seconds`, `rows`, `peak_rss_bytes` (peak resident memory of the
+        process), `rss_growth_bytes` (its growth during the case) and
+        `peak_arrow_bytes` (peak of the arrow memory pool).
+    """
+    from db2ixf import IXFParser
+    from pyarrow import default_memory_pool
+
+    import_rss = _peak_rss()
+    parser = IXFParser(path)
+    if batch_size is not None:
+        parser.opt_batch_size = batch_size
+
+    start = perf_counter()
+    CASES[case](parser, directory)
+    seconds = perf_counter() - start
+
+    peak_rss = _peak_rss()
+    return {
+        "seconds": seconds,
+        "rows": parser.number_rows,
+        "peak_rss_bytes": peak_rss,
+        "rss_growth_bytes": peak_rss - import_rss
+        if peak_rss is not None else None,
+        "peak_arrow_bytes": default_memory_pool().max_memory(),
+    }
+
+
+def benchmark(
+    path: Path,
+    cases: Sequence[str],
+    repeat: int = 3,
+    batch_size: Optional[int] = None
+) -> Dict[str, Dict[str, Any]]:
+    """Runs the cases on an ixf file, each run in a fresh process.
+
+    Parameters
+    ----------
+    path : Path
+        Path of the ixf file.
+    cases : Sequence[str]
+        Names of the cases, see `CASES`.
+    repeat : int
+        Number of runs of each case: the best time and the highest peak
+        memory are kept.
+    batch_size : int
+        Batch size of the parser, defaults to its estimation.
+
+    Returns
+    -------
+    Dict[str, Dict[str, Any]]
+        Results of each case: `seconds`, `rows`, `rows_per_second`,
+        `bytes_per_second` and the peak memory (see `run_case`).
+    """
+    size = path.stat().st_size
+    directory = path.parent / "outputs"
+    results = {}
+    for case in cases:
+        runs = []
+        try:
+            for _ in range(repeat):
+                shutil.rmtree(directory, ignore_errors=True)
+                directory.mkdir(parents=True)
+                # A fresh process per run: imports, caches and peak memory
+                # of a run do not leak into the next one
+                context = get_context("spawn")
+                with ProcessPoolExecutor(1, mp_context=context) as e:
+                    runs.append(
+                        e.submit(run_case, case, path, directory, batch_size)
+                        .result()
+                    )
+        except Exception as error:
+            # e.g. an optional dependency missing or of another version
+            print(f"{case:<26} failed: {error!r}", file=sys.stderr)
+            results[case] = {"error": repr(error)}
+            continue
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+        best = min(r["seconds"] for r in runs)
+        result = {
+            "seconds": round(best, 6),
+            "rows": runs[0]["rows"],
+            "rows_per_second": round(runs[0]["rows"] / best, 3),
+            "bytes_per_second": round(size / best, 3),
+        }
+        for key in ("peak_rss_bytes", "rss_growth_bytes", "peak_arrow_bytes"):
+            values = [r[key] for r in runs if r[key] is not None]
+            result[key] = max(values) if values else None
+        results[case] = result
+        print(
+            f"{case:<26} {result['rows_per_second']:>14,.0f} rows/s "
+            f"{(result['peak_rss_bytes'] or 0) / 2 ** 20:>10,.1f} MiB",
+            file=sys.stderr
+        )
+    return results
+
+
+def compare(
+    results: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = 0.1
+) -> List[str]:
+    """Compares results with the results of a previous run.
+
+    Parameters
+    ----------
+    results : Dict[str, Any]
+        Results of this run.
+    baseline : Dict[str, Any]
+        Results of a previous run (e.g. the last release).
+    threshold : float
+        Tolerated relative loss of rows/s or growth of peak memory.
+
+    Returns
+    -------
+    List[str]
+        Regressions found, empty if none.
+    """
+    regressions = []
+    for case, new in results["results"].items():
+        old = baseline["results"].get(case)
+        if old is None or "error" in old or "error" in new:
+            continue
+        speed = new["rows_per_second"] / old["rows_per_second"]
+        line = f"{case:<26} rows/s x{speed:.2f}"
+        if speed < 1 - threshold:
+            regressions.append(f"{case}: rows/s x{speed:.2f}")
+        if new.get("rss_growth_bytes") and old.get("rss_growth_bytes"):
+            memory = new["rss_growth_bytes"] / old["rss_growth_bytes"]
+            line += f"   memory x{memory:.2f}"
+            if memory > 1 + threshold:
+                regressions.append(f"{case}: memory x{memory:.2f}")
+        print(line, file=sys.stderr)
+    return regressions
+
+
+def _version() -> str:
+    try:
+        from db2ixf._version import version
+        return version
+    except ImportError:
+        return "unknown"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Entry point of `python -m benchmarks.run`."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run",
+        description="Benchmark db2ixf on a synthetic ixf file."
+    )
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--width", type=int, default=None,
+                        help="Number of columns, defaults to the mix size.")
+    parser.add_argument("--mix", choices=sorted(TYPE_MIXES), default="all")
+    parser.add_argument("--null-rate", type=float, default=0.1)
+    parser.add_argument("--varchar-lengths", choices=sorted(VARCHAR_LENGTHS),
+                        default="uniform")
+    parser.add_argument("--code-pages", default=",".join(map(str, CODE_PAGES)),
+                        help="Comma separated single-byte code pages.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--cases", default=",".join(CASES),
+                        help="Comma separated cases.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, default=None,
+                        help="Json results, defaults to "
+                             "target/benchmarks/results-<version>.json.")
+    parser.add_argument("--compare", type=Path, default=None,
+                        help="Json results of a previous run.")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Tolerated relative regression.")
+    args = parser.parse_args(argv)
+
+    cases = [c.strip() for c in args.cases.split(",") if c.strip()]
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+
+    dataset = {
+        "rows": args.rows,
+        "width": args.width,
+        "mix": args.mix,
+        "null_rate": args.null_rate,
+        "varchar_lengths": args.varchar_lengths,
+        "code_pages": [int(c) for c in args.code_pages.split(",")],
+        "seed": args.seed,
+    }
+    name = "-".join(
+        str(v) for k, v in dataset.items() if k != "code_pages"
+    ) + "-" + "_".join(map(str, dataset["code_pages"]))
+    path = TARGET_DIR / "data" / name / "synthetic.ixf"
+    # Generating is slow, the files are kept between runs
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        print(f"Generating {path}", file=sys.stderr)
+        generate_ixf(path, **dataset)
+    dataset["file_size"] = path.stat().st_size
+
+    from pyarrow import __version__ as pyarrow_version
+
+    version = _version()
+    results = {
+        "db2ixf": version,
+        "python": platform.python_version(),
+        "pyarrow": pyarrow_version,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "dataset": dataset,
+        "results": benchmark(path, cases, args.repeat, args.batch_size),
+    }
+
+    output = args.output or TARGET_DIR / f"results-{version}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"Results written to {output}", file=sys.stderr)
+
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        if baseline.get("dataset") != dataset:
+            print("Warning: the datasets differ", file=sys.stderr)
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
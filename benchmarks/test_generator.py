@@ -0,0 +1,44 @@
+# coding=utf-8
+"""Checks the synthetic ixf files against the parser.
+
+They are not part of the tests of the package, run them from the root of the
+repository with `python -m pytest benchmarks`.
+"""
+import pytest
+from benchmarks.generator import TYPE_MIXES, generate_ixf, iter_rows
+from db2ixf import IXFParser
+
+
+@pytest.mark.parametrize(
+    "mix,varchar_lengths,record_size",
+    [("all", "uniform", 32000), ("text", "skewed", 32000), ("all", "long", 600)]
+)
+def test_synthetic_ixf(tmp_path, mix, varchar_lengths, record_size):
+    """Test the parser reads back the values of the synthetic ixf files."""
+    ixf_file = tmp_path / "synthetic.ixf"
+
+    columns = generate_ixf(
+        ixf_file,
+        200,
+        width=20,
+        mix=mix,
+        null_rate=0.2,
+        varchar_lengths=varchar_lengths,
+        record_size=record_size,
+        seed=7
+    )
+    expected = list(
+        iter_rows(columns, 200, null_rate=0.2,
+                  varchar_lengths=varchar_lengths, seed=7)
+    )
+
+    parser = IXFParser(ixf_file)
+    rows = [list(r.values()) for r in parser.get_row()]
+
+    assert parser.number_corrupted_rows == 0
+    assert rows == expected
+    assert any(v is None for r in rows for v in r)
+    assert {c["type"] for c in columns} == set(TYPE_MIXES[mix])
+    if record_size < 32000:
+        # The rows are spread over several data records
+        assert max(c["drid"] for c in columns) > 1
@@ -28,10 +28,34 @@ For more information about data types; Please visit this
 [link](https://www.ibm.com/docs/en/db2/11.5?topic=format-pcixf-data-types).
 """
 import codecs
-from db2ixf.ibmcodecs import search_functions
-from db2ixf.ixf import IXFParser
+from typing import TYPE_CHECKING
 
-for sf in search_functions:
-    codecs.register(sf)
+if TYPE_CHECKING:
+    from db2ixf.conversions import convert_many
+    from db2ixf.ixf import IXFParser
 
-__all__ = ["IXFParser"]
+
+def _search_ibm_codecs(name):
+    """Finds IBM code pages, `ibmcodecs` is imported at the first lookup."""
+    from db2ixf.ibmcodecs import search_function
+
+    return search_function(name)
+
+
+codecs.register(_search_ibm_codecs)
+
+
+def __getattr__(name):
+    """Imports the parser (pyarrow, ...) when it is used the first time."""
+    if name == "IXFParser":
+        from db2ixf.ixf import IXFParser
+
+        return IXFParser
+    if name == "convert_many":
+        from db2ixf.conversions import convert_many
+
+        return convert_many
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["IXFParser", "convert_many"]
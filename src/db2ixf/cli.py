@@ -1,12 +1,20 @@
 # coding=utf-8
 """CLI application of the IXF parser"""
 import logging
+import os
+import sys
 import typer
-from db2ixf import IXFParser
+# The commands import the parser (pyarrow, ...) when they run: `--help` and
+# `--version` stay fast
+from contextlib import contextmanager
 from db2ixf._version import version_tuple as vt
+from db2ixf.constants import DB2IXF_PARQUET_ROW_GROUP_BYTES
 from db2ixf.logger import logger
+from json import dumps
 from pathlib import Path
-from typing import Annotated, Optional
+from typing import (
+    Annotated, BinaryIO, Callable, Iterator, List, Literal, Optional, Union,
+)
 
 __version__ = f"{vt[0]}.{vt[1]}.{vt[2]}"
 
@@ -17,6 +25,77 @@ VERBOSE_MAPPING = {
     2: logging.DEBUG
 }
 
+
+STDIO = "-"
+"""Path of the standard input (FILE) or output (OUTPUT)."""
+
+
+def get_stdio(path: Path, mode: Literal["rb", "wb"]) -> Union[Path, BinaryIO]:
+    """Binary stdin (`rb`) or stdout (`wb`) if the path is `-`, else the path.
+
+    The standard streams are not closed with the parser or the writers.
+    """
+    if str(path) != STDIO:
+        return path
+    if mode == "rb":
+        return os.fdopen(sys.stdin.fileno(), mode=mode, closefd=False)
+    # Nothing written before the output may be left behind in the buffer
+    sys.stdout.flush()
+    return os.fdopen(sys.stdout.fileno(), mode=mode, closefd=False)
+
+
+@contextmanager
+def progress_bar(
+    enabled: bool
+) -> Iterator[Optional[Callable[[int, int, int, float], None]]]:
+    """Renders the progress of a conversion on stderr.
+
+    Yields
+    ------
+    Optional[Callable[[int, int, int, float], None]]
+        Progress callback of the parser, None when it is disabled.
+    """
+    if not enabled:
+        yield None
+        return
+
+    from rich.console import Console
+    from rich.progress import (
+        BarColumn, Progress, TaskProgressColumn, TextColumn,
+        TimeElapsedColumn, TimeRemainingColumn,
+    )
+
+    with Progress(
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TaskProgressColumn(),
+            TimeElapsedColumn(),
+            TextColumn("ETA"),
+            TimeRemainingColumn(),
+            TextColumn("{task.fields[rows]} rows"),
+            TextColumn("({task.fields[speed]} rows/s)"),
+            console=Console(stderr=True),
+    ) as bar:
+        task = bar.add_task("Converting", total=None, rows=0, speed=0)
+
+        def on_progress(bytes_read, total_bytes, rows, elapsed):
+            bar.update(
+                task,
+                completed=bytes_read,
+                # Unknown size (pipe): the bar pulses
+                total=total_bytes or None,
+                rows=rows,
+                speed=int(rows / elapsed) if elapsed else 0,
+            )
+
+        yield on_progress
+
+
+def print_stats(parser):
+    """Prints the stats of the parser as json on stderr."""
+    typer.echo(dumps(parser.stats.as_dict(), indent=2), err=True)
+
+
 app = typer.Typer(
     name="db2ixf",
     rich_markup_mode="markdown",
@@ -28,20 +107,76 @@ app = typer.Typer(
 def json(
     file: Annotated[Path,
                     typer.Argument(
-                        help="Path to the ixf FILE.",
+                        help="Path to the ixf FILE, `-` for stdin.",
                         exists=True,
+                        allow_dash=True,
                         dir_okay=False,
                         resolve_path=True,
                         rich_help_panel="Required Arguments",
                     )],
     output: Annotated[Optional[Path],
                       typer.Argument(
-                          help="Path to the `json` OUTPUT file.",
+                          help="Path to the `json` OUTPUT file, `-` for "
+                               "stdout.",
                           dir_okay=False,
                           readable=False,
+                          allow_dash=True,
                           resolve_path=True,
                           rich_help_panel="Optional Arguments",
                       )] = None,
+    backend: Annotated[Optional[str],
+                       typer.Option(
+                           "--backend",
+                           help="Json serializer backend: auto, orjson "
+                                "or json.",
+                           rich_help_panel="Command Options",
+                       )] = "auto",
+    binary_format: Annotated[Optional[str],
+                             typer.Option(
+                                 "--binary-format",
+                                 help="String representation of the binary "
+                                      "columns: base64 or hex.",
+                                 rich_help_panel="Command Options",
+                             )] = "base64",
+    batch_size: Annotated[Optional[int],
+                          typer.Option(
+                              "--batch-size",
+                              "-b",
+                              help="Size of the batch: number of "
+                                   "rows to extract before writing "
+                                   "to the json file, It is used "
+                                   "for memory optimization.",
+                              rich_help_panel="Command Options",
+                          )] = None,
+    compression: Annotated[Optional[str],
+                           typer.Option(
+                               "--compression",
+                               "-c",
+                               help="Compress the output: gzip, bz2 or "
+                                    "zstd.",
+                               rich_help_panel="Command Options",
+                           )] = None,
+    compression_level: Annotated[Optional[int],
+                                 typer.Option(
+                                     "--compression-level",
+                                     help="Compression level.",
+                                     rich_help_panel="Command Options",
+                                 )] = None,
+    progress: Annotated[Optional[bool],
+                        typer.Option(
+                            "--progress",
+                            help="Show a progress bar with the ETA and the "
+                                 "rows/s on stderr.",
+                            rich_help_panel="Command Options",
+                        )] = False,
+    stats: Annotated[Optional[bool],
+                     typer.Option(
+                         "--stats",
+                         help="Print the time spent in each stage of the "
+                              "parsing and the throughput as json on "
+                              "stderr.",
+                         rich_help_panel="Command Options",
+                     )] = False,
     verbose: Annotated[Optional[int],
                        typer.Option(
                            "--verbose",
@@ -54,11 +189,23 @@ def json(
     """
     Parse ixf ``FILE`` and convert it to a **json** ``OUTPUT``.
     """
+    from db2ixf.compressors import COMPRESSION_EXTENSIONS
+    from db2ixf.conversions import get_stem
+    from db2ixf.ixf import IXFParser
+
     if output is None:
         output = Path.cwd()
-        filename = f"{file.name.lower().removesuffix('.ixf')}.json"
+        filename = f"{get_stem(file)}.json"
+        if compression in COMPRESSION_EXTENSIONS:
+            filename += COMPRESSION_EXTENSIONS[compression]
         output /= filename
 
+    if backend is None:
+        backend = "auto"
+
+    if binary_format is None:
+        binary_format = "base64"
+
     if verbose > 2:
         logger.setLevel(VERBOSE_MAPPING[2])
     else:
@@ -67,8 +214,21 @@ def json(
     logger.info(f"IXF file: {file}")
     logger.info(f"JSON file: {output}")
 
-    parser = IXFParser(file)
-    parser.to_json(output)
+    logger.info(f"Compression: {compression} (level={compression_level})")
+
+    parser = IXFParser(get_stdio(file, "rb"), stats=stats)
+    with progress_bar(progress) as on_progress:
+        parser.to_json(
+            get_stdio(output, "wb"),
+            batch_size=batch_size,
+            backend=backend,
+            binary_format=binary_format,
+            compression=compression,
+            compression_level=compression_level,
+            on_progress=on_progress
+        )
+    if stats:
+        print_stats(parser)
     raise typer.Exit()
 
 
@@ -76,20 +236,92 @@ def json(
 def jsonline(
     file: Annotated[Path,
                     typer.Argument(
-                        help="Path to the ixf FILE.",
+                        help="Path to the ixf FILE, `-` for stdin.",
                         exists=True,
+                        allow_dash=True,
                         dir_okay=False,
                         resolve_path=True,
                         rich_help_panel="Required Arguments",
                     )],
     output: Annotated[Optional[Path],
                       typer.Argument(
-                          help="Path to the `jsonline` OUTPUT file.",
+                          help="Path to the `jsonline` OUTPUT file, `-` for "
+                               "stdout.",
                           dir_okay=False,
                           readable=False,
+                          allow_dash=True,
                           resolve_path=True,
                           rich_help_panel="Optional Arguments",
                       )] = None,
+    backend: Annotated[Optional[str],
+                       typer.Option(
+                           "--backend",
+                           help="Json serializer backend: auto, orjson "
+                                "or json.",
+                           rich_help_panel="Command Options",
+                       )] = "auto",
+    binary_format: Annotated[Optional[str],
+                             typer.Option(
+                                 "--binary-format",
+                                 help="String representation of the binary "
+                                      "columns: base64 or hex.",
+                                 rich_help_panel="Command Options",
+                             )] = "base64",
+    batch_size: Annotated[Optional[int],
+                          typer.Option(
+                              "--batch-size",
+                              "-b",
+                              help="Size of the batch: number of "
+                                   "rows to extract before writing "
+                                   "to the json file, It is used "
+                                   "for memory optimization.",
+                              rich_help_panel="Command Options",
+                          )] = None,
+    compression: Annotated[Optional[str],
+                           typer.Option(
+                               "--compression",
+                               "-c",
+                               help="Compress the output: gzip, bz2 or "
+                                    "zstd.",
+                               rich_help_panel="Command Options",
+                           )] = None,
+    compression_level: Annotated[Optional[int],
+                                 typer.Option(
+                                     "--compression-level",
+                                     help="Compression level.",
+                                     rich_help_panel="Command Options",
+                                 )] = None,
+    max_rows_per_file: Annotated[Optional[int],
+                                 typer.Option(
+                                     "--max-rows-per-file",
+                                     help="Split the output into numbered "
+                                          "files of at most this number of "
+                                          "rows.",
+                                     rich_help_panel="Command Options",
+                                 )] = None,
+    max_bytes_per_file: Annotated[Optional[int],
+                                  typer.Option(
+                                      "--max-bytes-per-file",
+                                      help="Split the output into numbered "
+                                           "files of about this number of "
+                                           "bytes.",
+                                      rich_help_panel="Command Options",
+                                  )] = None,
+    progress: Annotated[Optional[bool],
+                        typer.Option(
+                            "--progress",
+                            help="Show a progress bar with the ETA and the "
+                                 "rows/s on stderr.",
+                            rich_help_panel="Command Options",
+                        )] = False,
+    stats: Annotated[Optional[bool],
+                     typer.Option(
+                         "--stats",
+                         help="Print the time spent in each stage of the "
+                              "parsing and the throughput as json on "
+                              "stderr.",
+                         rich_help_panel="Command Options",
+                     )] = False,
     verbose: Annotated[Optional[int],
                        typer.Option(
                            "--verbose",
@@ -102,11 +334,23 @@ def jsonline(
     """
     Parse ixf ``FILE`` and convert it to a **jsonline** ``OUTPUT``.
     """
+    from db2ixf.compressors import COMPRESSION_EXTENSIONS
+    from db2ixf.conversions import get_stem
+    from db2ixf.ixf import IXFParser
+
     if output is None:
         output = Path.cwd()
-        filename = f"{file.name.lower().removesuffix('.ixf')}.jsonl"
+        filename = f"{get_stem(file)}.jsonl"
+        if compression in COMPRESSION_EXTENSIONS:
+            filename += COMPRESSION_EXTENSIONS[compression]
         output /= filename
 
+    if backend is None:
+        backend = "auto"
+
+    if binary_format is None:
+        binary_format = "base64"
+
     if verbose > 2:
         logger.setLevel(VERBOSE_MAPPING[2])
     else:
@@ -115,8 +359,25 @@ def jsonline(
     logger.info(f"IXF file: {file}")
     logger.info(f"JSON Line file: {output}")
 
-    parser = IXFParser(file)
-    parser.to_jsonline(output)
+    logger.info(f"Compression: {compression} (level={compression_level})")
+    logger.info(f"Max rows per file: {max_rows_per_file}")
+    logger.info(f"Max bytes per file: {max_bytes_per_file}")
+
+    parser = IXFParser(get_stdio(file, "rb"), stats=stats)
+    with progress_bar(progress) as on_progress:
+        parser.to_jsonline(
+            get_stdio(output, "wb"),
+            batch_size=batch_size,
+            backend=backend,
+            binary_format=binary_format,
+            compression=compression,
+            compression_level=compression_level,
+            max_rows_per_file=max_rows_per_file,
+            max_bytes_per_file=max_bytes_per_file,
+            on_progress=on_progress
+        )
+    if stats:
+        print_stats(parser)
     raise typer.Exit()
 
 
@@ -124,17 +385,20 @@ def jsonline(
 def csv(
     file: Annotated[Path,
                     typer.Argument(
-                        help="Path to the ixf FILE.",
+                        help="Path to the ixf FILE, `-` for stdin.",
                         exists=True,
+                        allow_dash=True,
                         dir_okay=False,
                         resolve_path=True,
                         rich_help_panel="Required Arguments",
                     )],
     output: Annotated[Optional[Path],
                       typer.Argument(
-                          help="Path to the `csv` OUTPUT file.",
+                          help="Path to the `csv` OUTPUT file, `-` for "
+                               "stdout.",
                           dir_okay=False,
                           readable=False,
+                          allow_dash=True,
                           resolve_path=True,
                           rich_help_panel="Optional Arguments",
                       )] = None,
@@ -155,6 +419,78 @@ def csv(
                                    "for memory optimization.",
                               rich_help_panel="Command Options",
                           )] = None,
+    quoting: Annotated[Optional[str],
+                       typer.Option(
+                           "--quoting",
+                           help="Quoting style of the values: needed, "
+                                "all_valid or none.",
+                           rich_help_panel="Command Options",
+                       )] = "needed",
+    null_string: Annotated[Optional[str],
+                           typer.Option(
+                               "--null",
+                               help="String representation of the null "
+                                    "values.",
+                               rich_help_panel="Command Options",
+                           )] = "",
+    header: Annotated[bool,
+                      typer.Option(
+                          "--header/--no-header",
+                          help="Write the column names as the first line.",
+                          rich_help_panel="Command Options",
+                      )] = True,
+    binary_format: Annotated[Optional[str],
+                             typer.Option(
+                                 "--binary-format",
+                                 help="String representation of the binary "
+                                      "columns: base64 or hex.",
+                                 rich_help_panel="Command Options",
+                             )] = "base64",
+    compression: Annotated[Optional[str],
+                           typer.Option(
+                               "--compression",
+                               "-c",
+                               help="Compress the output: gzip, bz2 or "
+                                    "zstd.",
+                               rich_help_panel="Command Options",
+                           )] = None,
+    compression_level: Annotated[Optional[int],
+                                 typer.Option(
+                                     "--compression-level",
+                                     help="Compression level.",
+                                     rich_help_panel="Command Options",
+                                 )] = None,
+    max_rows_per_file: Annotated[Optional[int],
+                                 typer.Option(
+                                     "--max-rows-per-file",
+                                     help="Split the output into numbered "
+                                          "files of at most this number of "
+                                          "rows.",
+                                     rich_help_panel="Command Options",
+                                 )] = None,
+    max_bytes_per_file: Annotated[Optional[int],
+                                  typer.Option(
+                                      "--max-bytes-per-file",
+                                      help="Split the output into numbered "
+                                           "files of about this number of "
+                                           "bytes.",
+                                      rich_help_panel="Command Options",
+                                  )] = None,
+    progress: Annotated[Optional[bool],
+                        typer.Option(
+                            "--progress",
+                            help="Show a progress bar with the ETA and the "
+                                 "rows/s on stderr.",
+                            rich_help_panel="Command Options",
+                        )] = False,
+    stats: Annotated[Optional[bool],
+                     typer.Option(
+                         "--stats",
+                         help="Print the time spent in each stage of the "
+                              "parsing and the throughput as json on "
+                              "stderr.",
+                         rich_help_panel="Command Options",
+                     )] = False,
     verbose: Annotated[Optional[int],
                        typer.Option(
                            "--verbose",
@@ -167,14 +503,29 @@ def csv(
     """
     Parse ixf ``FILE`` and convert it to a **csv** ``OUTPUT``.
     """
+    from db2ixf.compressors import COMPRESSION_EXTENSIONS
+    from db2ixf.conversions import get_stem
+    from db2ixf.ixf import IXFParser
+
     if output is None:
         output = Path.cwd()
-        filename = f"{file.name.lower().removesuffix('.ixf')}.csv"
+        filename = f"{get_stem(file)}.csv"
+        if compression in COMPRESSION_EXTENSIONS:
+            filename += COMPRESSION_EXTENSIONS[compression]
         output /= filename
 
     if sep is None:
         sep = "|"
 
+    if quoting is None:
+        quoting = "needed"
+
+    if null_string is None:
+        null_string = ""
+
+    if binary_format is None:
+        binary_format = "base64"
+
     if verbose > 2:
         logger.setLevel(VERBOSE_MAPPING[2])
     else:
@@ -184,8 +535,28 @@ def csv(
     logger.info(f"CSV file: {output}")
     logger.info(f"CSV file separator/delimiter: {sep}")
 
-    parser = IXFParser(file)
-    parser.to_csv(output, sep=sep, batch_size=batch_size)
+    logger.info(f"Compression: {compression} (level={compression_level})")
+    logger.info(f"Max rows per file: {max_rows_per_file}")
+    logger.info(f"Max bytes per file: {max_bytes_per_file}")
+
+    parser = IXFParser(get_stdio(file, "rb"), stats=stats)
+    with progress_bar(progress) as on_progress:
+        parser.to_csv(
+            get_stdio(output, "wb"),
+            sep=sep,
+            batch_size=batch_size,
+            quoting=quoting,
+            null_string=null_string,
+            header=header,
+            binary_format=binary_format,
+            compression=compression,
+            compression_level=compression_level,
+            max_rows_per_file=max_rows_per_file,
+            max_bytes_per_file=max_bytes_per_file,
+            on_progress=on_progress
+        )
+    if stats:
+        print_stats(parser)
     raise typer.Exit()
 
 
@@ -193,17 +564,20 @@ def csv(
 def parquet(
     file: Annotated[Path,
                     typer.Argument(
-                        help="Path to the ixf FILE.",
+                        help="Path to the ixf FILE, `-` for stdin.",
                         exists=True,
+                        allow_dash=True,
                         dir_okay=False,
                         resolve_path=True,
                         rich_help_panel="Required Arguments",
                     )],
     output: Annotated[Optional[Path],
                       typer.Argument(
-                          help="Path to the `parquet` OUTPUT file.",
+                          help="Path to the `parquet` OUTPUT file, `-` for "
+                               "stdout.",
                           dir_okay=False,
                           readable=False,
+                          allow_dash=True,
                           resolve_path=True,
                           rich_help_panel="Optional Arguments",
                       )] = None,
@@ -225,6 +599,101 @@ def parquet(
                                    "for memory optimization.",
                               rich_help_panel="Command Options",
                           )] = None,
+    queue_depth: Annotated[Optional[int],
+                           typer.Option(
+                               "--queue-depth",
+                               "-q",
+                               help="Number of batches buffered between "
+                                    "the parsing and the writer thread, "
+                                    "0 disables the writer thread.",
+                               rich_help_panel="Command Options",
+                           )] = None,
+    row_group_size: Annotated[Optional[int],
+                              typer.Option(
+                                  "--row-group-size",
+                                  help="Maximum number of rows of a row "
+                                       "group.",
+                                  rich_help_panel="Parquet Options",
+                              )] = None,
+    row_group_bytes: Annotated[Optional[int],
+                               typer.Option(
+                                   "--row-group-bytes",
+                                   help="Target size in bytes of a row "
+                                        "group, batches are coalesced "
+                                        "until they reach it.",
+                                   rich_help_panel="Parquet Options",
+                               )] = None,
+    compression: Annotated[Optional[str],
+                           typer.Option(
+                               "--compression",
+                               "-c",
+                               help="Compression codec: snappy, gzip, "
+                                    "brotli, zstd, lz4 or none.",
+                               rich_help_panel="Parquet Options",
+                           )] = "snappy",
+    compression_level: Annotated[Optional[int],
+                                 typer.Option(
+                                     "--compression-level",
+                                     help="Compression level of the codec.",
+                                     rich_help_panel="Parquet Options",
+                                 )] = None,
+    dictionary: Annotated[bool,
+                          typer.Option(
+                              "--dictionary/--no-dictionary",
+                              help="Enable dictionary encoding.",
+                              rich_help_panel="Parquet Options",
+                          )] = True,
+    dictionary_columns: Annotated[Optional[List[str]],
+                                  typer.Option(
+                                      "--dictionary-column",
+                                      help="Enable dictionary encoding only "
+                                           "for this column (repeatable).",
+                                      rich_help_panel="Parquet Options",
+                                  )] = None,
+    statistics: Annotated[bool,
+                          typer.Option(
+                              "--statistics/--no-statistics",
+                              help="Write column statistics.",
+                              rich_help_panel="Parquet Options",
+                          )] = True,
+    data_page_size: Annotated[Optional[int],
+                              typer.Option(
+                                  "--data-page-size",
+                                  help="Target size in bytes of the data "
+                                       "pages.",
+                                  rich_help_panel="Parquet Options",
+                              )] = None,
+    max_rows_per_file: Annotated[Optional[int],
+                                 typer.Option(
+                                     "--max-rows-per-file",
+                                     help="Split the output into numbered "
+                                          "files of at most this number of "
+                                          "rows.",
+                                     rich_help_panel="Command Options",
+                                 )] = None,
+    max_bytes_per_file: Annotated[Optional[int],
+                                  typer.Option(
+                                      "--max-bytes-per-file",
+                                      help="Split the output into numbered "
+                                           "files of about this number of "
+                                           "bytes.",
+                                      rich_help_panel="Command Options",
+                                  )] = None,
+    progress: Annotated[Optional[bool],
+                        typer.Option(
+                            "--progress",
+                            help="Show a progress bar with the ETA and the "
+                                 "rows/s on stderr.",
+                            rich_help_panel="Command Options",
+                        )] = False,
+    stats: Annotated[Optional[bool],
+                     typer.Option(
+                         "--stats",
+                         help="Print the time spent in each stage of the "
+                              "parsing and the throughput as json on "
+                              "stderr.",
+                         rich_help_panel="Command Options",
+                     )] = False,
     verbose: Annotated[Optional[int],
                        typer.Option(
                            "--verbose",
@@ -237,14 +706,22 @@ def parquet(
     """
     Parse ixf ``FILE`` and convert it to a **parquet** ``OUTPUT``.
     """
+    from db2ixf.conversions import get_stem
+    from db2ixf.ixf import IXFParser
+
     if output is None:
         output = Path.cwd()
-        filename = f"{file.name.lower().removesuffix('.ixf')}.parquet"
+        filename = f"{get_stem(file)}.parquet"
         output /= filename
 
     if parquet_version is None:
         parquet_version = "2.6"
 
+    if row_group_bytes is None:
+        row_group_bytes = DB2IXF_PARQUET_ROW_GROUP_BYTES
+
+    use_dictionary = dictionary_columns if dictionary_columns else dictionary
+
     if verbose > 2:
         logger.setLevel(VERBOSE_MAPPING[2])
     else:
@@ -254,16 +731,953 @@ def parquet(
     logger.info(f"PARQUET file: {output}")
     logger.info(f"PARQUET version: {parquet_version}")
     logger.info(f"Batch size: {batch_size}")
+    logger.info(f"Queue depth: {queue_depth}")
+    logger.info(f"Row group size: {row_group_size} rows")
+    logger.info(f"Row group size: {row_group_bytes} bytes")
+    logger.info(f"Compression: {compression} (level={compression_level})")
+    logger.info(f"Dictionary encoding: {use_dictionary}")
+    logger.info(f"Statistics: {statistics}")
+
+    logger.info(f"Max rows per file: {max_rows_per_file}")
+    logger.info(f"Max bytes per file: {max_bytes_per_file}")
+
+    parser = IXFParser(get_stdio(file, "rb"), stats=stats)
+    with progress_bar(progress) as on_progress:
+        parser.to_parquet(
+            get_stdio(output, "wb"),
+            parquet_version=parquet_version,
+            batch_size=batch_size,
+            queue_depth=queue_depth,
+            row_group_size=row_group_size,
+            row_group_bytes=row_group_bytes,
+            compression=compression,
+            compression_level=compression_level,
+            use_dictionary=use_dictionary,
+            write_statistics=statistics,
+            data_page_size=data_page_size,
+            max_rows_per_file=max_rows_per_file,
+            max_bytes_per_file=max_bytes_per_file,
+            on_progress=on_progress
+        )
+    if stats:
+        print_stats(parser)
+    raise typer.Exit()
+
+
+@app.command(name="parquet-dataset", epilog="Made with heart :D")
+def parquet_dataset(
+    file: Annotated[Path,
+                    typer.Argument(
+                        help="Path to the ixf FILE, `-` for stdin.",
+                        exists=True,
+                        allow_dash=True,
+                        dir_okay=False,
+                        resolve_path=True,
+                        rich_help_panel="Required Arguments",
+                    )],
+    output: Annotated[Optional[Path],
+                      typer.Argument(
+                          help="Path to the root directory of the "
+                               "`parquet` dataset OUTPUT.",
+                          file_okay=False,
+                          readable=False,
+                          resolve_path=True,
+                          rich_help_panel="Optional Arguments",
+                      )] = None,
+    partition_by: Annotated[Optional[List[str]],
+                            typer.Option(
+                                "--partition-by",
+                                "-p",
+                                help="Partition the dataset by this column "
+                                     "(repeatable).",
+                                rich_help_panel="Command Options",
+                            )] = None,
+    max_rows_per_file: Annotated[Optional[int],
+                                 typer.Option(
+                                     "--max-rows-per-file",
+                                     help="Roll to a new file after this "
+                                          "number of rows.",
+                                     rich_help_panel="Command Options",
+                                 )] = None,
+    max_bytes_per_file: Annotated[Optional[int],
+                                  typer.Option(
+                                      "--max-bytes-per-file",
+                                      help="Roll to a new file after about "
+                                           "this number of bytes.",
+                                      rich_help_panel="Command Options",
+                                  )] = None,
+    existing_data_behavior: Annotated[Optional[str],
+                                      typer.Option(
+                                          "--existing-data-behavior",
+                                          "-e",
+                                          help="error, overwrite_or_ignore "
+                                               "or delete_matching.",
+                                          rich_help_panel="Command Options",
+                                      )] = "error",
+    compression: Annotated[Optional[str],
+                           typer.Option(
+                               "--compression",
+                               "-c",
+                               help="Compression codec: snappy, gzip, "
+                                    "brotli, zstd, lz4 or none.",
+                               rich_help_panel="Command Options",
+                           )] = "snappy",
+    batch_size: Annotated[Optional[int],
+                          typer.Option(
+                              "--batch-size",
+                              "-b",
+                              help="Size of the batch: number of "
+                                   "rows to extract before writing "
+                                   "to the dataset, It is used "
+                                   "for memory optimization.",
+                              rich_help_panel="Command Options",
+                          )] = None,
+    progress: Annotated[Optional[bool],
+                        typer.Option(
+                            "--progress",
+                            help="Show a progress bar with the ETA and the "
+                                 "rows/s on stderr.",
+                            rich_help_panel="Command Options",
+                        )] = False,
+    stats: Annotated[Optional[bool],
+                     typer.Option(
+                         "--stats",
+                         help="Print the time spent in each stage of the "
+                              "parsing and the throughput as json on "
+                              "stderr.",
+                         rich_help_panel="Command Options",
+                     )] = False,
+    verbose: Annotated[Optional[int],
+                       typer.Option(
+                           "--verbose",
+                           "-v",
+                           metavar="",
+                           help="Counter for verbosity level.",
+                           count=True,
+                       )] = 0,
+):
+    """
+    Parse ixf ``FILE`` and convert it to a partitioned **parquet** dataset.
+    """
+    from db2ixf.conversions import get_stem
+    from db2ixf.ixf import IXFParser
+
+    if output is None:
+        output = Path.cwd()
+        output /= get_stem(file)
+
+    if existing_data_behavior is None:
+        existing_data_behavior = "error"
+
+    if verbose > 2:
+        logger.setLevel(VERBOSE_MAPPING[2])
+    else:
+        logger.setLevel(VERBOSE_MAPPING[verbose])
+
+    logger.info(f"IXF file: {file}")
+    logger.info(f"PARQUET dataset: {output}")
+    logger.info(f"Partition by: {partition_by}")
+    logger.info(f"Max rows per file: {max_rows_per_file}")
+    logger.info(f"Max bytes per file: {max_bytes_per_file}")
+
+    parser = IXFParser(get_stdio(file, "rb"), stats=stats)
+    with progress_bar(progress) as on_progress:
+        parser.to_parquet_dataset(
+            output,
+            partition_by=partition_by,
+            max_rows_per_file=max_rows_per_file,
+            max_bytes_per_file=max_bytes_per_file,
+            existing_data_behavior=existing_data_behavior,
+            compression=compression,
+            batch_size=batch_size,
+            on_progress=on_progress
+        )
+    if stats:
+        print_stats(parser)
+    raise typer.Exit()
+
+
+@app.command(name="arrow-ipc", epilog="Made with heart :D")
+def arrow_ipc(
+    file: Annotated[Path,
+                    typer.Argument(
+                        help="Path to the ixf FILE, `-` for stdin.",
+                        exists=True,
+                        allow_dash=True,
+                        dir_okay=False,
+                        resolve_path=True,
+                        rich_help_panel="Required Arguments",
+                    )],
+    output: Annotated[Optional[Path],
+                      typer.Argument(
+                          help="Path to the `arrow ipc` OUTPUT file, `-` for "
+                               "stdout.",
+                          dir_okay=False,
+                          readable=False,
+                          allow_dash=True,
+                          resolve_path=True,
+                          rich_help_panel="Optional Arguments",
+                      )] = None,
+    batch_size: Annotated[Optional[int],
+                          typer.Option(
+                              "--batch-size",
+                              "-b",
+                              help="Size of the batch: number of "
+                                   "rows to extract before writing "
+                                   "to the arrow ipc file, It is used "
+                                   "for memory optimization.",
+                              rich_help_panel="Command Options",
+                          )] = None,
+    queue_depth: Annotated[Optional[int],
+                           typer.Option(
+                               "--queue-depth",
+                               "-q",
+                               help="Number of batches buffered between "
+                                    "the parsing and the writer thread, "
+                                    "0 disables the writer thread.",
+                               rich_help_panel="Command Options",
+                           )] = None,
+    compression: Annotated[Optional[str],
+                           typer.Option(
+                               "--compression",
+                               "-c",
+                               help="Compress the record batches: lz4 or "
+                                    "zstd.",
+                               rich_help_panel="Command Options",
+                           )] = None,
+    progress: Annotated[Optional[bool],
+                        typer.Option(
+                            "--progress",
+                            help="Show a progress bar with the ETA and the "
+                                 "rows/s on stderr.",
+                            rich_help_panel="Command Options",
+                        )] = False,
+    stats: Annotated[Optional[bool],
+                     typer.Option(
+                         "--stats",
+                         help="Print the time spent in each stage of the "
+                              "parsing and the throughput as json on "
+                              "stderr.",
+                         rich_help_panel="Command Options",
+                     )] = False,
+    verbose: Annotated[Optional[int],
+                       typer.Option(
+                           "--verbose",
+                           "-v",
+                           metavar="",
+                           help="Counter for verbosity level.",
+                           count=True,
+                       )] = 0,
+):
+    """
+    Parse ixf ``FILE`` and convert it to an **arrow ipc** (feather) ``OUTPUT``.
+    """
+    from db2ixf.conversions import get_stem
+    from db2ixf.ixf import IXFParser
+
+    if output is None:
+        output = Path.cwd()
+        filename = f"{get_stem(file)}.arrow"
+        output /= filename
+
+    if verbose > 2:
+        logger.setLevel(VERBOSE_MAPPING[2])
+    else:
+        logger.setLevel(VERBOSE_MAPPING[verbose])
+
+    logger.info(f"IXF file: {file}")
+    logger.info(f"ARROW IPC file: {output}")
+    logger.info(f"Batch size: {batch_size}")
+    logger.info(f"Queue depth: {queue_depth}")
+    logger.info(f"Compression: {compression}")
+
+    parser = IXFParser(get_stdio(file, "rb"), stats=stats)
+    with progress_bar(progress) as on_progress:
+        parser.to_arrow_ipc(
+            get_stdio(output, "wb"),
+            batch_size=batch_size,
+            queue_depth=queue_depth,
+            compression=compression,
+            on_progress=on_progress
+        )
+    if stats:
+        print_stats(parser)
+    raise typer.Exit()
+
+
+@app.command(epilog="Made with heart :D")
+def orc(
+    file: Annotated[Path,
+                    typer.Argument(
+                        help="Path to the ixf FILE, `-` for stdin.",
+                        exists=True,
+                        allow_dash=True,
+                        dir_okay=False,
+                        resolve_path=True,
+                        rich_help_panel="Required Arguments",
+                    )],
+    output: Annotated[Optional[Path],
+                      typer.Argument(
+                          help="Path to the `orc` OUTPUT file, `-` for "
+                               "stdout.",
+                          dir_okay=False,
+                          readable=False,
+                          allow_dash=True,
+                          resolve_path=True,
+                          rich_help_panel="Optional Arguments",
+                      )] = None,
+    batch_size: Annotated[Optional[int],
+                          typer.Option(
+                              "--batch-size",
+                              "-b",
+                              help="Size of the batch: number of "
+                                   "rows to extract before writing "
+                                   "to the orc file, It is used "
+                                   "for memory optimization.",
+                              rich_help_panel="Command Options",
+                          )] = None,
+    queue_depth: Annotated[Optional[int],
+                           typer.Option(
+                               "--queue-depth",
+                               "-q",
+                               help="Number of batches buffered between "
+                                    "the parsing and the writer thread, "
+                                    "0 disables the writer thread.",
+                               rich_help_panel="Command Options",
+                           )] = None,
+    compression: Annotated[Optional[str],
+                           typer.Option(
+                               "--compression",
+                               "-c",
+                               help="Compression codec: uncompressed, "
+                                    "snappy, zlib, lz4 or zstd.",
+                               rich_help_panel="Command Options",
+                           )] = "snappy",
+    stripe_size: Annotated[Optional[int],
+                           typer.Option(
+                               "--stripe-size",
+                               help="Target size in bytes of a stripe.",
+                               rich_help_panel="Command Options",
+                           )] = None,
+    progress: Annotated[Optional[bool],
+                        typer.Option(
+                            "--progress",
+                            help="Show a progress bar with the ETA and the "
+                                 "rows/s on stderr.",
+                            rich_help_panel="Command Options",
+                        )] = False,
+    stats: Annotated[Optional[bool],
+                     typer.Option(
+                         "--stats",
+                         help="Print the time spent in each stage of the "
+                              "parsing and the throughput as json on "
+                              "stderr.",
+                         rich_help_panel="Command Options",
+                     )] = False,
+    verbose: Annotated[Optional[int],
+                       typer.Option(
+                           "--verbose",
+                           "-v",
+                           metavar="",
+                           help="Counter for verbosity level.",
+                           count=True,
+                       )] = 0,
+):
+    """
+    Parse ixf ``FILE`` and convert it to an **orc** ``OUTPUT``.
+    """
+    from db2ixf.conversions import get_stem
+    from db2ixf.ixf import IXFParser
+
+    if output is None:
+        output = Path.cwd()
+        filename = f"{get_stem(file)}.orc"
+        output /= filename
+
+    if compression is None:
+        compression = "snappy"
+
+    if verbose > 2:
+        logger.setLevel(VERBOSE_MAPPING[2])
+    else:
+        logger.setLevel(VERBOSE_MAPPING[verbose])
+
+    logger.info(f"IXF file: {file}")
+    logger.info(f"ORC file: {output}")
+    logger.info(f"Batch size: {batch_size}")
+    logger.info(f"Queue depth: {queue_depth}")
+    logger.info(f"Compression: {compression}")
+    logger.info(f"Stripe size: {stripe_size}")
+
+    parser = IXFParser(get_stdio(file, "rb"), stats=stats)
+    with progress_bar(progress) as on_progress:
+        parser.to_orc(
+            get_stdio(output, "wb"),
+            batch_size=batch_size,
+            queue_depth=queue_depth,
+            compression=compression,
+            stripe_size=stripe_size,
+            on_progress=on_progress
+        )
+    if stats:
+        print_stats(parser)
+    raise typer.Exit()
+
+
+@app.command(epilog="Made with heart :D")
+def convert(
+    file: Annotated[Path,
+                    typer.Argument(
+                        help="Path to the ixf FILE, `-` for stdin.",
+                        exists=True,
+                        allow_dash=True,
+                        dir_okay=False,
+                        resolve_path=True,
+                        rich_help_panel="Required Arguments",
+                    )],
+    outputs: Annotated[Optional[List[Path]],
+                       typer.Option(
+                           "--output",
+                           "-o",
+                           help="Output file (repeatable), its extension "
+                                "gives the format: json, jsonl, csv, "
+                                "parquet, arrow, feather or orc, optionally "
+                                "followed by gz, bz2 or zst.",
+                           dir_okay=False,
+                           resolve_path=True,
+                           rich_help_panel="Command Options",
+                       )] = None,
+    deltalakes: Annotated[Optional[List[Path]],
+                          typer.Option(
+                              "--deltalake",
+                              "-d",
+                              help="Deltalake table directory (repeatable).",
+                              file_okay=False,
+                              resolve_path=True,
+                              rich_help_panel="Command Options",
+                          )] = None,
+    batch_size: Annotated[Optional[int],
+                          typer.Option(
+                              "--batch-size",
+                              "-b",
+                              help="Size of the batch: number of "
+                                   "rows to extract before writing "
+                                   "to the outputs, It is used "
+                                   "for memory optimization.",
+                              rich_help_panel="Command Options",
+                          )] = None,
+    queue_depth: Annotated[Optional[int],
+                           typer.Option(
+                               "--queue-depth",
+                               "-q",
+                               help="Number of batches buffered for each "
+                                    "output writer thread.",
+                               rich_help_panel="Command Options",
+                           )] = None,
+    progress: Annotated[Optional[bool],
+                        typer.Option(
+                            "--progress",
+                            help="Show a progress bar with the ETA and the "
+                                 "rows/s on stderr.",
+                            rich_help_panel="Command Options",
+                        )] = False,
+    stats: Annotated[Optional[bool],
+                     typer.Option(
+                         "--stats",
+                         help="Print the time spent in each stage of the "
+                              "parsing and the throughput as json on "
+                              "stderr.",
+                         rich_help_panel="Command Options",
+                     )] = False,
+    verbose: Annotated[Optional[int],
+                       typer.Option(
+                           "--verbose",
+                           "-v",
+                           metavar="",
+                           help="Counter for verbosity level.",
+                           count=True,
+                       )] = 0,
+):
+    """
+    Parse ixf ``FILE`` once and convert it to **several** ``OUTPUTS``.
+    """
+    from db2ixf.ixf import IXFParser
+
+    specs = list(outputs or [])
+    specs += [{"output": d, "format": "deltalake"} for d in deltalakes or []]
+    if not specs:
+        raise typer.BadParameter("Give at least one --output or --deltalake")
+
+    if verbose > 2:
+        logger.setLevel(VERBOSE_MAPPING[2])
+    else:
+        logger.setLevel(VERBOSE_MAPPING[verbose])
+
+    logger.info(f"IXF file: {file}")
+    logger.info(f"Output files: {outputs}")
+    logger.info(f"Deltalake tables: {deltalakes}")
+    logger.info(f"Batch size: {batch_size}")
+    logger.info(f"Queue depth: {queue_depth}")
+
+    parser = IXFParser(get_stdio(file, "rb"), stats=stats)
+    with progress_bar(progress) as on_progress:
+        parser.convert(
+            specs,
+            batch_size=batch_size,
+            queue_depth=queue_depth,
+            on_progress=on_progress
+        )
+    if stats:
+        print_stats(parser)
+    raise typer.Exit()
+
 
-    parser = IXFParser(file)
-    parser.to_parquet(
-        output,
-        parquet_version=parquet_version,
-        batch_size=batch_size
+@app.command(epilog="Made with heart :D")
+def profile(
+    file: Annotated[Path,
+                    typer.Argument(
+                        help="Path to the ixf FILE, `-` for stdin.",
+                        exists=True,
+                        allow_dash=True,
+                        dir_okay=False,
+                        resolve_path=True,
+                        rich_help_panel="Required Arguments",
+                    )],
+    sort: Annotated[Optional[str],
+                    typer.Option(
+                        "--sort",
+                        "-s",
+                        help="Sort the columns (descending) by seconds, "
+                             "calls, avg_bytes, null_rate, fallbacks or "
+                             "errors, `none` keeps the order of the table.",
+                        rich_help_panel="Command Options",
+                    )] = "seconds",
+    as_json: Annotated[Optional[bool],
+                       typer.Option(
+                           "--json",
+                           help="Print the profile as json instead of a "
+                                "table.",
+                           rich_help_panel="Command Options",
+                       )] = False,
+    verbose: Annotated[Optional[int],
+                       typer.Option(
+                           "--verbose",
+                           "-v",
+                           metavar="",
+                           help="Counter for verbosity level.",
+                           count=True,
+                       )] = 0,
+):
+    """
+    Profile the collectors of each column of ixf ``FILE``: time, calls,
+    average size, null rate and decoding fallbacks.
+    """
+    from db2ixf.ixf import IXFParser
+
+    sort_keys = ["seconds", "calls", "avg_bytes", "null_rate", "fallbacks",
+                 "errors"]
+    if sort not in sort_keys + ["none"]:
+        raise typer.BadParameter(
+            f"--sort should be one of {', '.join(sort_keys)} or none"
+        )
+
+    if verbose > 2:
+        logger.setLevel(VERBOSE_MAPPING[2])
+    else:
+        logger.setLevel(VERBOSE_MAPPING[verbose])
+
+    logger.info(f"IXF file: {file}")
+
+    parser = IXFParser(get_stdio(file, "rb"), profile_columns=True)
+    for _ in parser.get_row():
+        pass
+    rows = parser.column_profile.as_rows(None if sort == "none" else sort)
+
+    if as_json:
+        typer.echo(dumps(rows, indent=2))
+        raise typer.Exit()
+
+    from rich.console import Console
+    from rich.table import Table
+
+    total = sum(r["seconds"] for r in rows) or 1.0
+    table = Table(
+        title=f"{parser.number_rows} rows, "
+              f"{parser.number_corrupted_rows} corrupted"
     )
+    table.add_column("Column", overflow="fold")
+    table.add_column("Type", overflow="fold")
+    table.add_column("Seconds", justify="right", no_wrap=True)
+    table.add_column("%", justify="right", no_wrap=True)
+    table.add_column("Calls", justify="right", no_wrap=True)
+    table.add_column("Bytes", justify="right", no_wrap=True)
+    table.add_column("Nulls", justify="right", no_wrap=True)
+    table.add_column("Fallbacks", justify="right", no_wrap=True)
+    table.add_column("Errors", justify="right", no_wrap=True)
+    for r in rows:
+        table.add_row(
+            r["column"],
+            r["type"],
+            f"{r['seconds']:.6f}",
+            f"{100 * r['seconds'] / total:.1f}",
+            str(r["calls"]),
+            f"{r['avg_bytes']:.1f}",
+            f"{100 * r['null_rate']:.1f}%",
+            str(r["fallbacks"]),
+            str(r["errors"]),
+        )
+    Console().print(table)
     raise typer.Exit()
 
 
+@app.command(epilog="Made with heart :D")
+def validate(
+    file: Annotated[Path,
+                    typer.Argument(
+                        help="Path to the ixf FILE, `-` for stdin.",
+                        exists=True,
+                        allow_dash=True,
+                        dir_okay=False,
+                        resolve_path=True,
+                        rich_help_panel="Required Arguments",
+                    )],
+    max_problems: Annotated[Optional[int],
+                            typer.Option(
+                                "--max-problems",
+                                "-n",
+                                min=1,
+                                help="Stop at this number of problems.",
+                                rich_help_panel="Command Options",
+                            )] = 10,
+    as_json: Annotated[Optional[bool],
+                       typer.Option(
+                           "--json",
+                           help="Print the result as json.",
+                           rich_help_panel="Command Options",
+                       )] = False,
+    verbose: Annotated[Optional[int],
+                       typer.Option(
+                           "--verbose",
+                           "-v",
+                           metavar="",
+                           help="Counter for verbosity level.",
+                           count=True,
+                       )] = 0,
+):
+    """
+    Check the structure of ixf ``FILE`` without decoding its data: record
+    types and lengths, positions of the columns, lengths of the varying
+    columns and the end of the file. Exits with 1 if a problem is found.
+    """
+    from db2ixf.ixf import IXFParser
+
+    if verbose > 2:
+        logger.setLevel(VERBOSE_MAPPING[2])
+    else:
+        logger.setLevel(VERBOSE_MAPPING[verbose])
+
+    logger.info(f"IXF file: {file}")
+
+    parser = IXFParser(get_stdio(file, "rb"))
+    result = parser.validate(max_problems)
+
+    if as_json:
+        typer.echo(dumps(result, indent=2))
+    else:
+        for problem in result["problems"]:
+            typer.echo(f"Offset {problem['offset']}: {problem['problem']}")
+        status = "valid" if result["valid"] else "not valid"
+        checked = "" if result["complete"] else ", stopped after " \
+                                                f"{max_problems} problems"
+        typer.echo(
+            f"{file.name}: {status}, {result['rows']} rows, "
+            f"{result['records']} records, {result['bytes_read']} bytes"
+            f"{checked}"
+        )
+    raise typer.Exit(code=0 if result["valid"] else 1)
+
+
+@app.command(epilog="Made with heart :D")
+def batch(
+    files: Annotated[Optional[List[str]],
+                     typer.Argument(
+                         help="Ixf FILES or glob patterns (e.g. "
+                              "'exports/**/*.ixf').",
+                         show_default=False,
+                         rich_help_panel="Required Arguments",
+                     )] = None,
+    output_dir: Annotated[Path,
+                          typer.Option(
+                              "--output-dir",
+                              "-o",
+                              help="Directory of the converted files.",
+                              file_okay=False,
+                              resolve_path=True,
+                              rich_help_panel="Command Options",
+                          )] = Path("."),
+    output_format: Annotated[Optional[str],
+                             typer.Option(
+                                 "--format",
+                                 "-f",
+                                 help="Output format: json, jsonline, csv, "
+                                      "parquet, arrow_ipc, orc, "
+                                      "parquet_dataset or deltalake.",
+                                 rich_help_panel="Command Options",
+                             )] = "parquet",
+    files_from: Annotated[Optional[Path],
+                          typer.Option(
+                              "--files-from",
+                              help="Text file listing the ixf files, one "
+                                   "per line.",
+                              exists=True,
+                              dir_okay=False,
+                              resolve_path=True,
+                              rich_help_panel="Command Options",
+                          )] = None,
+    workers: Annotated[Optional[int],
+                       typer.Option(
+                           "--workers",
+                           "-w",
+                           help="Number of worker processes, defaults to "
+                                "the number of cores.",
+                           rich_help_panel="Command Options",
+                       )] = None,
+    compression: Annotated[Optional[str],
+                           typer.Option(
+                               "--compression",
+                               "-c",
+                               help="Compression of the outputs (depends "
+                                    "on the format).",
+                               rich_help_panel="Command Options",
+                           )] = None,
+    batch_size: Annotated[Optional[int],
+                          typer.Option(
+                              "--batch-size",
+                              "-b",
+                              help="Size of the batch: number of "
+                                   "rows to extract before writing "
+                                   "to the outputs, It is used "
+                                   "for memory optimization.",
+                              rich_help_panel="Command Options",
+                          )] = None,
+    memory_budget: Annotated[Optional[int],
+                             typer.Option(
+                                 "--memory-budget",
+                                 "-m",
+                                 help="Maximum number of bytes of the ixf "
+                                      "files converted at the same time.",
+                                 rich_help_panel="Command Options",
+                             )] = None,
+    report: Annotated[Optional[Path],
+                      typer.Option(
+                          "--report",
+                          "-r",
+                          help="Path of the json summary report, defaults "
+                               "to `report.json` in the output directory.",
+                          dir_okay=False,
+                          resolve_path=True,
+                          rich_help_panel="Command Options",
+                      )] = None,
+    verbose: Annotated[Optional[int],
+                       typer.Option(
+                           "--verbose",
+                           "-v",
+                           metavar="",
+                           help="Counter for verbosity level.",
+                           count=True,
+                       )] = 0,
+):
+    """
+    Convert **many** ixf ``FILES`` in parallel using a process pool.
+    """
+    from db2ixf.conversions import convert_many
+
+    files = list(files or [])
+    if files_from is not None:
+        lines = files_from.read_text(encoding="utf-8").splitlines()
+        files += [line.strip() for line in lines if line.strip()]
+
+    if not files:
+        raise typer.BadParameter("Give ixf FILES or --files-from")
+
+    if output_format is None:
+        output_format = "parquet"
+
+    if report is None:
+        report = output_dir / "report.json"
+
+    options = {}
+    if compression is not None:
+        options["compression"] = compression
+
+    if verbose > 2:
+        logger.setLevel(VERBOSE_MAPPING[2])
+    else:
+        logger.setLevel(VERBOSE_MAPPING[verbose])
+
+    logger.info(f"IXF files: {files}")
+    logger.info(f"Output directory: {output_dir}")
+    logger.info(f"Output format: {output_format}")
+    logger.info(f"Workers: {workers}")
+    logger.info(f"Memory budget: {memory_budget}")
+    logger.info(f"Report: {report}")
+
+    results = convert_many(
+        files,
+        output_dir,
+        output_format=output_format,
+        options=options,
+        workers=workers,
+        batch_size=batch_size,
+        memory_budget=memory_budget,
+        report=report
+    )
+
+    failed = [r for r in results if r["status"] == "failed"]
+    typer.echo(
+        f"Converted {len(results) - len(failed)}/{len(results)} files, "
+        f"report: {report}"
+    )
+    for result in failed:
+        typer.echo(f"Failed: {result['file']}: {result['error']}", err=True)
+    raise typer.Exit(code=1 if failed else 0)
+
+
+@app.command(epilog="Made with heart :D")
+def db2move(
+    directory: Annotated[Path,
+                         typer.Argument(
+                             help="Directory of the db2move export "
+                                  "(containing db2move.lst).",
+                             exists=True,
+                             file_okay=False,
+                             resolve_path=True,
+                             rich_help_panel="Required Arguments",
+                         )],
+    output_dir: Annotated[Path,
+                          typer.Option(
+                              "--output-dir",
+                              "-o",
+                              help="Directory of the converted tables, one "
+                                   "sub-directory per schema.",
+                              file_okay=False,
+                              resolve_path=True,
+                              rich_help_panel="Command Options",
+                          )] = Path("."),
+    output_format: Annotated[Optional[str],
+                             typer.Option(
+                                 "--format",
+                                 "-f",
+                                 help="Output format: json, jsonline, csv, "
+                                      "parquet, arrow_ipc, orc, "
+                                      "parquet_dataset or deltalake.",
+                                 rich_help_panel="Command Options",
+                             )] = "parquet",
+    workers: Annotated[Optional[int],
+                       typer.Option(
+                           "--workers",
+                           "-w",
+                           help="Number of worker processes, defaults to "
+                                "the number of cores.",
+                           rich_help_panel="Command Options",
+                       )] = None,
+    compression: Annotated[Optional[str],
+                           typer.Option(
+                               "--compression",
+                               "-c",
+                               help="Compression of the outputs (depends "
+                                    "on the format).",
+                               rich_help_panel="Command Options",
+                           )] = None,
+    batch_size: Annotated[Optional[int],
+                          typer.Option(
+                              "--batch-size",
+                              "-b",
+                              help="Size of the batch: number of "
+                                   "rows to extract before writing "
+                                   "to the outputs, It is used "
+                                   "for memory optimization.",
+                              rich_help_panel="Command Options",
+                          )] = None,
+    memory_budget: Annotated[Optional[int],
+                             typer.Option(
+                                 "--memory-budget",
+                                 "-m",
+                                 help="Maximum number of bytes of the ixf "
+                                      "files converted at the same time.",
+                                 rich_help_panel="Command Options",
+                             )] = None,
+    report: Annotated[Optional[Path],
+                      typer.Option(
+                          "--report",
+                          "-r",
+                          help="Path of the json summary report, defaults "
+                               "to `report.json` in the output directory.",
+                          dir_okay=False,
+                          resolve_path=True,
+                          rich_help_panel="Command Options",
+                      )] = None,
+    verbose: Annotated[Optional[int],
+                       typer.Option(
+                           "--verbose",
+                           "-v",
+                           metavar="",
+                           help="Counter for verbosity level.",
+                           count=True,
+                       )] = 0,
+):
+    """
+    Convert all the tables of a **db2move** export ``DIRECTORY`` in parallel.
+    """
+    from db2ixf.exports import convert_db2move
+
+    if output_format is None:
+        output_format = "parquet"
+
+    if report is None:
+        report = output_dir / "report.json"
+
+    options = {}
+    if compression is not None:
+        options["compression"] = compression
+
+    if verbose > 2:
+        logger.setLevel(VERBOSE_MAPPING[2])
+    else:
+        logger.setLevel(VERBOSE_MAPPING[verbose])
+
+    logger.info(f"db2move export: {directory}")
+    logger.info(f"Output directory: {output_dir}")
+    logger.info(f"Output format: {output_format}")
+    logger.info(f"Workers: {workers}")
+    logger.info(f"Memory budget: {memory_budget}")
+    logger.info(f"Report: {report}")
+
+    results = convert_db2move(
+        directory,
+        output_dir,
+        output_format=output_format,
+        options=options,
+        workers=workers,
+        batch_size=batch_size,
+        memory_budget=memory_budget,
+        report=report
+    )
+
+    failed = [r for r in results if r["status"] == "failed"]
+    typer.echo(
+        f"Converted {len(results) - len(failed)}/{len(results)} tables, "
+        f"report: {report}"
+    )
+    for result in failed:
+        typer.echo(
+            f"Failed: {result['schema']}.{result['table']}: "
+            f"{result['error']}",
+            err=True
+        )
+    raise typer.Exit(code=1 if failed else 0)
+
+
 def version_callback(value: bool):
     if value:
         print(f"{__version__}")
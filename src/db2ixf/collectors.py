@@ -2,10 +2,15 @@
 """Collects data from the fields extracted from the data records (D)."""
 from datetime import date, datetime, time
 from db2ixf.exceptions import DataCollectorError
-from db2ixf.helpers import decode_cell, get_ccsid_from_column
-from decimal import Decimal
+from db2ixf.helpers import (
+    add_decode_diagnostic, decode_cell, get_ccsid_from_column,
+)
+from decimal import Context, Decimal
 from struct import unpack
-from typing import Union
+
+_DECIMAL_CONTEXT = Context(prec=31)
+"""Context of the decimals: DB2 decimals have at most 31 digits, the default
+context rounds to 28 digits."""
 
 
 def collect_binary(c, fields, pos) -> str:
@@ -107,8 +112,8 @@ def collect_bigint(c, fields, pos) -> int:  # noqa
     return field
 
 
-def collect_decimal(c, fields, pos) -> Union[int, float]:
-    """Collects DECIMAL data type from ixf as a integer or a float.
+def collect_decimal(c, fields, pos) -> Decimal:
+    """Collects DECIMAL data type from ixf as a decimal.
 
     Parameters
     ----------
@@ -121,15 +126,15 @@ def collect_decimal(c, fields, pos) -> Union[int, float]:
 
     Returns
     -------
-    Union[int, float]
-        Integer or Float.
+    Decimal
+        Exact decimal having the scale of the column (no rounding).
     """
     p = int(c["IXFCLENG"][0:3])
     s = int(c["IXFCLENG"][3:5])
     length = int((p + 2) / 2)
     field = fields[pos:pos + length]
 
-    dec = 0.0
+    dec = 0
     for b in range(0, min(len(field), length) - 1):
         dec = dec * 100 + int(field[b] >> 4) * 10 + int(field[b] & 0x0f)
     dec = dec * 10 + int(field[-1] >> 4)
@@ -137,10 +142,7 @@ def collect_decimal(c, fields, pos) -> Union[int, float]:
     if int(field[-1] & 0x0f) != 12:
         dec = -dec
 
-    if s == 0:
-        return Decimal(dec)
-
-    return Decimal(dec / pow(10, s))
+    return Decimal(dec).scaleb(-s, _DECIMAL_CONTEXT)
 
 
 def collect_floating_point(c, fields, pos) -> float:
@@ -211,10 +213,10 @@ def collect_char(c, fields, pos) -> str:
     field = fields[pos:pos + length]
 
     if dbcp != 0:
-        return decode_cell(field, dbcp, "d").strip()
+        return decode_cell(field, dbcp, "d", c).strip()
 
     if sbcp != 0:
-        return decode_cell(field, sbcp).strip()
+        return decode_cell(field, sbcp, c=c).strip()
 
     return str(field, "utf-8").strip()
 
@@ -255,10 +257,10 @@ def collect_varchar(c, fields, pos) -> str:
     field = fields[pos:pos + length]
 
     if dbcp != 0:
-        return decode_cell(field, dbcp, "d").strip()
+        return decode_cell(field, dbcp, "d", c).strip()
 
     if sbcp != 0:
-        return decode_cell(field, sbcp).strip()
+        return decode_cell(field, sbcp, c=c).strip()
 
     return str(field, "utf-8").strip()
 
@@ -298,10 +300,10 @@ def collect_longvarchar(c, fields, pos) -> str:
     field = fields[pos:pos + length]
 
     if dbcp != 0:
-        return decode_cell(field, dbcp, "d").strip()
+        return decode_cell(field, dbcp, "d", c).strip()
 
     if sbcp != 0:
-        return decode_cell(field, sbcp).strip()
+        return decode_cell(field, sbcp, c=c).strip()
 
     return str(field, "utf-8").strip()
 
@@ -342,7 +344,7 @@ def collect_vargraphic(c, fields, pos) -> str:
     field = fields[pos:pos + (length * 2)]
 
     if dbcp != 0:
-        return decode_cell(field, dbcp, "d").strip()
+        return decode_cell(field, dbcp, "d", c).strip()
 
     _msg = "The string in double-byte characters has DBCS code page " \
            "equals to 0 (unknown encoding)"
@@ -415,7 +417,9 @@ def collect_timestamp(c, fields, pos) -> datetime:  # noqa
     try:
         return datetime.strptime(field, "%Y-%m-%d-%H.%M.%S.%f")
     except ValueError:
-        return datetime.strptime(field, "%Y-%m-%d-%H.%M.%S")
+        value = datetime.strptime(field, "%Y-%m-%d-%H.%M.%S")
+        add_decode_diagnostic(c, "timestamp without fractional seconds")
+        return value
 
 
 def collect_clob(c, fields, pos) -> str:
@@ -455,10 +459,10 @@ def collect_clob(c, fields, pos) -> str:
     field = fields[pos:pos + length]
 
     if dbcp != 0:
-        return decode_cell(field, dbcp, "d").strip()
+        return decode_cell(field, dbcp, "d", c).strip()
 
     if sbcp != 0:
-        return decode_cell(field, sbcp).strip()
+        return decode_cell(field, sbcp, c=c).strip()
 
     msg = "CLOB data type can not be a bit string as BLOB, " \
           "the SBCP and DBCP should not simultaneously be equal to 0."
@@ -501,10 +505,10 @@ def collect_blob(c, fields, pos) -> str:
     field = fields[pos:pos + length]
 
     if dbcp != 0:
-        return decode_cell(field, dbcp, "d").strip()
+        return decode_cell(field, dbcp, "d", c).strip()
 
     if sbcp != 0:
-        return decode_cell(field, sbcp).strip()
+        return decode_cell(field, sbcp, c=c).strip()
 
     return field
 
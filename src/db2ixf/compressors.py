@@ -0,0 +1,411 @@
+# coding=utf-8
+"""Streaming compression of the outputs and decompression of the inputs."""
+import bz2
+import gzip
+import os
+import threading
+from contextlib import contextmanager
+from db2ixf.constants import (
+    DB2IXF_BUFFER_SIZE_CLOUD_PROVIDER, DB2IXF_READER_QUEUE_DEPTH,
+)
+from db2ixf.helpers import is_seekable
+from db2ixf.logger import logger
+from db2ixf.pipelines import BackgroundWriter
+from queue import Empty, Queue
+from typing import BinaryIO, Iterator, Literal, Optional
+
+COMPRESSION_EXTENSIONS = {
+    "gzip": ".gz",
+    "bz2": ".bz2",
+    "zstd": ".zst",
+}
+"""File extension of each supported compression."""
+
+COMPRESSION_MAGIC_NUMBERS = {
+    b"\x1f\x8b": "gzip",
+    b"BZh": "bz2",
+    b"\x28\xb5\x2f\xfd": "zstd",
+}
+"""Magic numbers at the beginning of the compressed files."""
+
+_EOF = object()
+"""Sentinel telling the parsing thread that the decompression is finished."""
+
+
+class ThreadedCompressor:
+    """Binary file-like object compressing and writing on a background thread.
+
+    Chunks given to `write` are queued and compressed by a dedicated thread
+    (zlib and bz2 release the GIL) while the caller formats the next chunks.
+
+    Attributes
+    ----------
+    stream : BinaryIO
+        Compressed stream (e.g. `gzip.GzipFile`) wrapping the output.
+    """
+
+    def __init__(self, stream: BinaryIO, queue_depth: Optional[int] = None):
+        """Init the threaded compressor.
+
+        Parameters
+        ----------
+        stream : BinaryIO
+            Compressed stream (e.g. `gzip.GzipFile`) wrapping the output.
+        queue_depth : int
+            Number of chunks buffered for the compression thread.
+        """
+        self.stream = stream
+        self.pipeline = BackgroundWriter(
+            stream.write,
+            queue_depth=queue_depth,
+            name="db2ixf-compressor"
+        ).start()
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def write(self, data: bytes) -> int:
+        # Copy: the caller may reuse its buffer once `write` returns
+        self.pipeline.submit(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        """Compresses the remaining chunks and writes the stream trailer."""
+        if self._closed:
+            return
+        self._closed = True
+        self.pipeline.close()
+        self.stream.close()
+
+    def abort(self):
+        """Drops the remaining chunks."""
+        self._closed = True
+        self.pipeline.abort()
+
+
+def _open_zstd_stream(
+    sink: BinaryIO,
+    level: Optional[int] = None,
+    threads: Optional[int] = None
+) -> BinaryIO:
+    """Opens a multi-threaded zstandard stream writer."""
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(
+            "`zstandard` is not installed, please install it using "
+            "`pip install zstandard`"
+        )
+
+    compressor = zstandard.ZstdCompressor(
+        level=3 if level is None else level,
+        threads=-1 if threads is None else threads,
+    )
+    return compressor.stream_writer(sink, closefd=False)
+
+
+@contextmanager
+def compressed_sink(
+    sink: BinaryIO,
+    compression: Optional[Literal["gzip", "bz2", "zstd"]] = None,
+    level: Optional[int] = None,
+    threads: Optional[int] = None
+) -> Iterator[BinaryIO]:
+    """Wraps a binary sink so everything written into it gets compressed.
+
+    gzip and bz2 compress on a background thread, zstd uses the
+    multi-threaded compressor of `zstandard` (optional dependency). Leaving
+    the context writes the trailer but does not close the sink.
+
+    Parameters
+    ----------
+    sink : BinaryIO
+        Binary file-like object receiving the compressed bytes.
+    compression : Optional[Literal["gzip", "bz2", "zstd"]]
+        Compression, None means no compression.
+    level : int
+        Compression level, defaults to the default level of the compression.
+    threads : int
+        Number of zstd compression threads, defaults to all the cores.
+
+    Yields
+    ------
+    BinaryIO
+        Binary file-like object to write the uncompressed bytes into.
+    """
+    if compression is None:
+        yield sink
+        return
+
+    if compression not in COMPRESSION_EXTENSIONS:
+        msg = f"Unknown compression `{compression}`, expecting one of " \
+              f"{list(COMPRESSION_EXTENSIONS)}"
+        raise ValueError(msg)
+
+    logger.debug(f"Compress the output using {compression} (level={level})")
+    if compression == "zstd":
+        stream = _open_zstd_stream(sink, level, threads)
+        try:
+            yield stream
+        finally:
+            stream.close()
+        return
+
+    if compression == "gzip":
+        stream = gzip.GzipFile(
+            fileobj=sink,
+            mode="wb",
+            compresslevel=6 if level is None else level,
+        )
+    else:
+        stream = bz2.BZ2File(
+            sink,
+            mode="wb",
+            compresslevel=9 if level is None else level,
+        )
+
+    compressor = ThreadedCompressor(stream)
+    try:
+        yield compressor
+    except BaseException:
+        compressor.abort()
+        raise
+    compressor.close()
+
+
+def detect_compression(
+    file: BinaryIO
+) -> Optional[Literal["gzip", "bz2", "zstd"]]:
+    """Detects the compression of an input using its magic number.
+
+    Parameters
+    ----------
+    file : BinaryIO
+        File-like object opened in read-binary mode, either seekable or
+        supporting `peek` (e.g. `StreamReader`).
+
+    Returns
+    -------
+    Optional[Literal["gzip", "bz2", "zstd"]]
+        Detected compression or None if the input is not compressed.
+    """
+    if hasattr(file, "peek") and not is_seekable(file):
+        head = file.peek(4)[:4]
+    else:
+        position = file.tell()
+        head = file.read(4)
+        file.seek(position)
+
+    for magic, compression in COMPRESSION_MAGIC_NUMBERS.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def _open_decompressed_stream(
+    raw: BinaryIO,
+    compression: Literal["gzip", "bz2", "zstd"]
+) -> BinaryIO:
+    """Opens a stream decompressing the raw (compressed) input."""
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=raw, mode="rb")
+
+    if compression == "bz2":
+        return bz2.BZ2File(raw, mode="rb")
+
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError(
+                "`zstandard` is not installed, please install it using "
+                "`pip install zstandard`"
+            )
+        return zstandard.ZstdDecompressor().stream_reader(raw, closefd=False)
+
+    msg = f"Unknown compression `{compression}`, expecting one of " \
+          f"{list(COMPRESSION_EXTENSIONS)}"
+    raise ValueError(msg)
+
+
+class DecompressedReader:
+    """Read-binary file-like object decompressing on a background thread.
+
+    A dedicated thread decompresses the input by chunks into a bounded queue
+    while the parser consumes the decompressed bytes, there is no need to
+    decompress the input to disk first. Offsets (`tell`) and size
+    (`compressed_size`) are the ones of the compressed input so the progress
+    and the batch size heuristics keep working.
+
+    Attributes
+    ----------
+    raw : BinaryIO
+        Compressed input opened in read-binary mode.
+    compression : Literal["gzip", "bz2", "zstd"]
+        Compression of the input.
+    """
+
+    mode = "rb"
+
+    def __init__(
+        self,
+        raw: BinaryIO,
+        compression: Literal["gzip", "bz2", "zstd"],
+        chunk_size: int = DB2IXF_BUFFER_SIZE_CLOUD_PROVIDER,
+        queue_depth: int = DB2IXF_READER_QUEUE_DEPTH
+    ):
+        """Init the decompressed reader.
+
+        Parameters
+        ----------
+        raw : BinaryIO
+            Compressed input opened in read-binary mode.
+        compression : Literal["gzip", "bz2", "zstd"]
+            Compression of the input.
+        chunk_size : int
+            Size in bytes of the decompressed chunks.
+        queue_depth : int
+            Number of decompressed chunks buffered for the parser.
+        """
+        self.raw = raw
+        self.compression = compression
+        self.chunk_size = chunk_size
+        self.queue_depth = queue_depth
+        self.compressed_size: int = self.__get_compressed_size()
+        self._queue: Optional[Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop: bool = False
+        self._buffer = bytearray()
+        self._pos: int = 0
+        self._eof: bool = False
+        self._closed: bool = False
+        self.__start()
+
+    def __get_compressed_size(self) -> int:
+        if not self.raw.seekable():
+            return 0
+        position = self.raw.tell()
+        size = self.raw.seek(0, os.SEEK_END)
+        self.raw.seek(position)
+        return size
+
+    def __run(self, stream: BinaryIO):
+        """Decompresses the input chunk by chunk into the queue."""
+        try:
+            while not self._stop:
+                chunk = stream.read(self.chunk_size)
+                if not chunk:
+                    break
+                self._queue.put(chunk)
+        except BaseException as err:  # noqa
+            logger.error(f"Decompression thread failed: {err}")
+            self._queue.put(err)
+        self._queue.put(_EOF)
+
+    def __start(self):
+        """Starts the decompression thread."""
+        self._stop = False
+        self._queue = Queue(maxsize=self.queue_depth)
+        self._buffer = bytearray()
+        self._pos = 0
+        self._eof = False
+        stream = _open_decompressed_stream(self.raw, self.compression)
+        self._thread = threading.Thread(
+            target=self.__run,
+            args=(stream,),
+            name="db2ixf-decompressor",
+            daemon=True
+        )
+        self._thread.start()
+        logger.debug(f"Decompression thread started ({self.compression})")
+
+    def __stop(self):
+        """Stops the decompression thread, unblocking it if needed."""
+        if self._thread is None:
+            return
+        self._stop = True
+        while self._thread.is_alive():
+            try:
+                self._queue.get_nowait()
+            except Empty:
+                self._thread.join(0.01)
+        self._thread = None
+
+    def __fill(self):
+        """Moves the next decompressed chunk into the read buffer."""
+        item = self._queue.get()
+        if item is _EOF:
+            self._eof = True
+            return
+        if isinstance(item, BaseException):
+            self._eof = True
+            raise item
+
+        # Drop consumed bytes to keep the buffer small
+        if self._pos:
+            del self._buffer[:self._pos]
+            self._pos = 0
+        self._buffer += item
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return self.raw.seekable()
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        """Reads `size` decompressed bytes (all remaining bytes if < 0)."""
+        if size is None or size < 0:
+            while not self._eof:
+                self.__fill()
+            size = len(self._buffer) - self._pos
+
+        while len(self._buffer) - self._pos < size and not self._eof:
+            self.__fill()
+
+        data = bytes(self._buffer[self._pos:self._pos + size])
+        self._pos += len(data)
+        return data
+
+    def tell(self) -> int:
+        """Offset in the compressed input (read ahead included)."""
+        return self.raw.tell()
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        """Only rewinding (seek(0)) is supported: it restarts decompression."""
+        if offset != 0 or whence != os.SEEK_SET:
+            raise OSError("Compressed input can only be rewound with seek(0)")
+
+        self.__stop()
+        self.raw.seek(0)
+        self.__start()
+        return 0
+
+    def close(self):
+        """Stops the decompression thread and closes the raw input."""
+        if self._closed:
+            return
+        self._closed = True
+        self.__stop()
+        self.raw.close()
+
+    def __enter__(self) -> "DecompressedReader":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+__all__ = [
+    "COMPRESSION_EXTENSIONS", "DecompressedReader", "ThreadedCompressor",
+    "compressed_sink", "detect_compression",
+]
@@ -135,6 +135,26 @@ if not (0 <= DB2IXF_ACCEPTED_CORRUPTION_RATE <= 100):
         "`DB2IXF_DATA_CORRUPTION_RATE` should be integer between 0 and 100"
     )
 
+DB2IXF_CORRUPTION_MIN_SAMPLE_SIZE: int = int(
+    os.getenv("DB2IXF_CORRUPTION_MIN_SAMPLE_SIZE", 1000)
+)
+"""Number of rows parsed before the rate of corrupted data is checked while
+parsing, the parsing stops as soon as the rate exceeds the accepted one."""
+
+if DB2IXF_CORRUPTION_MIN_SAMPLE_SIZE <= 0:
+    raise ValueError("`DB2IXF_CORRUPTION_MIN_SAMPLE_SIZE` should be > 0")
+
+RESYNC_READ_SIZE: int = 64 * 1024
+"""Bytes read at once when scanning for the next data record after a
+corrupted one (see the `resync` option of the parser)."""
+
+VALIDATION_READ_SIZE: int = 1024 * 1024
+"""Bytes read at once when the structure of an ixf file is validated."""
+
+PART_QUEUE_DEPTH: int = 4
+"""Record batches buffered between a worker process decoding a part of a
+multi-part input and the parser (see the `workers` option of the parser)."""
+
 MAX_SIZE_IXF_DATA_RECORD: int = 32 * 1024
 """See IBM Doc: Max size of the data area of a data record in ixf format is 
 around 32 KB.
@@ -170,3 +190,47 @@ DB2IXF_RISK_FACTOR: int = int(
 DB2IXF_TIME_ZONE = os.getenv("DB2IXF_TIME_ZONE")
 """Time zone where the db2 server is hosted or the one used when extracting the 
 ixf file. Default `None` means all timestamps are considered time zone naive."""
+
+DB2IXF_WRITER_QUEUE_DEPTH: int = int(
+    os.getenv("DB2IXF_WRITER_QUEUE_DEPTH", 4)
+)
+"""Number of batches buffered between the parsing thread and the writer
+thread. `0` disables the pipeline and writes in the parsing thread."""
+
+if DB2IXF_WRITER_QUEUE_DEPTH < 0:
+    raise ValueError("`DB2IXF_WRITER_QUEUE_DEPTH` should be >= 0")
+
+DB2IXF_PARQUET_ROW_GROUP_BYTES: int = int(
+    os.getenv("DB2IXF_PARQUET_ROW_GROUP_BYTES", 64 * 1024 * 1024)  # 64MB
+)
+"""Target size in bytes (in memory) of a parquet row group. Record batches are
+coalesced until they reach this size before being written as one row group."""
+
+if DB2IXF_PARQUET_ROW_GROUP_BYTES <= 0:
+    raise ValueError("`DB2IXF_PARQUET_ROW_GROUP_BYTES` should be > 0")
+
+DB2IXF_READER_QUEUE_DEPTH: int = int(
+    os.getenv("DB2IXF_READER_QUEUE_DEPTH", 4)
+)
+"""Number of decompressed chunks buffered between the decompression thread and
+the parsing thread when the ixf file is compressed."""
+
+if DB2IXF_READER_QUEUE_DEPTH <= 0:
+    raise ValueError("`DB2IXF_READER_QUEUE_DEPTH` should be > 0")
+
+DB2IXF_PROGRESS_INTERVAL: float = float(
+    os.getenv("DB2IXF_PROGRESS_INTERVAL", 0.5)
+)
+"""Minimum number of seconds between two calls of the progress callback."""
+
+if DB2IXF_PROGRESS_INTERVAL < 0:
+    raise ValueError("`DB2IXF_PROGRESS_INTERVAL` should be >= 0")
+
+DB2IXF_DIAGNOSTICS_SAMPLES: int = int(
+    os.getenv("DB2IXF_DIAGNOSTICS_SAMPLES", 10)
+)
+"""Number of decoding problems kept as examples in the summary logged at the
+end of a parsing, the other ones are only counted."""
+
+if DB2IXF_DIAGNOSTICS_SAMPLES < 0:
+    raise ValueError("`DB2IXF_DIAGNOSTICS_SAMPLES` should be >= 0")
@@ -0,0 +1,480 @@
+# coding=utf-8
+"""Conversion of many IXF files in parallel using a process pool."""
+import glob
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from db2ixf.compressors import COMPRESSION_EXTENSIONS
+from db2ixf.ixf import IXFParser
+from db2ixf.logger import logger
+from db2ixf.readers import MultiPartReader
+from os import PathLike
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+FORMAT_EXTENSIONS = {
+    "json": ".json",
+    "jsonline": ".jsonl",
+    "csv": ".csv",
+    "parquet": ".parquet",
+    "arrow_ipc": ".arrow",
+    "orc": ".orc",
+    "parquet_dataset": "",
+    "deltalake": "",
+}
+"""File extension of the outputs of each format (none for directories)."""
+
+
+def get_stem(file: Union[str, Path, PathLike]) -> str:
+    """Name of the ixf file without its extensions (ixf and compression).
+
+    The standard input (`-`) is named `stdin`.
+    """
+    if str(file) == "-":
+        return "stdin"
+    name = Path(file).name.lower()
+    for extension in COMPRESSION_EXTENSIONS.values():
+        name = name.removesuffix(extension)
+    return name.removesuffix(".ixf")
+
+
+def expand_files(
+    files: Union[str, Path, PathLike, Iterable[Union[str, Path, PathLike]]]
+) -> List[Path]:
+    """Expands glob patterns into the list of matching files.
+
+    Parameters
+    ----------
+    files : Union[str, Path, PathLike, Iterable[Union[str, Path, PathLike]]]
+        Paths or glob patterns (e.g. `exports/**/*.ixf`).
+
+    Returns
+    -------
+    List[Path]
+        Files without duplicates, in the order they were given.
+    """
+    if isinstance(files, (str, Path, PathLike)):
+        files = [files]
+
+    expanded = {}
+    for pattern in files:
+        pattern = str(pattern)
+        if glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
+            if not matches:
+                logger.warning(f"No file matches `{pattern}`")
+        else:
+            matches = [pattern]
+        for match in matches:
+            path = Path(match)
+            if not path.is_dir():
+                expanded.setdefault(path.resolve(), path)
+    return list(expanded.values())
+
+
+def get_size(
+    path: Union[str, Path, PathLike, List[Union[str, Path, PathLike]]]
+) -> int:
+    """Size in bytes of a file, of all the files of a directory or of a list
+    of files (e.g. the parts of an ixf file)."""
+    if isinstance(path, (list, tuple)):
+        return sum(get_size(p) for p in path)
+
+    path = Path(path)
+    if path.is_dir():
+        return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+    if path.exists():
+        return path.stat().st_size
+    return 0
+
+
+def get_output_path(
+    file: Union[str, Path, PathLike],
+    output_dir: Union[str, Path, PathLike],
+    output_format: str,
+    compression: Optional[str] = None,
+    name: Optional[str] = None
+) -> Path:
+    """Path of the output of an ixf file inside the output directory.
+
+    Parameters
+    ----------
+    file : Union[str, Path, PathLike]
+        Ixf file.
+    output_dir : Union[str, Path, PathLike]
+        Output directory.
+    output_format : str
+        Output format, see `FORMAT_EXTENSIONS`.
+    compression : str
+        Compression of the text formats (json, jsonline and csv).
+    name : str
+        Name of the output without extension, defaults to the name of the
+        ixf file without its extensions.
+
+    Returns
+    -------
+    Path
+        Output path, e.g. `output_dir/table.csv.gz`.
+    """
+    if output_format not in FORMAT_EXTENSIONS:
+        msg = f"Unknown output format `{output_format}`, expecting one of " \
+              f"{list(FORMAT_EXTENSIONS)}"
+        raise ValueError(msg)
+
+    if name is None:
+        name = get_stem(file)
+    name += FORMAT_EXTENSIONS[output_format]
+    if output_format in ["json", "jsonline", "csv"] \
+            and compression in COMPRESSION_EXTENSIONS:
+        name += COMPRESSION_EXTENSIONS[compression]
+    return Path(output_dir) / name
+
+
+def _new_result(
+    file: Union[str, Path, PathLike, List[Union[str, Path, PathLike]]],
+    output: Union[str, Path, PathLike]
+) -> Dict[str, Any]:
+    """Result of a conversion before it starts (status `failed`)."""
+    if isinstance(file, (list, tuple)):
+        file = [str(f) for f in file]
+    return {
+        "file": file if isinstance(file, list) else str(file),
+        "output": str(output),
+        "status": "failed",
+        "rows": 0,
+        "corrupted_rows": 0,
+        "input_bytes": get_size(file),
+        "output_bytes": 0,
+        "duration": 0.0,
+        "error": None,
+    }
+
+
+def convert_file(
+    file: Union[str, Path, PathLike, List[Union[str, Path, PathLike]]],
+    output: Union[str, Path, PathLike],
+    output_format: str = "parquet",
+    options: Optional[Dict[str, Any]] = None,
+    batch_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """Converts one ixf file and reports how it went, it never raises.
+
+    It is the task run by the workers of `convert_many`.
+
+    Parameters
+    ----------
+    file : Union[str, Path, PathLike, List[Union[str, Path, PathLike]]]
+        Ixf file or the list of its parts.
+    output : Union[str, Path, PathLike]
+        Output path (file, parquet dataset or deltalake directory).
+    output_format : str
+        Output format: json, jsonline, csv, parquet, arrow_ipc, orc,
+        parquet_dataset or deltalake.
+    options : Dict[str, Any]
+        Options of the output, see `IXFParser.convert`.
+    batch_size : int
+        Batch size, it used for memory optimization.
+
+    Returns
+    -------
+    Dict[str, Any]
+        File, output, status (`ok`, `corrupted` or `failed`), rows, corrupted
+        rows, input and output bytes, duration in seconds and error.
+    """
+    result = _new_result(file, output)
+    start = time.perf_counter()
+    spec = dict(options or {}, output=output, format=output_format)
+    try:
+        if isinstance(file, (list, tuple)):
+            fo = MultiPartReader(file)
+        else:
+            fo = open(file, mode="rb")
+        with fo:
+            parser = IXFParser(fo)
+            try:
+                ok = parser.convert([spec], batch_size=batch_size)
+            finally:
+                result["rows"] = parser.number_rows
+                result["corrupted_rows"] = parser.number_corrupted_rows
+        result["status"] = "ok" if ok else "corrupted"
+    except Exception as err:  # noqa
+        logger.error(f"Conversion of {file} failed: {err}")
+        result["error"] = f"{type(err).__name__}: {err}"
+    result["duration"] = round(time.perf_counter() - start, 3)
+    result["output_bytes"] = get_size(output)
+    return result
+
+
+def convert_many(
+    files: Union[str, Path, PathLike, Iterable[Union[str, Path, PathLike]]],
+    output_dir: Union[str, Path, PathLike],
+    output_format: str = "parquet",
+    options: Optional[Dict[str, Any]] = None,
+    workers: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    memory_budget: Optional[int] = None,
+    report: Optional[Union[str, Path, PathLike]] = None
+) -> List[Dict[str, Any]]:
+    """Converts many ixf files in parallel using a process pool.
+
+    Files are scheduled from the largest to the smallest so a big file does
+    not start last and delay the end of the batch. A failing file does not
+    stop the others, its error is reported in the summary.
+
+    Parameters
+    ----------
+    files : Union[str, Path, PathLike, Iterable[Union[str, Path, PathLike]]]
+        Ixf files or glob patterns (e.g. `exports/**/*.ixf`).
+    output_dir : Union[str, Path, PathLike]
+        Output directory, each file is converted to
+        `output_dir/<name><extension>`.
+    output_format : str
+        Output format: json, jsonline, csv, parquet, arrow_ipc, orc,
+        parquet_dataset or deltalake.
+    options : Dict[str, Any]
+        Options of the outputs, see `IXFParser.convert`.
+    workers : int
+        Number of worker processes, defaults to the number of cores. `1`
+        converts the files one by one in the current process.
+    batch_size : int
+        Batch size, it used for memory optimization.
+    memory_budget : int
+        Maximum number of bytes of the files converted at the same time, see
+        `run_conversions`.
+    report : Union[str, Path, PathLike]
+        Path of the json summary report, if given.
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        One result per file (see `convert_file`), largest files first.
+    """
+    options = dict(options or {})
+    output_dir = Path(output_dir)
+    tasks, outputs = [], set()
+    for path in expand_files(files):
+        output = get_output_path(
+            path, output_dir, output_format, options.get("compression")
+        )
+        if output in outputs:
+            raise ValueError(f"Several files are converted to {output}")
+        outputs.add(output)
+        tasks.append({"file": path, "output": output})
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    return run_conversions(
+        tasks,
+        output_format=output_format,
+        options=options,
+        workers=workers,
+        batch_size=batch_size,
+        memory_budget=memory_budget,
+        report=report
+    )
+
+
+def admit_task(
+    pending: List[int],
+    sizes: List[int],
+    running: int,
+    reserved: int,
+    memory_budget: Optional[int] = None
+) -> Optional[int]:
+    """Largest pending task fitting in the memory budget.
+
+    Parameters
+    ----------
+    pending : List[int]
+        Indexes of the pending tasks, largest inputs first.
+    sizes : List[int]
+        Size in bytes of the input of each task.
+    running : int
+        Number of running tasks.
+    reserved : int
+        Bytes of the inputs of the running tasks.
+    memory_budget : int
+        Maximum number of bytes of the inputs converted at the same time, a
+        task always fits when nothing else runs. No limit if None.
+
+    Returns
+    -------
+    int
+        Index of the task to run, None if none fits.
+    """
+    for index in pending:
+        if memory_budget is None or not running \
+                or reserved + sizes[index] <= memory_budget:
+            return index
+    return None
+
+
+def _get_result(future: Future, task: Dict[str, Any]) -> Dict[str, Any]:
+    """Result of a conversion run by a worker process."""
+    try:
+        return future.result()
+    except Exception as err:  # noqa
+        # e.g. the worker process died
+        logger.error(f"Conversion of {task['file']} failed: {err}")
+        result = _new_result(task["file"], task["output"])
+        result["error"] = f"{type(err).__name__}: {err}"
+        return result
+
+
+def _run_in_pool(
+    tasks: List[Dict[str, Any]],
+    order: List[int],
+    sizes: List[int],
+    workers: int,
+    memory_budget: Optional[int],
+    args: tuple,
+    finish: Callable[[int, Dict[str, Any]], None]
+):
+    """Runs the conversion tasks in a process pool, in the given order and
+    within the memory budget (see `run_conversions`). `args` are the format,
+    the options and the batch size of `convert_file`, `finish` receives the
+    index and the result of each task."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    pending, running, reserved = list(order), {}, 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while pending or running:
+            # Largest pending task fitting in the memory budget
+            while len(running) < workers:
+                index = admit_task(
+                    pending, sizes, len(running), reserved, memory_budget
+                )
+                if index is None:
+                    break
+                pending.remove(index)
+                task = tasks[index]
+                future = executor.submit(
+                    convert_file, task["file"], task["output"], *args
+                )
+                running[future] = index
+                reserved += sizes[index]
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = running.pop(future)
+                reserved -= sizes[index]
+                finish(index, _get_result(future, tasks[index]))
+
+
+def _write_report(
+    results: List[Dict[str, Any]],
+    duration: float,
+    report: Union[str, Path, PathLike]
+):
+    """Writes the json summary report of the conversions."""
+    summary = {
+        "files": results,
+        "total": {
+            "files": len(results),
+            "failed": sum(r["status"] == "failed" for r in results),
+            "rows": sum(r["rows"] for r in results),
+            "input_bytes": sum(r["input_bytes"] for r in results),
+            "output_bytes": sum(r["output_bytes"] for r in results),
+            "duration": duration,
+        },
+    }
+    with open(report, mode="w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    logger.info(f"Summary report written in {report}")
+
+
+def run_conversions(
+    tasks: List[Dict[str, Any]],
+    output_format: str = "parquet",
+    options: Optional[Dict[str, Any]] = None,
+    workers: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    memory_budget: Optional[int] = None,
+    report: Optional[Union[str, Path, PathLike]] = None
+) -> List[Dict[str, Any]]:
+    """Runs conversion tasks in a process pool, largest inputs first.
+
+    Parameters
+    ----------
+    tasks : List[Dict[str, Any]]
+        Conversion tasks: `file` (path or list of the parts of a file),
+        `output` and optional extra keys copied in the results (e.g. the
+        table name).
+    output_format : str
+        Output format, see `convert_file`.
+    options : Dict[str, Any]
+        Options of the outputs, see `IXFParser.convert`.
+    workers : int
+        Number of worker processes, defaults to the number of cores. `1`
+        converts the files one by one in the current process.
+    batch_size : int
+        Batch size, it used for memory optimization.
+    memory_budget : int
+        Maximum number of bytes of the inputs converted at the same time, a
+        conversion waits until it fits in the budget (it always runs when
+        nothing else runs). No limit by default.
+    report : Union[str, Path, PathLike]
+        Path of the json summary report, if given.
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        One result per task (see `convert_file`), largest inputs first.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if not isinstance(workers, int) or workers <= 0:
+        raise ValueError("`workers` should be an integer > 0")
+
+    if memory_budget is not None and memory_budget <= 0:
+        raise ValueError("`memory_budget` should be > 0")
+
+    options = dict(options or {})
+    sizes = [get_size(t["file"]) for t in tasks]
+    order = sorted(range(len(tasks)), key=lambda i: sizes[i], reverse=True)
+
+    def run(index: int) -> Dict[str, Any]:
+        task = tasks[index]
+        return convert_file(
+            task["file"], task["output"], output_format, options, batch_size
+        )
+
+    def finish(index: int, result: Dict[str, Any]):
+        extra = {k: v for k, v in tasks[index].items() if k not in result}
+        results[index] = dict(result, **extra)
+        logger.info(
+            f"{result['status']}: {result['file']} ({result['rows']} rows, "
+            f"{result['duration']}s)"
+        )
+
+    logger.info(f"Convert {len(tasks)} files using {workers} workers")
+    start = time.perf_counter()
+    results: Dict[int, Dict[str, Any]] = {}
+
+    if workers == 1:
+        for index in order:
+            finish(index, run(index))
+    else:
+        _run_in_pool(
+            tasks, order, sizes, workers, memory_budget,
+            (output_format, options, batch_size), finish
+        )
+
+    results = [results[i] for i in order]
+    duration = round(time.perf_counter() - start, 3)
+    failed = sum(r["status"] == "failed" for r in results)
+    logger.info(f"Converted {len(results) - failed}/{len(results)} files "
+                f"in {duration}s")
+
+    if report is not None:
+        _write_report(results, duration, report)
+
+    return results
+
+
+__all__ = [
+    "FORMAT_EXTENSIONS", "admit_task", "convert_file", "convert_many",
+    "expand_files", "get_output_path", "get_size", "get_stem",
+    "run_conversions",
+]
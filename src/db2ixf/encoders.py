@@ -1,14 +1,31 @@
 # coding=utf-8
 """Contains some encoders used to output data in some formats."""
 import base64
-import chardet
 import json
+import warnings
 from datetime import date, datetime, time
+from db2ixf.helpers import binary_to_string, time_to_string
+from db2ixf.logger import logger
 from decimal import Decimal
+from pyarrow import Array, RecordBatch, string, types
+from typing import Any, Callable, List, Literal, Union
 
 
 class CustomJSONEncoder(json.JSONEncoder):
-    """Custom JSON encoder to handle python date, time and datetime objects."""
+    """Custom JSON encoder to handle python date, time and datetime objects.
+
+    Deprecated: the json outputs are serialized by `JSONBatchSerializer`,
+    this encoder is not used anymore and will be removed.
+    """
+
+    def __init__(self, *args, **kwargs):
+        warnings.warn(
+            "WARNING: `CustomJSONEncoder` is deprecated and will be removed "
+            "in a future version. Use `JSONBatchSerializer` instead.",
+            DeprecationWarning,
+            stacklevel=2
+        )
+        super().__init__(*args, **kwargs)
 
     def default(self, o):
         if isinstance(o, (date, time, datetime)):
@@ -17,6 +34,7 @@ class CustomJSONEncoder(json.JSONEncoder):
             return str(o)
         elif isinstance(o, bytes):
             try:
+                import chardet
                 encoding = chardet.detect(o)["encoding"]
                 if encoding:
                     return o.decode(encoding)
@@ -24,3 +42,155 @@ class CustomJSONEncoder(json.JSONEncoder):
             except UnicodeDecodeError:
                 return base64.b64encode(o).decode('utf-8')
         return super().default(o)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serializes with the standard library json module."""
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def get_json_dumps(
+    backend: Union[Literal["auto", "orjson", "json"], Callable] = "auto"
+) -> Callable[[Any], bytes]:
+    """Gets a function serializing a python object to json bytes.
+
+    Parameters
+    ----------
+    backend : Union[Literal["auto", "orjson", "json"], Callable]
+        `orjson` (optional dependency), `json` (standard library), `auto`
+        (orjson if it is installed, otherwise json) or a custom function
+        returning json as bytes or str.
+
+    Returns
+    -------
+    Callable[[Any], bytes]
+        Function serializing a python object to utf-8 json bytes.
+    """
+    if callable(backend):
+        def _custom_dumps(obj: Any) -> bytes:
+            out = backend(obj)
+            return out.encode("utf-8") if isinstance(out, str) else out
+
+        return _custom_dumps
+
+    if backend not in ["auto", "orjson", "json"]:
+        raise ValueError("Either `auto`, `orjson`, `json` or a function")
+
+    if backend in ["auto", "orjson"]:
+        try:
+            import orjson
+            logger.debug("Json serializer backend: orjson")
+            return orjson.dumps
+        except ImportError:
+            if backend == "orjson":
+                raise ImportError(
+                    "`orjson` is not installed, please install it using "
+                    "`pip install orjson`"
+                )
+
+    logger.debug("Json serializer backend: json")
+    return _json_dumps
+
+
+def format_json_column(
+    values: Array,
+    binary_format: Literal["base64", "hex"] = "base64"
+) -> Array:
+    """Pre-formats a pyarrow column into json friendly values.
+
+    Dates, times and timestamps become ISO 8601 strings, decimals become
+    strings (no precision loss) and binaries become base64 or hex strings.
+    Other columns are returned as they are.
+
+    Parameters
+    ----------
+    values : Array
+        Pyarrow array.
+    binary_format : Literal["base64", "hex"]
+        String representation of the binary columns.
+
+    Returns
+    -------
+    Array
+        Pyarrow array holding only json native values.
+    """
+    from pyarrow.compute import cast, replace_substring_regex, strftime
+
+    dtype = values.type
+    if types.is_timestamp(dtype):
+        # Same strings as isoformat: no zero fraction, offset as +HH:MM
+        fmt = "%Y-%m-%dT%H:%M:%S"
+        if dtype.tz is not None:
+            return replace_substring_regex(
+                strftime(values, f"{fmt}%z"),
+                r"(\.0+)?([+-]\d\d)(\d\d)$",
+                r"\2:\3"
+            )
+        return replace_substring_regex(strftime(values, fmt), r"\.0+$", "")
+    if types.is_time(dtype):
+        return time_to_string(values)
+    if types.is_date(dtype) or types.is_decimal(dtype):
+        return cast(values, string())
+    if types.is_binary(dtype) or types.is_large_binary(dtype) \
+            or types.is_fixed_size_binary(dtype):
+        return binary_to_string(values, binary_format)
+    return values
+
+
+class JSONBatchSerializer:
+    """Serializes pyarrow record batches to json objects (one per row).
+
+    The columns are pre-formatted in bulk (pyarrow compute) so the rows only
+    hold json native values, then each row is dumped by the chosen backend.
+
+    Attributes
+    ----------
+    backend : Union[Literal["auto", "orjson", "json"], Callable]
+        Json serializer backend, see `get_json_dumps`.
+    binary_format : Literal["base64", "hex"]
+        String representation of the binary columns.
+    """
+
+    def __init__(
+        self,
+        backend: Union[Literal["auto", "orjson", "json"], Callable] = "auto",
+        binary_format: Literal["base64", "hex"] = "base64"
+    ):
+        """Init the json batch serializer.
+
+        Parameters
+        ----------
+        backend : Union[Literal["auto", "orjson", "json"], Callable]
+            Json serializer backend, see `get_json_dumps`.
+        binary_format : Literal["base64", "hex"]
+            String representation of the binary columns.
+        """
+        if binary_format not in ["base64", "hex"]:
+            raise ValueError("Either `base64` or `hex` for `binary_format`")
+
+        self.backend = backend
+        self.binary_format = binary_format
+        self.dumps = get_json_dumps(backend)
+
+    def format_batch(self, batch: RecordBatch) -> RecordBatch:
+        """Pre-formats all the columns of a record batch."""
+        columns = [
+            format_json_column(c, self.binary_format) for c in batch.columns
+        ]
+        return RecordBatch.from_arrays(columns, names=batch.schema.names)
+
+    def serialize(self, batch: RecordBatch) -> List[bytes]:
+        """Serializes a record batch.
+
+        Parameters
+        ----------
+        batch : RecordBatch
+            Pyarrow record batch.
+
+        Returns
+        -------
+        List[bytes]
+            One json object (utf-8 bytes) per row.
+        """
+        dumps = self.dumps
+        return [dumps(row) for row in self.format_batch(batch).to_pylist()]
@@ -0,0 +1,189 @@
+# coding=utf-8
+"""Conversion of the export bundles produced by `db2move ... export`.
+
+`db2move` writes one ixf file per table (`tab1.ixf`, ..., `tabN.ixf`, split
+into `tab1.ixf.001`, `tab1.ixf.002`, ... when they are big) and a
+`db2move.lst` file mapping each ixf file to its table, e.g.
+`!"DB2INST1"."EMPLOYEE"!tab1.ixf!tab1.msg!`.
+"""
+import re
+from db2ixf.conversions import get_output_path, run_conversions
+from db2ixf.logger import logger
+from db2ixf.readers import find_parts
+from os import PathLike
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+DB2MOVE_LIST = "db2move.lst"
+"""Name of the file listing the tables of a db2move export."""
+
+_LIST_LINE = re.compile(
+    r'^!(?P<name>(?:"(?:[^"]|"")*"\.)?"(?:[^"]|"")*"|[^!]+)'
+    r'!(?P<file>[^!]+)!(?P<message>[^!]*)!'
+)
+_IDENTIFIER = re.compile(r'"((?:[^"]|"")*)"|([^."\s]+)')
+
+
+def parse_table_name(name: str) -> Tuple[Optional[str], str]:
+    """Splits a qualified table name (`"SCHEMA"."TABLE"`) into its parts.
+
+    Parameters
+    ----------
+    name : str
+        Qualified table name, quoted or not.
+
+    Returns
+    -------
+    Tuple[Optional[str], str]
+        Schema (None if the name is not qualified) and table.
+    """
+    parts = [
+        quoted.replace('""', '"') if quoted else plain
+        for quoted, plain in _IDENTIFIER.findall(name.strip())
+    ]
+    if not parts:
+        raise ValueError(f"Not a valid table name: {name}")
+    if len(parts) == 1:
+        return None, parts[0]
+    return parts[-2], parts[-1]
+
+
+def read_db2move_list(
+    path: Union[str, Path, PathLike]
+) -> List[Dict[str, Any]]:
+    """Reads the tables listed in a `db2move.lst` file.
+
+    Parameters
+    ----------
+    path : Union[str, Path, PathLike]
+        Path of `db2move.lst` or of the directory containing it.
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        One entry per table: `schema`, `table`, `file` (ixf file name) and
+        `message` (message file name).
+    """
+    path = Path(path)
+    if path.is_dir():
+        path = path / DB2MOVE_LIST
+
+    tables = []
+    with open(path, mode="r", encoding="utf-8", errors="replace") as f:
+        for number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            match = _LIST_LINE.match(line)
+            if match is None:
+                logger.warning(f"{path}:{number}: not a table line: {line}")
+                continue
+            schema, table = parse_table_name(match.group("name"))
+            tables.append(
+                {
+                    "schema": schema,
+                    "table": table,
+                    "file": match.group("file").strip(),
+                    "message": match.group("message").strip() or None,
+                }
+            )
+    logger.debug(f"{len(tables)} tables listed in {path}")
+    return tables
+
+
+def _safe_name(name: str) -> str:
+    """Makes a table or schema name usable as a file name."""
+    return re.sub(r'[\\/:*?"<>|\x00-\x1f]', "_", name).strip() or "_"
+
+
+def convert_db2move(
+    directory: Union[str, Path, PathLike],
+    output_dir: Union[str, Path, PathLike],
+    output_format: str = "parquet",
+    options: Optional[Dict[str, Any]] = None,
+    workers: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    memory_budget: Optional[int] = None,
+    report: Optional[Union[str, Path, PathLike]] = None
+) -> List[Dict[str, Any]]:
+    """Converts all the tables of a db2move export in parallel.
+
+    Each table is converted to `output_dir/<schema>/<table><extension>` (a
+    directory for `deltalake` and `parquet_dataset`). All the tables share
+    the same pool of worker processes and the same memory budget.
+
+    Parameters
+    ----------
+    directory : Union[str, Path, PathLike]
+        Directory of the export containing `db2move.lst`.
+    output_dir : Union[str, Path, PathLike]
+        Output directory.
+    output_format : str
+        Output format: json, jsonline, csv, parquet, arrow_ipc, orc,
+        parquet_dataset or deltalake.
+    options : Dict[str, Any]
+        Options of the outputs, see `IXFParser.convert`.
+    workers : int
+        Number of worker processes, defaults to the number of cores.
+    batch_size : int
+        Batch size, it used for memory optimization.
+    memory_budget : int
+        Maximum number of bytes of the ixf files converted at the same time,
+        see `run_conversions`.
+    report : Union[str, Path, PathLike]
+        Path of the json summary report, if given.
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        One result per table (see `convert_file`) with its `schema` and
+        `table`, largest tables first.
+    """
+    directory = Path(directory)
+    output_dir = Path(output_dir)
+    options = dict(options or {})
+
+    tasks = []
+    for entry in read_db2move_list(directory):
+        # Missing files fail in the worker and get reported
+        file = directory / entry["file"]
+        parts = find_parts(file)
+        if not parts:
+            logger.warning(f"No ixf file found for {entry['file']}")
+        elif len(parts) == 1:
+            file = parts[0]
+        else:
+            file = parts
+        schema_dir = output_dir / _safe_name(entry["schema"] or "_")
+        output = get_output_path(
+            entry["file"],
+            schema_dir,
+            output_format,
+            compression=options.get("compression"),
+            name=_safe_name(entry["table"])
+        )
+        schema_dir.mkdir(parents=True, exist_ok=True)
+        tasks.append(
+            {
+                "file": file,
+                "output": output,
+                "schema": entry["schema"],
+                "table": entry["table"],
+            }
+        )
+
+    return run_conversions(
+        tasks,
+        output_format=output_format,
+        options=options,
+        workers=workers,
+        batch_size=batch_size,
+        memory_budget=memory_budget,
+        report=report
+    )
+
+
+__all__ = [
+    "DB2MOVE_LIST", "convert_db2move", "parse_table_name",
+    "read_db2move_list",
+]
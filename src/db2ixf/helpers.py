@@ -1,24 +1,77 @@
 # coding=utf-8
 """Create helper function for schema generation and others."""
-import chardet
 import os
 import warnings
+from base64 import b64encode
+from codecs import getincrementaldecoder
 from collections import OrderedDict
 from db2ixf.constants import (
     DB2IXF_BUFFER_SIZE_CLOUD_PROVIDER, DB2IXF_DEFAULT_BATCH_SIZE,
     DB2IXF_RISK_FACTOR, DB2IXF_TIME_ZONE, IXF_DTYPES,
 )
 from db2ixf.exceptions import NotValidDataPrecisionException
-from db2ixf.logger import logger
 from pyarrow import (
-    RecordBatch, Schema, array, binary, date32, decimal128, decimal256, field,
-    float32, float64, int16, int32, int64, large_binary, large_string,
-    record_batch, schema, string, time32, time64, timestamp,
+    Array, RecordBatch, Schema, Table, array, binary, date32, decimal128,
+    decimal256, field, float32, float64, int16, int32, int64, large_binary,
+    large_string, record_batch, schema, string, time32, time64, timestamp,
+    types,
 )
-from typing import (BinaryIO, List, Literal, Tuple)
+from threading import local
+from typing import (
+    Any, BinaryIO, Iterable, List, Literal, Optional, TextIO, Tuple, Union,
+)
+
+_fallbacks = local()
+"""Cells decoded by a fallback in the current thread: their number and the
+diagnostics of the parsing counting them per column."""
+
+
+def get_fallback_count() -> int:
+    """Number of cells decoded by a fallback in the current thread."""
+    return getattr(_fallbacks, "count", 0)
+
+
+def set_decode_diagnostics(diagnostics):
+    """Sets the diagnostics (`DecodeDiagnostics`) counting the decoding
+    problems of the current thread, None to stop counting them."""
+    _fallbacks.diagnostics = diagnostics
+
+
+def add_decode_diagnostic(c, kind: str, detail: Any = None):
+    """Counts a cell of a column decoded by a fallback codec or format (this
+    thread), in the diagnostics of the parsing if they are set.
+
+    Parameters
+    ----------
+    c : dict
+        Column descriptor, None if unknown.
+    kind : str
+        Kind of fallback.
+    detail : Any
+        Cell, only formatted if it is kept as an example.
+    """
+    _fallbacks.count = get_fallback_count() + 1
+    diagnostics = getattr(_fallbacks, "diagnostics", None)
+    if diagnostics is None:
+        return
+    name = "?" if c is None else str(c["IXFCNAME"], "utf-8").strip()
+    diagnostics.add(name, kind, detail)
+
+
+def is_seekable(file: BinaryIO) -> bool:
+    """Whether the file-like object supports seeking (pipes do not)."""
+    if hasattr(file, "seekable"):
+        return file.seekable()
+    return hasattr(file, "seek")
 
 
 def get_filesize(file: BinaryIO) -> int:
+    # Compressed inputs: size of the compressed file
+    if hasattr(file, "compressed_size"):
+        return file.compressed_size
+    # Pipes: unknown size
+    if not is_seekable(file):
+        return 0
     if hasattr(file, "seek"):
         filesize = file.seek(0, os.SEEK_END)
         file.seek(0)
@@ -273,9 +326,275 @@ def to_pyarrow_record_batch(
     return record_batch(_arrays, schema=pyarrow_schema)
 
 
-def decode_cell(cell: str, cp: int, cpt: Literal["s", "d"] = "s"):
+def coalesce_record_batches(
+    batches: Iterable[RecordBatch],
+    max_rows: Optional[int] = None,
+    max_bytes: Optional[int] = None
+) -> Iterable[Table]:
+    """Coalesces small record batches into bigger pyarrow tables.
+
+    A table is yielded as soon as it reaches `max_rows` rows or `max_bytes`
+    bytes. Batches are sliced so a table never exceeds `max_rows` rows. When
+    both limits are None, each batch is yielded as its own table.
+
+    Parameters
+    ----------
+    batches : Iterable[RecordBatch]
+        Pyarrow record batches.
+    max_rows : int
+        Maximum number of rows of a table.
+    max_bytes : int
+        Target size in bytes of a table.
+
+    Yields
+    ------
+    Table
+        Pyarrow table made of one or many record batches (zero copy).
+    """
+    if max_rows is not None and max_rows <= 0:
+        raise ValueError("`max_rows` should be > 0")
+
+    if max_bytes is not None and max_bytes <= 0:
+        raise ValueError("`max_bytes` should be > 0")
+
+    buffer, rows, size = [], 0, 0
+    for batch in batches:
+        while batch.num_rows > 0:
+            take = batch.num_rows
+            if max_rows is not None:
+                take = min(take, max_rows - rows)
+
+            part, batch = batch.slice(0, take), batch.slice(take)
+            buffer.append(part)
+            rows += part.num_rows
+            size += part.nbytes
+
+            full_rows = max_rows is not None and rows >= max_rows
+            full_bytes = max_bytes is not None and size >= max_bytes
+            no_limit = max_rows is None and max_bytes is None
+            if full_rows or full_bytes or no_limit:
+                yield Table.from_batches(buffer)
+                buffer, rows, size = [], 0, 0
+
+    if buffer:
+        yield Table.from_batches(buffer)
+
+
+def binary_to_string(
+    values: Array,
+    binary_format: Literal["base64", "hex"] = "base64"
+) -> Array:
+    """Converts a pyarrow binary array to a deterministic string array.
+
+    Parameters
+    ----------
+    values : Array
+        Pyarrow array of a binary datatype.
+    binary_format : Literal["base64", "hex"]
+        String representation of the bytes.
+
+    Returns
+    -------
+    Array
+        Pyarrow string array (nulls are preserved).
+    """
+    if binary_format == "base64":
+        def _encode(v):
+            return b64encode(v).decode("ascii")
+    elif binary_format == "hex":
+        def _encode(v):
+            return v.hex()
+    else:
+        raise ValueError("Either `base64` or `hex` for `binary_format`")
+
+    return array(
+        [None if v is None else _encode(v) for v in values.to_pylist()],
+        type=large_string() if types.is_large_binary(values.type) else string()
+    )
+
+
+def stringify_binary_columns(
+    batch: RecordBatch,
+    binary_format: Literal["base64", "hex"] = "base64"
+) -> RecordBatch:
+    """Replaces the binary columns of a record batch by string columns.
+
+    Text formats (csv, json) can not hold raw bytes, this function makes their
+    representation deterministic instead of guessing a charset.
+
+    Parameters
+    ----------
+    batch : RecordBatch
+        Pyarrow record batch.
+    binary_format : Literal["base64", "hex"]
+        String representation of the bytes.
+
+    Returns
+    -------
+    RecordBatch
+        Pyarrow record batch without binary columns.
+    """
+    fields, columns, changed = [], [], False
+    for f, values in zip(batch.schema, batch.columns):
+        if types.is_binary(f.type) or types.is_large_binary(f.type) \
+                or types.is_fixed_size_binary(f.type):
+            values = binary_to_string(values, binary_format)
+            f = field(f.name, values.type, nullable=f.nullable)
+            changed = True
+        fields.append(f)
+        columns.append(values)
+
+    if not changed:
+        return batch
+
+    return RecordBatch.from_arrays(columns, schema=schema(fields))
+
+
+def time_to_string(values: Array) -> Array:
+    """Converts a pyarrow time array to an ISO 8601 string array.
+
+    The fraction of second is dropped when it is zero (e.g. `12:30:00`).
+
+    Parameters
+    ----------
+    values : Array
+        Pyarrow array of a time datatype.
+
+    Returns
+    -------
+    Array
+        Pyarrow string array (nulls are preserved).
+    """
+    from pyarrow.compute import cast, replace_substring_regex
+
+    return replace_substring_regex(cast(values, string()), r"\.0+$", "")
+
+
+def stringify_time_columns(batch: RecordBatch) -> RecordBatch:
+    """Replaces the time columns of a record batch by string columns.
+
+    Some formats (e.g. ORC) do not support the time datatype, like in
+    `deltalake_fix_time`, the time values are written as strings.
+
+    Parameters
+    ----------
+    batch : RecordBatch
+        Pyarrow record batch.
+
+    Returns
+    -------
+    RecordBatch
+        Pyarrow record batch without time columns.
+    """
+    fields, columns, changed = [], [], False
+    for f, values in zip(batch.schema, batch.columns):
+        if types.is_time(f.type):
+            values = time_to_string(values)
+            f = field(f.name, values.type, nullable=f.nullable)
+            changed = True
+        fields.append(f)
+        columns.append(values)
+
+    if not changed:
+        return batch
+
+    return RecordBatch.from_arrays(columns, schema=schema(fields))
+
+
+def cast_record_batch(
+    batch: RecordBatch,
+    pyarrow_schema: Schema
+) -> RecordBatch:
+    """Casts a record batch to another pyarrow schema (e.g. for deltalake).
+
+    Time columns become strings (see `stringify_time_columns`) when the
+    target schema expects strings, other columns are cast by pyarrow.
+
+    Parameters
+    ----------
+    batch : RecordBatch
+        Pyarrow record batch.
+    pyarrow_schema : Schema
+        Target pyarrow schema, same column names and order.
+
+    Returns
+    -------
+    RecordBatch
+        Pyarrow record batch with the target schema.
+    """
+    if batch.schema == pyarrow_schema:
+        return batch
+
+    from pyarrow.compute import cast
+
+    columns = []
+    for values, f in zip(batch.columns, pyarrow_schema):
+        if types.is_time(values.type) and not types.is_time(f.type):
+            values = time_to_string(values)
+        if values.type != f.type:
+            values = cast(values, f.type)
+        columns.append(values)
+    return RecordBatch.from_arrays(columns, schema=pyarrow_schema)
+
+
+class _TextToBinarySink:
+    """Binary file-like object writing into a text file-like object."""
+
+    def __init__(self, output: TextIO, encoding: str = "utf-8"):
+        self.output = output
+        self.decoder = getincrementaldecoder(encoding)()
+
+    @property
+    def closed(self) -> bool:
+        return self.output.closed
+
+    def write(self, data: bytes) -> int:
+        self.output.write(self.decoder.decode(bytes(data)))
+        return len(data)
+
+    def flush(self):
+        self.output.flush()
+
+    def close(self):
+        self.output.write(self.decoder.decode(b"", final=True))
+        self.output.close()
+
+
+def get_binary_sink(output: Union[TextIO, BinaryIO]) -> BinaryIO:
+    """Gets a binary file-like object to write bytes into the output.
+
+    Parameters
+    ----------
+    output : Union[TextIO, BinaryIO]
+        File-like object opened in text (utf-8) or binary mode.
+
+    Returns
+    -------
+    BinaryIO
+        Binary file-like object, closing it closes the output.
+    """
+    if "b" in output.mode:
+        return output
+
+    # Text wrappers (open(..., "w")) expose their underlying binary buffer
+    if hasattr(output, "buffer"):
+        output.flush()
+        return output.buffer
+
+    return _TextToBinarySink(output)
+
+
+def decode_cell(
+    cell: str,
+    cp: int,
+    cpt: Literal["s", "d"] = "s",
+    c: Optional[dict] = None
+):
     """Try to decode the cell using the provided codepage.
 
+    The fallbacks are not logged cell by cell, they are counted per column
+    in the diagnostics of the parsing (see `set_decode_diagnostics`).
+
     Parameters
     ----------
     cell : str
@@ -284,6 +603,8 @@ def decode_cell(cell: str, cp: int, cpt: Literal["s", "d"] = "s"):
         IBM code page
     cpt : Literal["s", "d"]
         Defaults to `s` which means single byte and `d` means double bytes
+    c : dict
+        Column descriptor of the cell, names the column in the diagnostics
 
     Returns
     -------
@@ -296,30 +617,39 @@ def decode_cell(cell: str, cp: int, cpt: Literal["s", "d"] = "s"):
     try:
         return cell.decode(f"cp{cp}")
     except UnicodeDecodeError:
-        logger.debug("Trying cp437 encoding")
         try:
-            return cell.decode("cp437")
+            decoded = cell.decode("cp437")
+            add_decode_diagnostic(c, f"cp{cp} fallback to cp437", cell)
+            return decoded
         except UnicodeDecodeError:
             try:
-                logger.debug("Trying to detect the encoding")
+                import chardet
                 _encoding = chardet.detect(cell, True)["encoding"]
-                return cell.decode(_encoding)
-            except UnicodeDecodeError as err:
-                logger.debug(f"Detected encoding fails: {err}")
+                decoded = cell.decode(_encoding)
+                add_decode_diagnostic(
+                    c, f"cp{cp} fallback to detected {_encoding}", cell
+                )
+                return decoded
+            except UnicodeDecodeError:
                 try:
                     if cpt == "s":
-                        logger.debug("Trying utf-8 encoding")
-                        return cell.decode("utf-8")
+                        _encoding = "utf-8"
+                        decoded = cell.decode(_encoding)
                     else:
                         try:
-                            logger.debug("Trying utf-16 encoding")
-                            return cell.decode("utf-16")
+                            _encoding = "utf-16"
+                            decoded = cell.decode(_encoding)
                         except UnicodeDecodeError:
-                            logger.debug("Trying utf-32 encoding")
-                            return cell.decode("utf-32")
+                            _encoding = "utf-32"
+                            decoded = cell.decode(_encoding)
+                    add_decode_diagnostic(
+                        c, f"cp{cp} fallback to {_encoding}", cell
+                    )
+                    return decoded
                 except UnicodeDecodeError:
-                    logger.debug(
-                        "Alert: eventual data loss, please provide encoding !"
+                    # Eventual data loss, the encoding should be provided
+                    add_decode_diagnostic(
+                        c, f"cp{cp} decoded with data loss", cell
                     )
                     return cell.decode(f"cp{cp}", errors="ignore")
 
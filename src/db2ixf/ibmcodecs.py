@@ -389,6 +389,15 @@ def ibm_33722(name):
         return add_encoding_alias('euc_jp', name)
 
 
+def search_function(name):
+    """Finds the codec of an IBM code page using all the search functions."""
+    for sf in search_functions:
+        codec = sf(name)
+        if codec is not None:
+            return codec
+    return None
+
+
 search_functions = (
     ebcdic._find_ebcdic_codec,  # noqa
     ibm_utf_32_be,
@@ -2,39 +2,71 @@
 """Creates an PC/IXF parser"""
 from __future__ import annotations
 
+import inspect
+import json
+import os
+import shutil
 import sys
 
-import csv
-import deltalake
-import json
-from collections import OrderedDict, defaultdict
+from base64 import b64encode
+from bisect import bisect_right
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import Future
 from db2ixf.collectors import collectors
+from db2ixf.compressors import DecompressedReader, detect_compression
 from db2ixf.constants import (
     COL_DESCRIPTOR_RECORD_TYPE, DATA_RECORD_TYPE,
-    DB2IXF_ACCEPTED_CORRUPTION_RATE, HEADER_RECORD_TYPE,
-    TABLE_RECORD_TYPE,
+    DB2IXF_ACCEPTED_CORRUPTION_RATE, DB2IXF_CORRUPTION_MIN_SAMPLE_SIZE,
+    DB2IXF_PARQUET_ROW_GROUP_BYTES, HEADER_RECORD_TYPE, PART_QUEUE_DEPTH,
+    RESYNC_READ_SIZE, TABLE_RECORD_TYPE,
 )
-from db2ixf.encoders import CustomJSONEncoder
+from db2ixf.encoders import JSONBatchSerializer
 from db2ixf.exceptions import (
     DataCollectorError, IXFParsingError, NotValidColumnDescriptorException,
     UnknownDataTypeException,
 )
 from db2ixf.helpers import (
-    apply_schema_fixes, deprecated, get_column_names, get_filesize,
-    get_opt_batch_size, get_pyarrow_schema,
-    init_opt_batch_size, to_pyarrow_record_batch,
+    apply_schema_fixes, cast_record_batch, coalesce_record_batches,
+    deprecated, get_filesize, get_opt_batch_size, get_pyarrow_schema,
+    init_opt_batch_size, is_seekable, set_decode_diagnostics,
+    to_pyarrow_record_batch,
 )
 from db2ixf.logger import logger
-from deltalake import DeltaTable
+from db2ixf.metrics import (
+    ColumnProfiler, DecodeDiagnostics, PROGRESS_CHECK_ROWS, ParserStats,
+    ProgressCallback, ProgressReporter,
+)
+from db2ixf.pipelines import BackgroundWriter, FanOut
+from db2ixf.readers import MultiPartReader, StreamReader
+from db2ixf.validators import IXFValidator
+from db2ixf.writers import (
+    ArrowIPCBatchWriter, BatchWriter, CSVBatchWriter, JSONBatchWriter,
+    JSONLineBatchWriter, OUTPUT_FORMATS, OUTPUT_WRITERS, ORCBatchWriter,
+    ParquetBatchWriter, RollingWriter, SPLIT_OPTIONS, check_output,
+    check_split_output, infer_output_format,
+)
+from itertools import chain, islice
 from os import PathLike
 from pathlib import Path
-from pyarrow import RecordBatch, Schema, schema
-from pyarrow.parquet import ParquetWriter
+from pyarrow import (
+    RecordBatch, RecordBatchReader, Schema, Table, py_buffer, schema,
+)
+from pyarrow.ipc import read_record_batch
+from queue import Empty
+from time import perf_counter
 from typing import (
-    Any, BinaryIO, Dict, Iterable, List, Literal, Optional, TextIO,
-    Tuple, Union,
+    TYPE_CHECKING, Any, BinaryIO, Callable, Dict, Iterable, List, Literal,
+    Optional, TextIO, Tuple, Union,
 )
 
+if TYPE_CHECKING:
+    from deltalake import DeltaTable
+
+_PARQUET_DATASET_OPTIONS = {
+    "compression", "compression_level", "existing_data_behavior",
+    "filesystem", "max_open_files", "parquet_version", "partition_by",
+} | SPLIT_OPTIONS
+
 
 class IXFParser:
     """PC/IXF Parser.
@@ -45,14 +77,84 @@ class IXFParser:
         Input file and it is better to use file-like object.
     """
 
-    def __init__(self, file: Union[str, Path, PathLike, BinaryIO]):
+    def __init__(
+        self,
+        file: Union[
+            str, Path, PathLike, BinaryIO, List[Union[str, Path, PathLike]]
+        ],
+        compression: Optional[
+            Literal["infer", "gzip", "bz2", "zstd"]
+        ] = "infer",
+        workers: Optional[int] = None,
+        stats: bool = False,
+        profile_columns: bool = False,
+        accepted_corruption_rate: Optional[int] = None,
+        min_sample_size: Optional[int] = None,
+        resync: bool = False,
+        dead_letter: Optional[Union[str, Path, PathLike, TextIO]] = None,
+        on_skipped_record: Optional[Callable[[bytes], None]] = None
+    ):
         """Init an instance of the PC/IXF Parser.
 
         Parameters
         ----------
-        file : str, Path, PathLike or File-Like Object
-            Input file and it is better to use file-like object.
+        file : str, Path, PathLike, File-Like Object or list of paths
+            Input file and it is better to use file-like object. A list of
+            paths is read as the parts of a single file (e.g. `tab1.ixf.001`,
+            `tab1.ixf.002`). Non-seekable inputs (pipes, stdin) are read
+            once, from start to end.
+        compression : Optional[Literal["infer", "gzip", "bz2", "zstd"]]
+            Compression of the input file. Defaults to `infer` which detects
+            it from the magic number, None means not compressed. Compressed
+            inputs are decompressed on the fly by a background thread.
+        workers : int
+            Number of processes decoding the parts of a multi-part input in
+            parallel. Only the first part carries the header, table and
+            column records and every part has to start with the first data
+            record of a row. None or 1 reads the parts one after the other.
+        stats : bool
+            If True, the time spent in each stage (record I/O, collectors,
+            codec decoding, batch assembly and writers) is measured, see
+            `stats`. Disabled, it has no overhead.
+        profile_columns : bool
+            If True, every collector invocation is timed per column with
+            the size, nulls and decoding fallbacks of the cells, see
+            `column_profile`. Multi-part inputs are then decoded in this
+            process.
+        accepted_corruption_rate : int
+            Accepted rate (%) of corrupted rows, defaults to
+            `DB2IXF_ACCEPTED_CORRUPTION_RATE`. It is checked while parsing:
+            the parsing stops as soon as the rate exceeds it and the partial
+            outputs are removed.
+        min_sample_size : int
+            Number of rows parsed before the rate of corrupted rows is
+            checked while parsing, defaults to
+            `DB2IXF_CORRUPTION_MIN_SAMPLE_SIZE`. The whole file is always
+            checked at the end.
+        resync : bool
+            If True, a damaged data record (bad length, type or record id)
+            does not stop the parsing: the input is scanned for the start of
+            the next row and the rows that fail to decode are skipped. The
+            skipped bytes are written to `dead_letter`.
+        dead_letter : Union[str, Path, PathLike, TextIO]
+            Json line file receiving the skipped records with `resync`: their
+            offset in the (decompressed) input, length, reason and raw bytes
+            (base64).
+        on_skipped_record : Callable[[bytes], None]
+            Called with the raw bytes (length prefix included) of every
+            application record (A) or record of an unknown type, they are
+            skipped by their length without being decoded. The fields of an
+            application record are described by `APPLICATION_RECORD_TYPE`.
+            Multi-part inputs are then decoded in this process.
         """
+        accepted_corruption_rate, min_sample_size = self.__check_arguments(
+            workers, accepted_corruption_rate, min_sample_size, resync,
+            dead_letter
+        )
+
+        if isinstance(file, (list, tuple)):
+            file = MultiPartReader(file)
+
         if isinstance(file, (str, Path, PathLike)):
             file = open(file, mode="rb")
             logger.debug("File opened in read & binary mode")
@@ -61,6 +163,17 @@ class IXFParser:
             msg = "file-like object should be opened in read-binary mode"
             raise ValueError(msg)
 
+        if not is_seekable(file) and not isinstance(file, StreamReader):
+            logger.debug("Non-seekable input (pipe), it is read only once")
+            file = StreamReader(file)
+
+        if compression == "infer":
+            compression = detect_compression(file)
+
+        if compression is not None:
+            logger.debug(f"Input compressed using {compression}")
+            file = DecompressedReader(file, compression)
+
         # Init instance attributes
         self.file = file
 
@@ -88,11 +201,97 @@ class IXFParser:
         """Current total size of the rows"""
         self.number_rows: int = 0
         """Number of rows extracted from the ixf file."""
-        # Avoids counting the last line (EOF)
-        self.number_corrupted_rows: int = -1
+        self.number_corrupted_rows: int = 0
         """Number of corrupted rows in the ixf file."""
         self.opt_batch_size: int = init_opt_batch_size(self.file_size)
         """Estimated optimal batch size"""
+        self.manifest: Optional[Dict[str, Any]] = None
+        """Files written by the last split conversion with their rows."""
+        self.workers: int = workers or 1
+        """Number of processes decoding the parts of a multi-part input."""
+        self.stats: ParserStats = ParserStats(enabled=stats)
+        """Timings, throughput and batches of the parsing."""
+        # Instrumented versions when the stats are enabled
+        self.__collectors = self.stats.instrument(collectors)
+        self.__read_record = self.stats.timed("read", self.__read_data_record)
+        self.__progress: Optional[ProgressReporter] = None
+        self.profile_columns: bool = profile_columns
+        """Whether the collectors are profiled per column."""
+        self.column_profile: Optional[ColumnProfiler] = None
+        """Profile of the columns of the last parsing (`profile_columns`)."""
+        self.decode_diagnostics: DecodeDiagnostics = DecodeDiagnostics()
+        """Decoding problems counted per column (fallback codecs, cells
+        failing to decode), summarized in the logs at the end."""
+        self.accepted_corruption_rate: int = accepted_corruption_rate
+        """Accepted rate (%) of corrupted rows."""
+        self.min_sample_size: int = min_sample_size
+        """Rows parsed before the corruption rate is checked while parsing."""
+        self.resync: bool = resync
+        """Whether the parsing resumes at the next row after a damaged one."""
+        self.dead_letter = dead_letter
+        """Json line file receiving the skipped records (`resync`)."""
+        self.number_skipped_records: int = 0
+        """Number of records (or runs of bytes) skipped by `resync`."""
+        self.number_skipped_bytes: int = 0
+        """Number of bytes skipped by `resync`."""
+        # State of the resynchronization
+        self.__offset: int = 0
+        self.__pushed: bytes = b""
+        self.__row_records: List[Tuple[int, OrderedDict]] = []
+        self.__dead_letter_file: Optional[TextIO] = None
+        # A non-seekable input can not be parsed once validated
+        self.__validated: bool = False
+        self.on_skipped_record = on_skipped_record
+        """Callback receiving the application records and the records of
+        unknown types."""
+        self.number_application_records: int = 0
+        """Number of application records and records of unknown types
+        skipped."""
+        # Bytes of the records skipped before the data records
+        self.__skipped_bytes: int = 0
+
+    @staticmethod
+    def __check_arguments(
+        workers: Optional[int],
+        accepted_corruption_rate: Optional[int],
+        min_sample_size: Optional[int],
+        resync: bool,
+        dead_letter: Optional[Union[str, Path, PathLike, TextIO]]
+    ) -> Tuple[int, int]:
+        """Checks the arguments of the parser.
+
+        Returns
+        -------
+        Tuple[int, int]
+            Accepted corruption rate and minimum sample size, their defaults
+            when they are not given.
+
+        Raises
+        ------
+        ValueError
+            When an argument is not valid.
+        """
+        if workers is not None and (
+                not isinstance(workers, int) or workers < 1
+        ):
+            raise ValueError(f"`workers` should be an integer >= 1: {workers}")
+
+        if accepted_corruption_rate is None:
+            accepted_corruption_rate = DB2IXF_ACCEPTED_CORRUPTION_RATE
+        if not (0 <= accepted_corruption_rate <= 100):
+            raise ValueError(
+                "`accepted_corruption_rate` should be between 0 and 100"
+            )
+
+        if min_sample_size is None:
+            min_sample_size = DB2IXF_CORRUPTION_MIN_SAMPLE_SIZE
+        if not isinstance(min_sample_size, int) or min_sample_size < 1:
+            raise ValueError("`min_sample_size` should be an integer >= 1")
+
+        if dead_letter is not None and not resync:
+            raise ValueError("`dead_letter` needs `resync`")
+
+        return accepted_corruption_rate, min_sample_size
 
     def __read_header(
         self,
@@ -139,11 +338,48 @@ class IXFParser:
         if record_type is None:
             record_type = TABLE_RECORD_TYPE
 
-        for m, n in record_type.items():
+        fields = list(record_type.items())
+        (length, _), (kind, _) = fields[:2]
+        self.table_record[length], self.table_record[kind] = \
+            self.__read_record_start(b"T")
+        for m, n in fields[2:]:
             self.table_record[m] = self.file.read(n)
 
         return self.table_record
 
+    def __read_record_start(self, kind: bytes) -> Tuple[bytes, bytes]:
+        """Reads the length and the type of the next record, skipping the
+        application records and the records of unknown types before it.
+
+        Parameters
+        ----------
+        kind : bytes
+            Type of the expected record.
+
+        Returns
+        -------
+        Tuple[bytes, bytes]
+            Length and type of the record (not the expected ones if the file
+            is not valid).
+        """
+        while True:
+            length, record_type = self.file.read(6), self.file.read(1)
+            if record_type == kind or not length.isdigit() \
+                    or not record_type.isupper() or int(length) < 1:
+                return length, record_type
+            self.__skip_record(
+                length + record_type + self.file.read(int(length) - 1)
+            )
+
+    def __skip_record(self, record: bytes):
+        """Skips an application record or a record of an unknown type."""
+        self.number_application_records += 1
+        self.__skipped_bytes += len(record)
+        if record[6:7] != b"A":
+            logger.debug(f"Skipped a record of unknown type {record[6:7]!r}")
+        if self.on_skipped_record is not None:
+            self.on_skipped_record(record)
+
     def __read_column_records(
         self,
         record_type: OrderedDict = None
@@ -169,20 +405,22 @@ class IXFParser:
         if record_type is None:
             record_type = COL_DESCRIPTOR_RECORD_TYPE
 
+        fields = list(record_type.items())
+        (length, _), (kind, _) = fields[:2]
         # "IXFTCCNT" contains number of columns in the table
         for _ in range(0, int(self.table_record["IXFTCCNT"])):
             column = OrderedDict()
-            for i, j in record_type.items():
+            column[length], column[kind] = self.__read_record_start(b"C")
+            for i, j in fields[2:]:
                 column[i] = self.file.read(j)
 
             if column["IXFCRECT"] != b"C":
-                msg1 = f"Non valid IXF file: It either contains non " \
-                       f"supported record type/subtype like application " \
-                       f"one or it contains a non valid column descriptor " \
-                       f"(see the column {column['IXFCNAME']})."
+                msg1 = f"Non valid IXF file: It contains a non valid " \
+                       f"column descriptor (see the column " \
+                       f"{column['IXFCNAME']})."
                 logger.error(msg1)
-                msg2 = "Hint: try to recreate IXF file without any " \
-                       "application record or any SQL error."
+                msg2 = "Hint: try to recreate IXF file without any SQL " \
+                       "error."
                 logger.info(msg2)
                 raise NotValidColumnDescriptorException(msg1)
 
@@ -212,15 +450,326 @@ class IXFParser:
         if record_type is None:
             record_type = DATA_RECORD_TYPE
 
-        self.current_data_record = OrderedDict()
-        for key, val in record_type.items():
-            self.current_data_record[key] = self.file.read(val)
+        while True:
+            self.current_data_record = OrderedDict()
+            for key, val in record_type.items():
+                self.current_data_record[key] = self.file.read(val)
+
+            # End of file
+            if not self.current_data_record["IXFDRECL"]:
+                self.current_data_record["IXFDCOLS"] = b""
+                return self.current_data_record
+
+            length = self.current_data_record["IXFDRECL"]
+            if self.current_data_record["IXFDRECT"] == b"D" \
+                    or not length.isdigit() or int(length) < 8:
+                break
+            # Application record or record of an unknown type
+            self.__skip_record(
+                b"".join(self.current_data_record.values())
+                + self.file.read(int(length) - 8)
+            )
 
         self.current_data_record["IXFDCOLS"] = self.file.read(
             int(self.current_data_record["IXFDRECL"]) - 8
         )
         return self.current_data_record
 
+    def __read(self, size: int) -> bytes:
+        """Reads the bytes given back by the resync first, then the input."""
+        if self.__pushed:
+            data = self.__pushed[:size]
+            self.__pushed = self.__pushed[size:]
+            if len(data) < size:
+                data += self.file.read(size - len(data))
+        else:
+            data = self.file.read(size)
+        self.__offset += len(data)
+        return data
+
+    def __push_back(self, data: bytes):
+        """Gives back bytes read ahead, the next reads start with them."""
+        self.__pushed = bytes(data) + self.__pushed
+        self.__offset -= len(data)
+
+    def __skip(self, offset: int, data: bytes, reason: str):
+        """Records skipped bytes into the dead letter file."""
+        self.number_skipped_records += 1
+        self.number_skipped_bytes += len(data)
+        logger.warning(
+            f"Skipped {len(data)} bytes at offset {offset}: {reason}"
+        )
+        if self.__dead_letter_file is None:
+            return
+        entry = {
+            "offset": offset,
+            "length": len(data),
+            "reason": reason,
+            "data": b64encode(data).decode("ascii"),
+        }
+        self.__dead_letter_file.write(json.dumps(entry) + "\n")
+
+    @staticmethod
+    def __is_record_start(
+        data: bytes,
+        types: Optional[bytes] = b"D"
+    ) -> bool:
+        """Whether the bytes look like the start of a record: 6 digits of
+        length then a record type (any one if `types` is None)."""
+        record_type = data[6:7]
+        return len(data) >= 7 and data[:6].isdigit() \
+            and (record_type.isupper() if types is None
+                 else record_type in types) \
+            and int(data[:6]) >= 1
+
+    def __read_framed_record(self) -> OrderedDict:
+        """Reads a data record, scanning for the next row after a damaged
+        one (`resync`)."""
+        fields = list(DATA_RECORD_TYPE) + ["IXFDCOLS"]
+        while True:
+            head = self.__read(14)
+            if not head:
+                # End of the data records (the parser stops on it)
+                self.current_data_record = OrderedDict(
+                    (f, b"") for f in fields
+                )
+                return self.current_data_record
+
+            if head[6:7] != b"D" and self.__is_record_start(head, None) \
+                    and int(head[:6]) >= 8:
+                # Application record or record of an unknown type, unless the
+                # next record does not start right after it
+                size = int(head[:6]) - 8
+                data = self.__read(size + 7)
+                following = data[size:]
+                self.__push_back(following)
+                if len(data) - len(following) == size and (
+                        not following
+                        or self.__is_record_start(following, None)
+                ):
+                    self.__skip_record(head + data[:size])
+                    continue
+                self.__push_back(data[:size])
+
+            if self.__is_record_start(head) and head[7:10].isdigit() \
+                    and int(head[:6]) >= 8:
+                size = int(head[:6]) - 8
+                # The next record has to start right after this one
+                columns = self.__read(size + 7)
+                following = columns[size:]
+                columns = columns[:size]
+                self.__push_back(following)
+                if len(columns) == size and (
+                        not following
+                        or self.__is_record_start(following, None)
+                ):
+                    self.current_data_record = OrderedDict(
+                        zip(fields, (head[:6], head[6:7], head[7:10],
+                                     head[10:14], columns))
+                    )
+                    return self.current_data_record
+                self.__push_back(columns)
+
+            self.__push_back(head)
+            self.__resync()
+
+    def __resync(self):
+        """Skips bytes until the start of the next row."""
+        start = self.__offset
+        first_drid = int(self.column_records[0]["IXFCDRID"])
+        buffer = bytearray(self.__read(RESYNC_READ_SIZE))
+        eof = len(buffer) < RESYNC_READ_SIZE
+        position = 7
+        while True:
+            position = buffer.find(b"D", position)
+            if position < 0:
+                if eof:
+                    break
+                # Keep memory bounded on long runs of garbage
+                if len(buffer) > 16 * RESYNC_READ_SIZE:
+                    self.__skip(start, bytes(buffer[:-16]), "damaged data")
+                    start += len(buffer) - 16
+                    del buffer[:-16]
+                position = max(len(buffer) - 3, 7)
+                chunk = self.__read(RESYNC_READ_SIZE)
+                eof = len(chunk) < RESYNC_READ_SIZE
+                buffer += chunk
+                continue
+
+            h = position - 6
+            position += 1
+            head = buffer[h:h + 14]
+            if len(head) < 10 and not eof:
+                position -= 1
+                chunk = self.__read(RESYNC_READ_SIZE)
+                eof = len(chunk) < RESYNC_READ_SIZE
+                buffer += chunk
+                continue
+            if not (self.__is_record_start(head) and head[7:10].isdigit()
+                    and int(head[7:10]) == first_drid
+                    and int(head[:6]) >= 8):
+                continue
+
+            # Confirmed by the start of the following record (or the end)
+            following = h + 6 + int(head[:6])
+            while len(buffer) < following + 7 and not eof:
+                chunk = self.__read(RESYNC_READ_SIZE)
+                eof = len(chunk) < RESYNC_READ_SIZE
+                buffer += chunk
+            if (eof and len(buffer) == following) or self.__is_record_start(
+                    bytes(buffer[following:following + 7]), None
+            ):
+                self.__skip(start, bytes(buffer[:h]), "damaged data record")
+                self.__push_back(buffer[h:])
+                return
+
+        self.__skip(start, bytes(buffer), "damaged data record")
+
+    def __read_record_in_sync(self, c: OrderedDict, row_start: bool) -> bool:
+        """Reads the data record of a column with `resync`.
+
+        Returns
+        -------
+        bool
+            False if the row lost some of its data records.
+        """
+        drid = int(c["IXFCDRID"])
+        if row_start:
+            self.__row_records = []
+        while True:
+            offset = self.__offset
+            skipped = self.number_skipped_records
+            record = self.__read_framed_record()
+            if row_start and self.number_skipped_records > skipped:
+                # The damaged bytes held at least a row
+                self.number_corrupted_rows += 1
+            if record["IXFDRECT"] != b"D":
+                # The end of the data records in the middle of a row
+                if not row_start:
+                    self.__skip_row("incomplete row")
+                    self.number_corrupted_rows += 1
+                return True
+
+            if int(record["IXFDRID"]) == drid:
+                self.__row_records.append((offset, record))
+                return True
+
+            raw = b"".join(record.values())
+            if row_start:
+                # Data records left by a damaged row
+                self.__skip(offset, raw, "data record out of its row")
+                continue
+
+            # The next row starts: the current one is incomplete
+            if int(record["IXFDRID"]) == int(
+                    self.column_records[0]["IXFCDRID"]
+            ):
+                self.__push_back(raw)
+            else:
+                self.__skip(offset, raw, "data record out of its row")
+            return False
+
+    def __skip_row(self, reason: str):
+        """Skips the data records of the current row (`resync`)."""
+        for offset, record in self.__row_records:
+            self.__skip(offset, b"".join(record.values()), reason)
+        self.__row_records = []
+        self.current_row = OrderedDict()
+
+    def __read_row_record(self, c: OrderedDict, first: bool) -> bool:
+        """Reads the data record of a column in position 1.
+
+        With `resync`, the data record has to follow the records of its row
+        (see `__read_record_in_sync`).
+
+        Returns
+        -------
+        bool
+            False if the current row is incomplete.
+        """
+        if not self.resync:
+            self.__read_record()
+            return True
+        return self.__read_record_in_sync(c, first)
+
+    def __collect_column(
+        self,
+        c: OrderedDict,
+        col_name: str,
+        pos: int,
+        profiler: Optional[ColumnProfiler]
+    ) -> Any:
+        """Collects the data of a column from the current data record.
+
+        Parameters
+        ----------
+        c : OrderedDict
+            Column descriptor.
+        col_name : str
+            Name of the column.
+        pos : int
+            Position of the column in the data record, starting at 0.
+        profiler : ColumnProfiler
+            Profiler of the columns, None if they are not profiled.
+
+        Returns
+        -------
+        Any
+            Data of the column, None if it is null.
+        """
+        fields = self.current_data_record["IXFDCOLS"]
+        # Handle nullable
+        if c["IXFCNULL"] == b"Y":
+            indicator = fields[pos:pos + 2]
+            # Column is null
+            if indicator == b"\xff\xff":
+                if profiler is not None:
+                    profiler.add_null(col_name)
+                return None
+            # Column is not null
+            if indicator == b"\x00\x00":
+                pos += 2
+
+        col_type = int(c["IXFCTYPE"])
+        collector = self.__collectors.get(col_type, None)
+        if collector is None:
+            msg = f"The column {col_name} has unknown data type {col_type}"
+            raise UnknownDataTypeException(msg)
+
+        if profiler is not None:
+            return profiler.collect(col_name, collector, c, fields, pos)
+        return collector(c, fields, pos)
+
+    def __on_row_error(self, col_name: str, error: Exception) -> OrderedDict:
+        """Handles an error raised while parsing a row.
+
+        A row failing to decode is counted as corrupted, with `resync` the
+        records of the row are skipped. Other errors stop the parsing.
+
+        Returns
+        -------
+        OrderedDict
+            Empty row.
+
+        Raises
+        ------
+        IXFParsingError
+            When the error stops the parsing.
+        """
+        self.current_row = OrderedDict()
+        if isinstance(error, UnknownDataTypeException) or not (
+                self.resync or isinstance(error, DataCollectorError)
+        ):
+            logger.error(error)
+            raise IXFParsingError(error)
+
+        self.decode_diagnostics.add(
+            col_name, type(error).__name__, error, error=True
+        )
+        if self.resync:
+            self.__skip_row(f"{type(error).__name__}: {error}")
+        return self.current_row
+
     def __parse_data_record(self) -> OrderedDict:
         """Parses one data record.
 
@@ -233,22 +782,26 @@ class IXFParser:
             the data record.
         """
         # Start Extraction
+        profiler = self.column_profile
+        first = self.column_records[0] if self.column_records else None
+        # Several parsers can take turns on a thread (generators)
+        set_decode_diagnostics(self.decode_diagnostics)
+        col_name = "?"
         try:
             self.current_row = OrderedDict()
             for c in self.column_records:
                 # Extract some metadata about the column
                 col_name = str(c["IXFCNAME"], encoding="utf-8").strip()
-                col_type = int(c["IXFCTYPE"])
-                col_is_nullable = c["IXFCNULL"] == b"Y"
                 col_position = int(c["IXFCPOSN"])
 
                 # Init the data collection
                 self.current_row[col_name] = None
-                collected_data = None  # noqa
 
                 # Parse next data record in case a column is in position 1
-                if col_position == 1:
-                    self.__read_data_record()
+                if col_position == 1 \
+                        and not self.__read_row_record(c, c is first):
+                    self.__skip_row("incomplete row")
+                    return self.current_row
 
                 # Mark the end of data records: helps exit the while loop
                 if self.current_data_record["IXFDRECT"] != b"D":
@@ -258,41 +811,14 @@ class IXFParser:
                     break
 
                 # Position index is then equals to position - 1
-                pos = col_position - 1
-
-                # Handle nullable
-                if col_is_nullable:
-                    # Column is null
-                    _dr = self.current_data_record["IXFDCOLS"][pos:pos + 2]
-                    if _dr == b"\xff\xff":
-                        self.current_row[col_name] = None
-                        continue
-                    # Column is not null
-                    elif _dr == b"\x00\x00":
-                        pos += 2
-
-                # Collect data
-                collector = collectors.get(col_type, None)
-                if collector is None:
-                    msg = f"The column {col_name} has unknown " \
-                          f"data type {col_type}"
-                    raise UnknownDataTypeException(msg)
-
-                collected_data = collector(
-                    c, self.current_data_record["IXFDCOLS"], pos
+                self.current_row[col_name] = self.__collect_column(
+                    c, col_name, col_position - 1, profiler
                 )
-                self.current_row[col_name] = collected_data
 
             self.current_data_record = OrderedDict()
             return self.current_row
-        except DataCollectorError as er1:
-            logger.error(er1)
-            self.current_row = OrderedDict()
-            return self.current_row
-        except (UnknownDataTypeException, Exception) as er2:
-            logger.error(er2)
-            self.current_row = OrderedDict()
-            raise IXFParsingError(er2)
+        except Exception as error:
+            return self.__on_row_error(col_name, error)
 
     def __update_statistics(self) -> "IXFParser":
         """Update stats and change state of the parser"""
@@ -321,38 +847,151 @@ class IXFParser:
         dict
             Parsed row data from IXF file.
         """
-        # Start parsing
-        while not self.end_data_records:
-            # Extract data
-            self.__parse_data_record()
+        progress = self.__progress
+        # Corrupted rows seen before the sample is big enough to judge them
+        pending = False
 
-            # Do not accept empty dictionary
-            if not self.current_row:
-                self.number_corrupted_rows += 1
-                continue
-
-            self.__update_statistics()
-            yield self.current_row
+        try:
+            # Start parsing
+            while not self.end_data_records:
+                # Extract data
+                self.__parse_data_record()
+
+                # Do not accept empty dictionary, the end of the data
+                # records is not a corrupted row
+                if not self.current_row:
+                    if not self.end_data_records:
+                        self.number_corrupted_rows += 1
+                        pending = not self.__check_corruption_rate(
+                            self.number_corrupted_rows
+                        )
+                    continue
+
+                self.__update_statistics()
+
+                if pending:
+                    pending = not self.__check_corruption_rate(
+                        self.number_corrupted_rows
+                    )
+
+                # Looking at the clock every few rows keeps it cheap
+                if progress is not None \
+                        and self.number_rows % PROGRESS_CHECK_ROWS == 0:
+                    progress.update(self.__get_bytes_read(), self.number_rows)
+
+                yield self.current_row
+        finally:
+            self.__close_dead_letter()
+            set_decode_diagnostics(None)
+            self.decode_diagnostics.report()
+
+        if progress is not None:
+            progress.finish(self.__get_bytes_read(), self.number_rows)
+
+    def __close_dead_letter(self):
+        """Closes the dead letter file opened by the parser."""
+        if self.__dead_letter_file is not None \
+                and self.__dead_letter_file is not self.dead_letter:
+            self.__dead_letter_file.close()
+        self.__dead_letter_file = None
+
+    def __get_bytes_read(self) -> int:
+        """Offset in the input (compressed one if it is compressed)."""
+        try:
+            return self.file.tell()
+        except (AttributeError, OSError, ValueError):
+            return self.file_size
 
-    def __start_parsing(self) -> "IXFParser":
+    def __start_parsing(
+        self,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> "IXFParser":
         """Starts the parsing."""
         logger.debug("Start parsing")
-        logger.debug("Put the pointer at the beginning of the ixf file")
-        self.file.seek(0)
+        self.stats.start()
+        self.__progress = None
+        if on_progress is not None:
+            self.__progress = ProgressReporter(on_progress, self.file_size)
+        if is_seekable(self.file):
+            logger.debug("Put the pointer at the beginning of the ixf file")
+            self.file.seek(0)
+        elif self.header_record or self.__validated:
+            raise IXFParsingError("A non-seekable input can be parsed once")
         logger.debug("Parse header record")
         self.__read_header()
         logger.debug("Parse table record")
         self.__read_table()
         logger.debug("Parse column descriptor records")
         self.__read_column_records()
+        if self.profile_columns:
+            self.column_profile = ColumnProfiler(self.column_records)
+        if self.resync:
+            self.__start_resync()
         return self
 
-    def start_parsing(self) -> "IXFParser":
-        """Starts the parsing."""
-        return self.__start_parsing()
+    def __start_resync(self):
+        """Inits the offsets and the dead letter file of `resync`."""
+        records = [self.header_record, self.table_record] \
+            + self.column_records
+        self.__offset = sum(len(v) for r in records for v in r.values()) \
+            + self.__skipped_bytes
+        self.__pushed = b""
+        self.__row_records = []
+        self.number_skipped_records = 0
+        self.number_skipped_bytes = 0
+        if isinstance(self.dead_letter, (str, Path, PathLike)):
+            self.__dead_letter_file = open(
+                self.dead_letter, mode="w", encoding="utf-8"
+            )
+        else:
+            self.__dead_letter_file = self.dead_letter
+
+    def start_parsing(
+        self,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> "IXFParser":
+        """Starts the parsing.
+
+        Parameters
+        ----------
+        on_progress : ProgressCallback
+            Called with the bytes read, the total bytes, the rows and the
+            elapsed seconds while the data records are parsed.
+        """
+        return self.__start_parsing(on_progress)
+
+    def __check_corruption_rate(self, corrupted: int) -> bool:
+        """Stops the parsing when the rate of corrupted rows exceeds the
+        accepted rate, once `min_sample_size` rows are parsed.
+
+        Returns
+        -------
+        bool
+            False if the sample is too small to check the rate yet.
+
+        Raises
+        ------
+        IXFParsingError
+            When the rate of corrupted rows exceeds the accepted rate.
+        """
+        total_rows = corrupted + self.number_rows
+        if total_rows < self.min_sample_size:
+            return False
+
+        cor_rate = corrupted / total_rows * 100
+        if int(cor_rate) > self.accepted_corruption_rate:
+            _msg = f"Corrupted data ({cor_rate}%) > " \
+                   f"({self.accepted_corruption_rate}%) accepted rate " \
+                   f"after {total_rows} rows, parsing aborted"
+            logger.error(_msg)
+            self.file.close()
+            raise IXFParsingError(_msg)
+        return True
 
     def __check_parsing(self) -> bool:
         """Do some checks on the parsing."""
+        self.stats.stop(self.number_rows, self.__get_bytes_read())
+
         total_rows = self.number_corrupted_rows + self.number_rows
         if total_rows == 0:
             logger.warning("Empty ixf file")
@@ -368,14 +1007,15 @@ class IXFParser:
         if int(cor_rate) != 0:
             logger.warning(f"Corrupted ixf file (rate={cor_rate}%)")
 
-        if int(cor_rate) > DB2IXF_ACCEPTED_CORRUPTION_RATE:
+        if int(cor_rate) > self.accepted_corruption_rate:
             _msg = f"Corrupted data ({cor_rate}%) > " \
-                   f"({DB2IXF_ACCEPTED_CORRUPTION_RATE}%) accepted rate"
+                   f"({self.accepted_corruption_rate}%) accepted rate"
             logger.error(_msg)
             logger.warning(
                 "You can change the accepted rate of the corrupted data "
-                "by setting `DB2IXF_ACCEPTED_CORRUPTION_RATE` environment "
-                "variable to a higher value"
+                "with `accepted_corruption_rate` or by setting "
+                "`DB2IXF_ACCEPTED_CORRUPTION_RATE` environment variable to a "
+                "higher value"
             )
             self.file.close()
             raise IXFParsingError(_msg)
@@ -398,6 +1038,44 @@ class IXFParser:
         """
         return self.__check_parsing()
 
+    def validate(self, max_problems: int = 10) -> Dict[str, Any]:
+        """Checks the structure of the ixf file without decoding its data.
+
+        Record types and lengths, positions of the columns in the data
+        records, lengths of the varying columns (VARCHAR, CLOB, ...) and the
+        end of the file are checked, much faster than a parsing. A seekable
+        input can be parsed after its validation.
+
+        Parameters
+        ----------
+        max_problems : int
+            The validation stops at this number of problems.
+
+        Returns
+        -------
+        Dict[str, Any]
+            `valid`, `complete` (False if the validation stopped before the
+            end of the file), `records`, `rows`, `bytes_read` and the
+            `problems` found: their `offset` in the (decompressed) input and
+            a description.
+
+        Raises
+        ------
+        IXFParsingError
+            If a non-seekable input was already read.
+        """
+        validator = IXFValidator(self.file, max_problems)
+        if is_seekable(self.file):
+            self.file.seek(0)
+        elif self.header_record or self.__validated:
+            raise IXFParsingError("A non-seekable input can be parsed once")
+        self.__validated = True
+        try:
+            return validator.validate()
+        finally:
+            if is_seekable(self.file):
+                self.file.seek(0)
+
     def __iter_row(self) -> Iterable[Dict]:
         """Yields extracted rows (Without parsing of header, table, cols)."""
         logger.debug("Parse all data records")
@@ -496,6 +1174,10 @@ class IXFParser:
         batch_size: Optional[int] = None,
     ) -> Iterable[RecordBatch]:
         """Yields pyarrow record batches from an iterable of rows."""
+        if data is None and self.__decodes_parts_in_parallel():
+            yield from self.__iter_parallel_record_batch(batch_size)
+            return
+
         if data is None:
             data = self.__iter_row()
 
@@ -518,13 +1200,124 @@ class IXFParser:
             counter += 1
             if counter % _size == 0:
                 _size = batch_size if batch_size else self.opt_batch_size
-                yield to_pyarrow_record_batch(batch, self.pyarrow_schema)
+                yield self.__to_record_batch(batch)
                 batch = defaultdict(list)
 
         if batch:
-            yield to_pyarrow_record_batch(batch, self.pyarrow_schema)
+            yield self.__to_record_batch(batch)
             batch.clear()
 
+    def __decodes_parts_in_parallel(self) -> bool:
+        """Whether the parts of the input are decoded in parallel."""
+        return isinstance(self.file, MultiPartReader) \
+            and self.workers > 1 and not self.profile_columns \
+            and not self.resync and self.on_skipped_record is None
+
+    def __iter_parallel_record_batch(
+        self,
+        batch_size: Optional[int] = None
+    ) -> Iterable[RecordBatch]:
+        """Yields the record batches of the parts decoded in parallel.
+
+        Every part is decoded by a worker process using the column records
+        read from the first part, its record batches are streamed back as
+        arrow ipc buffers through a bounded queue. The record batches are
+        yielded in the order of the parts and at most `workers` parts are
+        decoded ahead of the consumer.
+        """
+        reader = self.file
+        position = reader.tell()
+        first = min(
+            bisect_right(reader.offsets, position) - 1, len(reader.parts) - 1
+        )
+        tasks = iter(
+            [(reader.parts[first], position - reader.offsets[first])]
+            + [(p, 0) for p in reader.parts[first + 1:]]
+        )
+        ends = iter(reader.offsets[first + 1:])
+        progress = self.__progress
+        logger.debug(
+            f"Decode {len(reader.parts) - first} parts using "
+            f"{self.workers} processes"
+        )
+
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        # One queue per running part, the worker processes get them when
+        # they start: queues can not be sent with the tasks
+        context = multiprocessing.get_context()
+        queues = [
+            context.Queue(maxsize=PART_QUEUE_DEPTH)
+            for _ in range(self.workers)
+        ]
+        stop = context.Event()
+        slots = deque(range(self.workers))
+        pending = deque()
+        with ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=context,
+                initializer=_init_part_worker,
+                initargs=(queues, stop)
+        ) as executor:
+
+            def submit(part, offset):
+                slot = slots.popleft()
+                future = executor.submit(
+                    _decode_part,
+                    part,
+                    offset,
+                    self.column_records,
+                    self.pyarrow_schema,
+                    batch_size,
+                    slot
+                )
+                pending.append((future, slot))
+
+            for task in islice(tasks, self.workers):
+                submit(*task)
+            try:
+                while pending:
+                    future, slot = pending[0]
+                    for record_batch in _receive_part(
+                            queues[slot], future, self.pyarrow_schema
+                    ):
+                        self.stats.add_batch(record_batch.nbytes)
+                        yield record_batch
+                    rows, corrupted, diagnostics = future.result()
+                    pending.popleft()
+                    slots.append(slot)
+                    for task in islice(tasks, 1):
+                        submit(*task)
+                    self.number_rows += rows
+                    self.number_corrupted_rows += corrupted
+                    self.decode_diagnostics.merge(diagnostics)
+                    self.__check_corruption_rate(self.number_corrupted_rows)
+                    if progress is not None:
+                        progress.update(next(ends), self.number_rows)
+            finally:
+                # Unblocks the workers of the parts left behind
+                stop.set()
+                for future, slot in pending:
+                    future.cancel()
+                    _drain_part(queues[slot], future)
+                self.decode_diagnostics.report()
+
+        self.end_data_records = True
+        if progress is not None:
+            progress.finish(reader.size, self.number_rows)
+
+    def __to_record_batch(self, batch: Dict[str, list]) -> RecordBatch:
+        """Assembles a pyarrow record batch from columns of parsed values."""
+        if self.stats.enabled:
+            start = perf_counter()
+            record_batch = to_pyarrow_record_batch(batch, self.pyarrow_schema)
+            self.stats.add("batch", perf_counter() - start)
+        else:
+            record_batch = to_pyarrow_record_batch(batch, self.pyarrow_schema)
+        self.stats.add_batch(record_batch.nbytes)
+        return record_batch
+
     def iter_pyarrow_record_batch(
         self,
         data: Optional[Iterable[Dict]] = None,
@@ -620,9 +1413,19 @@ class IXFParser:
         )
         return _schema
 
-    def get_row(self) -> Iterable[Dict]:
+    def get_row(
+        self,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> Iterable[Dict]:
         """Yields parsed rows.
 
+        Parameters
+        ----------
+        on_progress : ProgressCallback
+            Called with the bytes read, the total bytes (0 if unknown), the
+            rows and the elapsed seconds, at most every
+            `DB2IXF_PROGRESS_INTERVAL` seconds and at the end of the parsing.
+
         Yields
         ------
         Dict
@@ -633,7 +1436,7 @@ class IXFParser:
         IXFParsingError
             In case it encounters a parsing error.
         """
-        self.__start_parsing()
+        self.__start_parsing(on_progress)
         for r in self.__iter_row():
             yield r
 
@@ -680,16 +1483,104 @@ class IXFParser:
             return rows
         return rows
 
+    @staticmethod
+    def __open_writer(
+        output: Union[str, Path, PathLike, TextIO, BinaryIO],
+        open_writer: Callable[[Any], BatchWriter],
+        max_rows_per_file: Optional[int] = None,
+        max_bytes_per_file: Optional[int] = None
+    ) -> Union[BatchWriter, RollingWriter]:
+        """Opens a writer, rolling to numbered files if limits are given."""
+        if max_rows_per_file is None and max_bytes_per_file is None:
+            return open_writer(output)
+
+        return RollingWriter(
+            output,
+            open_writer,
+            max_rows=max_rows_per_file,
+            max_bytes=max_bytes_per_file
+        )
+
+    def __write_batches(
+        self,
+        batches: Iterable[Union[RecordBatch, Table]],
+        output: Union[str, Path, PathLike, TextIO, BinaryIO],
+        open_writer: Callable[[Any], BatchWriter],
+        name: str,
+        queue_depth: Optional[int] = None,
+        max_rows_per_file: Optional[int] = None,
+        max_bytes_per_file: Optional[int] = None
+    ):
+        """Writes the batches on a writer thread, into one or several files.
+
+        When `max_rows_per_file` or `max_bytes_per_file` is given, the output
+        rolls to numbered files while the batches are written and a manifest
+        is stored in `manifest`.
+        """
+        self.manifest = None
+        writer = self.__open_writer(
+            output, open_writer, max_rows_per_file, max_bytes_per_file
+        )
+
+        try:
+            with BackgroundWriter(
+                    self.stats.timed("write", writer.write),
+                    queue_depth=queue_depth,
+                    name=name
+            ) as pipeline:
+                for batch in batches:
+                    pipeline.submit(batch)
+        except BaseException as err:
+            writer.abort(err)
+            raise
+
+        manifest = writer.close()
+        if isinstance(writer, RollingWriter):
+            self.manifest = manifest
+            logger.debug(f"Output split in {len(manifest['files'])} files")
+
     def to_json(
         self,
-        output: Union[str, Path, PathLike, TextIO]
+        output: Union[str, Path, PathLike, TextIO, BinaryIO],
+        batch_size: Optional[int] = None,
+        backend: Union[Literal["auto", "orjson", "json"], Callable] = "auto",
+        binary_format: Literal["base64", "hex"] = "base64",
+        queue_depth: Optional[int] = None,
+        compression: Optional[Literal["gzip", "bz2", "zstd"]] = None,
+        compression_level: Optional[int] = None,
+        on_progress: Optional[ProgressCallback] = None
     ) -> bool:
         """Parses and converts to JSON format.
 
+        Record batches are pre-formatted column-wise (dates, times and
+        timestamps as ISO 8601 strings, decimals as strings, binaries as base64
+        or hex) then serialized by the json backend on a writer thread.
+
         Parameters
         ----------
-        output : Union[str, Path, PathLike, IO]
-            Output file. It is better to use file-like object.
+        output : Union[str, Path, PathLike, TextIO, BinaryIO]
+            Output file. It is better to use file-like object opened in text
+            mode (utf-8) or in binary mode.
+        batch_size : int
+            Batch size, it used for memory optimization.
+        backend : Union[Literal["auto", "orjson", "json"], Callable]
+            Json serializer backend: `orjson`, `json`, `auto` (orjson if it
+            is installed) or a function returning json as bytes or str.
+        binary_format : Literal["base64", "hex"]
+            String representation of the binary columns.
+        queue_depth : int
+            Number of record batches buffered for the writer thread. Defaults
+            to `DB2IXF_WRITER_QUEUE_DEPTH`, `0` disables the writer thread.
+        compression : Optional[Literal["gzip", "bz2", "zstd"]]
+            Compresses the output while it is written (gzip and bz2 on a
+            background thread, zstd with multi-threading). It needs a path or
+            a file-like object opened in binary mode.
+        compression_level : int
+            Compression level.
+        on_progress : ProgressCallback
+            Called with the bytes read, the total bytes (0 if unknown), the
+            rows and the elapsed seconds, at most every
+            `DB2IXF_PROGRESS_INTERVAL` seconds and at the end of the parsing.
 
         Returns
         -------
@@ -701,53 +1592,85 @@ class IXFParser:
         IXFParsingError
             In case it encounters a parsing error.
         """
-        if isinstance(output, (str, Path, PathLike)):
-            output = open(output, mode="w", encoding="utf-8")
-
-        if not hasattr(output, "mode"):
-            msg = "File-like object should have `mode` attribute"
-            raise TypeError(msg)
-
-        if output.mode not in ["w", "wt"]:
-            msg = "File-like object should be opened in write and text mode"
-            raise ValueError(msg)
-
-        # Force utf-8 encoding for the json file
-        # (Maybe we will need to log without forcing)
-        if output.encoding != "utf-8":
-            raise ValueError("File-like object should be `utf-8` encoded")
+        output = check_output(output, compression=compression)
 
         # init the parsing
-        self.__start_parsing()
-        _rows = self.__iter_row()
+        self.__start_parsing(on_progress)
+        self.pyarrow_schema = self.__get_or_create_pyarrow_schema()
+        batches = self.__iter_pyarrow_record_batch(batch_size=batch_size)
+        serializer = JSONBatchSerializer(backend, binary_format)
+
+        def open_writer(out) -> JSONBatchWriter:
+            return JSONBatchWriter(
+                out, serializer, compression, compression_level
+            )
 
         logger.debug("Start writing in the json file")
-        with output as out:
-            out.write("[")
-            first_row = True
-            for r in _rows:
-                if not first_row:
-                    out.write(",")
-                json.dump(r, out, ensure_ascii=False, cls=CustomJSONEncoder)
-                first_row = False
-            out.write("]")
+        self.__write_batches(
+            batches,
+            output,
+            open_writer,
+            name="db2ixf-json-writer",
+            queue_depth=queue_depth
+        )
         logger.debug("Finished writing json file")
 
         # dereference source data
-        del _rows
+        del batches
 
         return self.__check_parsing()
 
     def to_jsonline(
         self,
-        output: Union[str, Path, PathLike, TextIO]
+        output: Union[str, Path, PathLike, TextIO, BinaryIO],
+        batch_size: Optional[int] = None,
+        backend: Union[Literal["auto", "orjson", "json"], Callable] = "auto",
+        binary_format: Literal["base64", "hex"] = "base64",
+        queue_depth: Optional[int] = None,
+        compression: Optional[Literal["gzip", "bz2", "zstd"]] = None,
+        compression_level: Optional[int] = None,
+        max_rows_per_file: Optional[int] = None,
+        max_bytes_per_file: Optional[int] = None,
+        on_progress: Optional[ProgressCallback] = None
     ) -> bool:
         """Parses and converts to JSON LINE format.
 
+        Record batches are pre-formatted column-wise (dates, times and
+        timestamps as ISO 8601 strings, decimals as strings, binaries as base64
+        or hex) then serialized by the json backend on a writer thread.
+
         Parameters
         ----------
-        output : Union[str, Path, PathLike, IO]
-            Output file. It is better to use file-like object.
+        output : Union[str, Path, PathLike, TextIO, BinaryIO]
+            Output file. It is better to use file-like object opened in text
+            mode (utf-8) or in binary mode.
+        batch_size : int
+            Batch size, it used for memory optimization.
+        backend : Union[Literal["auto", "orjson", "json"], Callable]
+            Json serializer backend: `orjson`, `json`, `auto` (orjson if it
+            is installed) or a function returning json as bytes or str.
+        binary_format : Literal["base64", "hex"]
+            String representation of the binary columns.
+        queue_depth : int
+            Number of record batches buffered for the writer thread. Defaults
+            to `DB2IXF_WRITER_QUEUE_DEPTH`, `0` disables the writer thread.
+        compression : Optional[Literal["gzip", "bz2", "zstd"]]
+            Compresses the output while it is written (gzip and bz2 on a
+            background thread, zstd with multi-threading). It needs a path or
+            a file-like object opened in binary mode.
+        compression_level : int
+            Compression level.
+        max_rows_per_file : int
+            Splits the output into numbered files (`name-00001.ext`, ...) of
+            at most this number of rows. It needs a path.
+        max_bytes_per_file : int
+            Splits the output into numbered files of about this size in bytes
+            (rolls once reached). It needs a path. A manifest listing the
+            files (`name.manifest.json`) is written next to them.
+        on_progress : ProgressCallback
+            Called with the bytes read, the total bytes (0 if unknown), the
+            rows and the elapsed seconds, at most every
+            `DB2IXF_PROGRESS_INTERVAL` seconds and at the end of the parsing.
 
         Returns
         -------
@@ -759,54 +1682,97 @@ class IXFParser:
         IXFParsingError
             In case it encounters a parsing error.
         """
-        if isinstance(output, (str, Path, PathLike)):
-            output = open(output, mode="w", encoding="utf-8")
-
-        if not hasattr(output, "mode"):
-            msg = "File-like object should have `mode` attribute"
-            raise TypeError(msg)
-
-        if output.mode not in ["w", "wt"]:
-            msg = "File-like object should be opened in write and text mode"
-            raise ValueError(msg)
-
-        # Force utf-8 encoding for the json file
-        # (Maybe we will need to log without forcing)
-        if output.encoding != "utf-8":
-            raise ValueError("File-like object should be `utf-8` encoded")
+        output = check_output(output, compression=compression)
+        check_split_output(output, max_rows_per_file, max_bytes_per_file)
 
         # init the parsing
-        self.__start_parsing()
-        _rows = self.__iter_row()
+        self.__start_parsing(on_progress)
+        self.pyarrow_schema = self.__get_or_create_pyarrow_schema()
+        batches = self.__iter_pyarrow_record_batch(batch_size=batch_size)
+        serializer = JSONBatchSerializer(backend, binary_format)
+
+        def open_writer(out) -> JSONLineBatchWriter:
+            return JSONLineBatchWriter(
+                out, serializer, compression, compression_level
+            )
 
         logger.debug("Start writing in the json line file")
-        with output as out:
-            for r in _rows:
-                json.dump(r, out, ensure_ascii=False, cls=CustomJSONEncoder)
-                out.write("\n")
+        self.__write_batches(
+            batches,
+            output,
+            open_writer,
+            name="db2ixf-jsonline-writer",
+            queue_depth=queue_depth,
+            max_rows_per_file=max_rows_per_file,
+            max_bytes_per_file=max_bytes_per_file
+        )
         logger.debug("Finished writing json line file")
 
         # dereference source data
-        del _rows
+        del batches
 
         return self.__check_parsing()
 
     def to_csv(
         self,
-        output: Union[str, Path, PathLike, TextIO],
+        output: Union[str, Path, PathLike, TextIO, BinaryIO],
         sep: Optional[str] = "|",
-        batch_size: Optional[int] = None
+        batch_size: Optional[int] = None,
+        quoting: Literal["needed", "all_valid", "none"] = "needed",
+        null_string: str = "",
+        header: bool = True,
+        binary_format: Literal["base64", "hex"] = "base64",
+        queue_depth: Optional[int] = None,
+        compression: Optional[Literal["gzip", "bz2", "zstd"]] = None,
+        compression_level: Optional[int] = None,
+        max_rows_per_file: Optional[int] = None,
+        max_bytes_per_file: Optional[int] = None,
+        on_progress: Optional[ProgressCallback] = None
     ) -> bool:
         """Parses and converts to CSV format.
 
+        Record batches are formatted and written by the pyarrow csv writer
+        (C++) on a writer thread, binary columns are written as base64 or hex
+        strings.
+
         Parameters
         ----------
-        output : Union[str, Path, PathLike, TextIO]
-            Output file. It is better to use file-like object
+        output : Union[str, Path, PathLike, TextIO, BinaryIO]
+            Output file. It is better to use file-like object opened in text
+            mode (utf-8) or in binary mode.
         sep : str
             Separator/delimiter of the columns.
         batch_size : int
             Batch size, it used for memory optimization
+        quoting : Literal["needed", "all_valid", "none"]
+            Quote the values only when needed, quote all the non null values
+            or never quote the values.
+        null_string : str
+            String representation of the null values.
+        header : bool
+            If True, writes the column names as the first line.
+        binary_format : Literal["base64", "hex"]
+            String representation of the binary columns.
+        queue_depth : int
+            Number of record batches buffered for the writer thread. Defaults
+            to `DB2IXF_WRITER_QUEUE_DEPTH`, `0` disables the writer thread.
+        compression : Optional[Literal["gzip", "bz2", "zstd"]]
+            Compresses the output while it is written (gzip and bz2 on a
+            background thread, zstd with multi-threading). It needs a path or
+            a file-like object opened in binary mode.
+        compression_level : int
+            Compression level.
+        max_rows_per_file : int
+            Splits the output into numbered files (`name-00001.ext`, ...) of
+            at most this number of rows. It needs a path.
+        max_bytes_per_file : int
+            Splits the output into numbered files of about this size in bytes
+            (rolls once reached). It needs a path. A manifest listing the
+            files (`name.manifest.json`) is written next to them.
+        on_progress : ProgressCallback
+            Called with the bytes read, the total bytes (0 if unknown), the
+            rows and the elapsed seconds, at most every
+            `DB2IXF_PROGRESS_INTERVAL` seconds and at the end of the parsing.
 
         Returns
         -------
@@ -818,31 +1784,37 @@ class IXFParser:
         IXFParsingError
             In case it encounters a parsing error.
         """
-        if isinstance(output, (str, Path, PathLike)):
-            output = open(output, mode="w", encoding="utf-8")
-
-        if not hasattr(output, "mode"):
-            raise TypeError("File-like object should have `mode` attribute")
-
-        if output.mode not in ["w", "wt"]:
-            msg = "File-like object should be opened in write and text mode"
-            raise ValueError(msg)
-
-        # Force utf-8 encoding for the csv file
-        # (Maybe we only need to log without forcing)
-        if output.encoding != "utf-8":
-            raise ValueError("File-like object should be `utf-8` encoded")
+        output = check_output(output, compression=compression)
+        check_split_output(output, max_rows_per_file, max_bytes_per_file)
 
         # init the parsing
-        self.__start_parsing()
-        batches = self.__iter_batch_of_rows(batch_size=batch_size)
+        self.__start_parsing(on_progress)
+        self.pyarrow_schema = self.__get_or_create_pyarrow_schema()
+        batches = self.__iter_pyarrow_record_batch(batch_size=batch_size)
+
+        def open_writer(out) -> CSVBatchWriter:
+            return CSVBatchWriter(
+                out,
+                self.pyarrow_schema,
+                sep=sep,
+                quoting=quoting,
+                null_string=null_string,
+                header=header,
+                binary_format=binary_format,
+                compression=compression,
+                compression_level=compression_level
+            )
 
         logger.debug("Start writing in the csv file")
-        with output as out:
-            writer = csv.writer(out, delimiter=sep)
-            writer.writerow(get_column_names(self.column_records))
-            for rows in batches:
-                writer.writerows([r.values() for r in rows])
+        self.__write_batches(
+            batches,
+            output,
+            open_writer,
+            name="db2ixf-csv-writer",
+            queue_depth=queue_depth,
+            max_rows_per_file=max_rows_per_file,
+            max_bytes_per_file=max_bytes_per_file
+        )
         logger.debug("Finished writing csv file")
 
         # dereference source data
@@ -892,10 +1864,29 @@ class IXFParser:
         self,
         output: Union[str, Path, PathLike, BinaryIO],
         parquet_version: str = "2.6",
-        batch_size: int = None
+        batch_size: int = None,
+        queue_depth: Optional[int] = None,
+        row_group_size: Optional[int] = None,
+        row_group_bytes: Optional[int] = DB2IXF_PARQUET_ROW_GROUP_BYTES,
+        compression: Optional[Union[str, Dict[str, str]]] = "snappy",
+        compression_level: Optional[Union[int, Dict[str, int]]] = None,
+        use_dictionary: Union[bool, List[str]] = True,
+        write_statistics: Union[bool, List[str]] = True,
+        data_page_size: Optional[int] = None,
+        max_rows_per_file: Optional[int] = None,
+        max_bytes_per_file: Optional[int] = None,
+        on_progress: Optional[ProgressCallback] = None
     ) -> bool:
         """Parses and converts to PARQUET format.
 
+        Parsing and writing run in a pipeline: record batches are pushed to a
+        bounded queue consumed by a writer thread which encodes, compresses
+        and writes them while the next batches are parsed.
+
+        Record batches are coalesced until they reach `row_group_size` rows or
+        `row_group_bytes` bytes, then they are written as one row group. It
+        avoids thousands of small row groups whatever the batch size is.
+
         Parameters
         ----------
         output : Union[str, Path, PathLike, BinaryIO]
@@ -905,6 +1896,38 @@ class IXFParser:
         batch_size : int
             Number of rows to extract before writing to the parquet file.
             It is used for memory optimization.
+        queue_depth : int
+            Number of record batches buffered for the writer thread. Defaults
+            to `DB2IXF_WRITER_QUEUE_DEPTH`, `0` disables the writer thread.
+        row_group_size : int
+            Maximum number of rows of a row group.
+        row_group_bytes : int
+            Target size in bytes of a row group (in memory, before encoding).
+            Defaults to `DB2IXF_PARQUET_ROW_GROUP_BYTES`.
+        compression : Union[str, Dict[str, str]]
+            Compression codec (snappy, gzip, brotli, zstd, lz4 or none), it
+            can be given per column.
+        compression_level : Union[int, Dict[str, int]]
+            Compression level of the codec, it can be given per column.
+        use_dictionary : Union[bool, List[str]]
+            Enables dictionary encoding for all the columns or only for the
+            given list of columns.
+        write_statistics : Union[bool, List[str]]
+            Writes statistics for all the columns or only for the given list
+            of columns.
+        data_page_size : int
+            Target size in bytes of the data pages inside a column chunk.
+        max_rows_per_file : int
+            Splits the output into numbered files (`name-00001.ext`, ...) of
+            at most this number of rows. It needs a path.
+        max_bytes_per_file : int
+            Splits the output into numbered files of about this size in bytes
+            (rolls once reached). It needs a path. A manifest listing the
+            files (`name.manifest.json`) is written next to them.
+        on_progress : ProgressCallback
+            Called with the bytes read, the total bytes (0 if unknown), the
+            rows and the elapsed seconds, at most every
+            `DB2IXF_PROGRESS_INTERVAL` seconds and at the end of the parsing.
 
         Returns
         -------
@@ -916,33 +1939,578 @@ class IXFParser:
         IXFParsingError
             In case it encounters a parsing error.
         """
-        if isinstance(output, (str, Path, PathLike)):
-            output = open(output, mode="wb")
+        output = check_output(output, text=False)
+        check_split_output(output, max_rows_per_file, max_bytes_per_file)
 
-        if not hasattr(output, "mode"):
-            raise TypeError("File-like object should have `mode` attribute")
+        # Init the parsing
+        self.__start_parsing(on_progress)
+        self.pyarrow_schema = self.__get_or_create_pyarrow_schema()
+        batches = self.__iter_pyarrow_record_batch(batch_size=batch_size)
+        row_groups = coalesce_record_batches(
+            batches,
+            max_rows=row_group_size,
+            max_bytes=row_group_bytes
+        )
 
-        # Accept only write and text mode when opening output file
-        if output.mode != "wb":
-            msg = "File-like object should be opened in write and binary mode"
-            raise ValueError(msg)
+        def open_writer(out) -> ParquetBatchWriter:
+            return ParquetBatchWriter(
+                out,
+                self.pyarrow_schema,
+                version=parquet_version,
+                compression=compression,
+                compression_level=compression_level,
+                use_dictionary=use_dictionary,
+                write_statistics=write_statistics,
+                data_page_size=data_page_size
+            )
+
+        logger.debug("Start writing parquet file")
+        self.__write_batches(
+            row_groups,
+            output,
+            open_writer,
+            name="db2ixf-parquet-writer",
+            queue_depth=queue_depth,
+            max_rows_per_file=max_rows_per_file,
+            max_bytes_per_file=max_bytes_per_file
+        )
+        logger.debug("Finished writing parquet file")
+
+        # dereference source data
+        del batches
+
+        return self.__check_parsing()
+
+    def __write_parquet_dataset(
+        self,
+        batches: Iterable[RecordBatch],
+        root: Union[str, Path, PathLike],
+        partition_by: Optional[Union[List[str], str]] = None,
+        max_rows_per_file: Optional[int] = None,
+        max_bytes_per_file: Optional[int] = None,
+        existing_data_behavior: Literal[
+            "error", "overwrite_or_ignore", "delete_matching"
+        ] = "error",
+        parquet_version: str = "2.6",
+        compression: Optional[str] = "snappy",
+        compression_level: Optional[int] = None,
+        max_open_files: Optional[int] = None,
+        filesystem: Optional[Any] = None
+    ):
+        """Writes the batches into a parquet dataset (see
+        `to_parquet_dataset`)."""
+        if isinstance(partition_by, str):
+            partition_by = [partition_by]
+
+        # Estimate the size of a row using the first batch
+        batches = iter(batches)
+        first_batch = next(batches, None)
+        row_size = 1
+        if first_batch is not None and first_batch.num_rows > 0:
+            row_size = max(1, first_batch.nbytes // first_batch.num_rows)
+            batches = chain([first_batch], batches)
+        logger.debug(f"Estimated row size = {row_size} bytes")
+
+        if max_bytes_per_file is not None:
+            rows = max(1, max_bytes_per_file // row_size)
+            if max_rows_per_file is None or rows < max_rows_per_file:
+                max_rows_per_file = rows
+        logger.debug(f"Max rows per file = {max_rows_per_file}")
+
+        # Avoid small row groups, same target as `to_parquet`
+        rows_per_group = max(1, DB2IXF_PARQUET_ROW_GROUP_BYTES // row_size)
+        if max_rows_per_file is not None:
+            rows_per_group = min(rows_per_group, max_rows_per_file)
+
+        from pyarrow.dataset import ParquetFileFormat, write_dataset
+
+        file_format = ParquetFileFormat()
+        file_options = file_format.make_write_options(
+            version=parquet_version,
+            compression=compression,
+            compression_level=compression_level,
+        )
+        reader = RecordBatchReader.from_batches(self.pyarrow_schema, batches)
+        # Local directory created by this writing, removed on failure
+        created = filesystem is None and not os.path.exists(root)
+        written = []
+
+        logger.debug("Start writing parquet dataset")
+        try:
+            write_dataset(
+                reader,
+                base_dir=str(root),
+                basename_template="part-{i}.parquet",
+                format=file_format,
+                file_options=file_options,
+                partitioning=partition_by,
+                partitioning_flavor="hive" if partition_by else None,
+                filesystem=filesystem,
+                use_threads=True,
+                max_open_files=max_open_files,
+                max_rows_per_file=max_rows_per_file or 0,
+                min_rows_per_group=rows_per_group,
+                max_rows_per_group=rows_per_group,
+                existing_data_behavior=existing_data_behavior,
+                file_visitor=lambda f: written.append(f.path),
+            )
+        except BaseException:
+            # Do not leave a partial dataset behind
+            if created:
+                shutil.rmtree(root, ignore_errors=True)
+            elif filesystem is None:
+                for path in written:
+                    Path(path).unlink(missing_ok=True)
+            logger.debug(f"Partial parquet dataset {root} removed")
+            raise
+        logger.debug("Finished writing parquet dataset")
+
+    def to_parquet_dataset(
+        self,
+        root: Union[str, Path, PathLike],
+        partition_by: Optional[Union[List[str], str]] = None,
+        max_rows_per_file: Optional[int] = None,
+        max_bytes_per_file: Optional[int] = None,
+        existing_data_behavior: Literal[
+            "error", "overwrite_or_ignore", "delete_matching"
+        ] = "error",
+        parquet_version: str = "2.6",
+        compression: Optional[str] = "snappy",
+        compression_level: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        max_open_files: Optional[int] = None,
+        filesystem: Optional[Any] = None,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> bool:
+        """Parses and converts to a (hive partitioned) PARQUET dataset.
+
+        Record batches are streamed to `pyarrow.dataset.write_dataset` which
+        writes the partitions in parallel and rolls to a new file once a file
+        reaches `max_rows_per_file` rows or about `max_bytes_per_file` bytes.
+
+        Parameters
+        ----------
+        root : Union[str, Path, PathLike]
+            Root directory of the dataset.
+        partition_by : Optional[Union[List[str], str]]
+            Columns used to partition the dataset (hive flavor:
+            `root/col=value/part-0.parquet`).
+        max_rows_per_file : int
+            Maximum number of rows of a file.
+        max_bytes_per_file : int
+            Target size in bytes (in memory, before encoding) of a file. It is
+            converted to a number of rows using the size of the first batch.
+        existing_data_behavior : Literal[...]
+            How to handle data already present in the root directory. Please
+            see pyarrow documentation of `write_dataset`.
+        parquet_version : str
+            Parquet version. Please see pyarrow documentation.
+        compression : str
+            Compression codec (snappy, gzip, brotli, zstd, lz4 or none).
+        compression_level : int
+            Compression level of the codec.
+        batch_size : int
+            Number of rows to extract before writing to the dataset.
+            It is used for memory optimization.
+        max_open_files : int
+            Maximum number of files opened at the same time by the writers.
+        filesystem : pyarrow.fs.FileSystem
+            Filesystem of the root directory, defaults to the local one.
+        on_progress : ProgressCallback
+            Called with the bytes read, the total bytes (0 if unknown), the
+            rows and the elapsed seconds, at most every
+            `DB2IXF_PROGRESS_INTERVAL` seconds and at the end of the parsing.
 
+        Returns
+        -------
+        bool
+            True if the parsing and conversion are ok.
+
+        Raises
+        ------
+        IXFParsingError
+            In case it encounters a parsing error.
+        """
         # Init the parsing
-        self.__start_parsing()
+        self.__start_parsing(on_progress)
         self.pyarrow_schema = self.__get_or_create_pyarrow_schema()
         batches = self.__iter_pyarrow_record_batch(batch_size=batch_size)
 
-        logger.debug("Start writing parquet file")
-        with output as of:
-            with ParquetWriter(
-                    where=of,
-                    schema=self.pyarrow_schema,
-                    flavor="spark",
-                    version=parquet_version
-            ) as writer:
+        self.__write_parquet_dataset(
+            batches,
+            root,
+            partition_by=partition_by,
+            max_rows_per_file=max_rows_per_file,
+            max_bytes_per_file=max_bytes_per_file,
+            existing_data_behavior=existing_data_behavior,
+            parquet_version=parquet_version,
+            compression=compression,
+            compression_level=compression_level,
+            max_open_files=max_open_files,
+            filesystem=filesystem
+        )
+
+        # dereference source data
+        del batches
+
+        return self.__check_parsing()
+
+    def to_arrow_ipc(
+        self,
+        output: Union[str, Path, PathLike, BinaryIO],
+        batch_size: Optional[int] = None,
+        queue_depth: Optional[int] = None,
+        compression: Optional[Literal["lz4", "zstd"]] = None,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> bool:
+        """Parses and converts to Arrow IPC file format (Feather v2).
+
+        Record batches are streamed to the file by a writer thread, the
+        result can be memory-mapped by the reader (no decoding cost).
+
+        Parameters
+        ----------
+        output : Union[str, Path, PathLike, BinaryIO]
+            Output file. It is better to use file-like object.
+        batch_size : int
+            Batch size, it used for memory optimization.
+        queue_depth : int
+            Number of record batches buffered for the writer thread. Defaults
+            to `DB2IXF_WRITER_QUEUE_DEPTH`, `0` disables the writer thread.
+        compression : Optional[Literal["lz4", "zstd"]]
+            Compression of the record batch buffers, None means uncompressed
+            (best for memory-mapping).
+        on_progress : ProgressCallback
+            Called with the bytes read, the total bytes (0 if unknown), the
+            rows and the elapsed seconds, at most every
+            `DB2IXF_PROGRESS_INTERVAL` seconds and at the end of the parsing.
+
+        Returns
+        -------
+        bool
+            True if the parsing and conversion are ok.
+
+        Raises
+        ------
+        IXFParsingError
+            In case it encounters a parsing error.
+        """
+        output = check_output(output, text=False)
+
+        # Init the parsing
+        self.__start_parsing(on_progress)
+        self.pyarrow_schema = self.__get_or_create_pyarrow_schema()
+        batches = self.__iter_pyarrow_record_batch(batch_size=batch_size)
+
+        def open_writer(out) -> ArrowIPCBatchWriter:
+            return ArrowIPCBatchWriter(out, self.pyarrow_schema, compression)
+
+        logger.debug("Start writing arrow ipc file")
+        self.__write_batches(
+            batches,
+            output,
+            open_writer,
+            name="db2ixf-arrow-ipc-writer",
+            queue_depth=queue_depth
+        )
+        logger.debug("Finished writing arrow ipc file")
+
+        # dereference source data
+        del batches
+
+        return self.__check_parsing()
+
+    def to_orc(
+        self,
+        output: Union[str, Path, PathLike, BinaryIO],
+        batch_size: Optional[int] = None,
+        queue_depth: Optional[int] = None,
+        compression: str = "snappy",
+        stripe_size: Optional[int] = None,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> bool:
+        """Parses and converts to ORC format.
+
+        Record batches are streamed to the file by a writer thread. ORC does
+        not support the time datatype so time columns are written as strings.
+
+        Parameters
+        ----------
+        output : Union[str, Path, PathLike, BinaryIO]
+            Output file. It is better to use file-like object.
+        batch_size : int
+            Batch size, it used for memory optimization.
+        queue_depth : int
+            Number of record batches buffered for the writer thread. Defaults
+            to `DB2IXF_WRITER_QUEUE_DEPTH`, `0` disables the writer thread.
+        compression : str
+            Compression codec (uncompressed, snappy, zlib, lz4 or zstd).
+        stripe_size : int
+            Target size in bytes of a stripe, defaults to the pyarrow default.
+        on_progress : ProgressCallback
+            Called with the bytes read, the total bytes (0 if unknown), the
+            rows and the elapsed seconds, at most every
+            `DB2IXF_PROGRESS_INTERVAL` seconds and at the end of the parsing.
+
+        Returns
+        -------
+        bool
+            True if the parsing and conversion are ok.
+
+        Raises
+        ------
+        IXFParsingError
+            In case it encounters a parsing error.
+        """
+        output = check_output(output, text=False)
+
+        # Init the parsing
+        self.__start_parsing(on_progress)
+        self.pyarrow_schema = self.__get_or_create_pyarrow_schema()
+        batches = self.__iter_pyarrow_record_batch(batch_size=batch_size)
+
+        options = {"compression": compression}
+        if stripe_size is not None:
+            options["stripe_size"] = stripe_size
+
+        def open_writer(out) -> ORCBatchWriter:
+            return ORCBatchWriter(out, self.pyarrow_schema, **options)
+
+        logger.debug("Start writing orc file")
+        self.__write_batches(
+            batches,
+            output,
+            open_writer,
+            name="db2ixf-orc-writer",
+            queue_depth=queue_depth
+        )
+        logger.debug("Finished writing orc file")
+
+        # dereference source data
+        del batches
+
+        return self.__check_parsing()
+
+    def __get_output_options(
+        self,
+        spec: Union[str, Path, PathLike, Dict[str, Any]]
+    ) -> Tuple[str, Any, Dict[str, Any]]:
+        """Format, output and options of an output of `convert`.
+
+        Raises
+        ------
+        ValueError
+            When the format is unknown or an option is not one of the format.
+        """
+        if not isinstance(spec, dict):
+            spec = {"output": spec}
+
+        options = dict(spec)
+        if "output" not in options:
+            raise ValueError("Output specification needs an `output` key")
+        output = options.pop("output")
+        fmt = options.pop("format", None)
+        if fmt is None:
+            fmt, compression = infer_output_format(output)
+            if compression is not None:
+                options.setdefault("compression", compression)
+
+        if fmt == "deltalake":
+            import deltalake
+
+            accepted = set(
+                inspect.signature(deltalake.write_deltalake).parameters
+            ) - {"table_or_uri", "data"}
+        elif fmt in OUTPUT_WRITERS:
+            accepted = OUTPUT_WRITERS[fmt][2] | SPLIT_OPTIONS
+        elif fmt == "parquet_dataset":
+            accepted = _PARQUET_DATASET_OPTIONS
+        else:
+            msg = f"Unknown output format `{fmt}`, expecting one of " \
+                  f"{sorted(set(OUTPUT_FORMATS.values()))}, `deltalake` " \
+                  f"or `parquet_dataset`"
+            raise ValueError(msg)
+
+        unknown = sorted(set(options) - accepted)
+        if unknown:
+            raise ValueError(
+                f"Unknown option `{unknown[0]}` of the {fmt} output "
+                f"{output}, expecting some of {sorted(accepted)}"
+            )
+        return fmt, output, options
+
+    def __get_deltalake_consumer(
+        self,
+        output: Union[str, Path],
+        options: Dict[str, Any]
+    ) -> Callable[[Iterable[RecordBatch]], None]:
+        """Creates the function writing the batches into a deltalake table
+        output of `convert`."""
+        delta_schema = apply_schema_fixes(self.pyarrow_schema)
+
+        def write_deltalake(batches: Iterable[RecordBatch]):
+            data = RecordBatchReader.from_batches(
+                delta_schema,
+                (cast_record_batch(b, delta_schema) for b in batches)
+            )
+            import deltalake
+
+            deltalake.write_deltalake(output, data, **options)
+
+        return write_deltalake
+
+    def __get_parquet_dataset_consumer(
+        self,
+        output: Union[str, Path, PathLike],
+        options: Dict[str, Any]
+    ) -> Callable[[Iterable[RecordBatch]], None]:
+        """Creates the function writing the batches into a parquet dataset
+        output of `convert`."""
+
+        def write_parquet_dataset(batches: Iterable[RecordBatch]):
+            self.__write_parquet_dataset(batches, output, **options)
+
+        return write_parquet_dataset
+
+    def __get_writer_opener(
+        self,
+        fmt: str,
+        output: Union[str, Path, PathLike, TextIO, BinaryIO],
+        options: Dict[str, Any]
+    ) -> Tuple[Any, Callable[[Any], BatchWriter]]:
+        """Checks the output of a format of `OUTPUT_WRITERS` and creates the
+        function opening its writer."""
+        writer_class, text, _, defaults = OUTPUT_WRITERS[fmt]
+        options = {**defaults, **options}
+        if text:
+            output = check_output(
+                output, compression=options.get("compression")
+            )
+        else:
+            output = check_output(output, text=False)
+        if "parquet_version" in options:
+            options["version"] = options.pop("parquet_version")
+        if writer_class in (JSONBatchWriter, JSONLineBatchWriter):
+            first = JSONBatchSerializer(
+                options.pop("backend"), options.pop("binary_format")
+            )
+        else:
+            first = self.pyarrow_schema
+
+        def open_writer(out) -> BatchWriter:
+            return writer_class(out, first, **options)
+
+        return output, open_writer
+
+    def __get_output_consumer(
+        self,
+        fmt: str,
+        output: Any,
+        options: Dict[str, Any]
+    ) -> Callable[[Iterable[RecordBatch]], None]:
+        """Creates the function writing the batches into an output of
+        `convert` (see `__get_output_options`)."""
+        options = dict(options)
+        consumers = {
+            "deltalake": self.__get_deltalake_consumer,
+            "parquet_dataset": self.__get_parquet_dataset_consumer,
+        }
+        if fmt in consumers:
+            return consumers[fmt](output, options)
+
+        max_rows_per_file = options.pop("max_rows_per_file", None)
+        max_bytes_per_file = options.pop("max_bytes_per_file", None)
+        row_group_size = options.pop("row_group_size", None)
+        row_group_bytes = options.pop(
+            "row_group_bytes", DB2IXF_PARQUET_ROW_GROUP_BYTES
+        )
+        output, open_writer = self.__get_writer_opener(fmt, output, options)
+        check_split_output(output, max_rows_per_file, max_bytes_per_file)
+
+        def write(batches: Iterable[RecordBatch]):
+            if fmt == "parquet":
+                batches = coalesce_record_batches(
+                    batches,
+                    max_rows=row_group_size,
+                    max_bytes=row_group_bytes
+                )
+            writer = self.__open_writer(
+                output, open_writer, max_rows_per_file, max_bytes_per_file
+            )
+            write_batch = self.stats.timed("write", writer.write)
+            try:
                 for batch in batches:
-                    writer.write_batch(batch)
-        logger.debug("Finished writing parquet file")
+                    write_batch(batch)
+            except BaseException as err:
+                writer.abort(err)
+                raise
+            writer.close()
+
+        return write
+
+    def convert(
+        self,
+        outputs: List[Union[str, Path, PathLike, Dict[str, Any]]],
+        batch_size: Optional[int] = None,
+        queue_depth: Optional[int] = None,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> bool:
+        """Parses once and converts to several outputs in one pass.
+
+        Each record batch is fanned out to all the outputs, every output is
+        written by its own thread fed by a bounded queue. The cost of N
+        outputs is one parse instead of N.
+
+        Parameters
+        ----------
+        outputs : List[Union[str, Path, PathLike, Dict[str, Any]]]
+            Outputs, either a path whose extension gives the format (and the
+            compression, e.g. `data.csv.gz`) or a dictionary with an `output`
+            key, an optional `format` key (json, jsonline, csv, parquet,
+            arrow_ipc, orc, parquet_dataset or deltalake) and the options of
+            the matching `to_*` method, e.g.
+            `{"output": "data.csv", "sep": ",", "max_rows_per_file": 10000}`.
+            Deltalake options are the ones of `deltalake.write_deltalake`.
+        batch_size : int
+            Batch size, it used for memory optimization.
+        queue_depth : int
+            Number of record batches buffered for each output. Defaults to
+            `DB2IXF_WRITER_QUEUE_DEPTH`.
+        on_progress : ProgressCallback
+            Called with the bytes read, the total bytes (0 if unknown), the
+            rows and the elapsed seconds, at most every
+            `DB2IXF_PROGRESS_INTERVAL` seconds and at the end of the parsing.
+
+        Returns
+        -------
+        bool
+            True if the parsing and conversion are ok.
+
+        Raises
+        ------
+        IXFParsingError
+            In case it encounters a parsing error.
+        """
+        if not outputs:
+            raise ValueError("At least one output is needed")
+        # Wrong specifications fail before the parsing starts
+        specs = [self.__get_output_options(o) for o in outputs]
+
+        # Init the parsing
+        self.__start_parsing(on_progress)
+        self.pyarrow_schema = self.__get_or_create_pyarrow_schema()
+        consumers = [self.__get_output_consumer(*s) for s in specs]
+        batches = self.__iter_pyarrow_record_batch(batch_size=batch_size)
+
+        logger.debug(f"Start writing {len(consumers)} outputs")
+        with FanOut(
+                consumers,
+                queue_depth=queue_depth,
+                name="db2ixf-output-writer"
+        ) as fanout:
+            for batch in batches:
+                fanout.submit(batch)
+        logger.debug(f"Finished writing {len(consumers)} outputs")
 
         # dereference source data
         del batches
@@ -959,6 +2527,7 @@ class IXFParser:
         partition_filters: Optional[List[Tuple[str, str, Any]]] = None,
         large_dtypes: bool = False,
         batch_size: Optional[int] = None,
+        on_progress: Optional[ProgressCallback] = None,
         **kwargs
     ) -> bool:
         """Parses and converts to a deltalake table.
@@ -989,6 +2558,10 @@ class IXFParser:
         batch_size : int
             Number of rows to extract before conversion operation.
             It is used for memory optimization.
+        on_progress : ProgressCallback
+            Called with the bytes read, the total bytes (0 if unknown), the
+            rows and the elapsed seconds, at most every
+            `DB2IXF_PROGRESS_INTERVAL` seconds and at the end of the parsing.
         **kwargs : Optional[dict]
             Some of the arguments you can give to this function
             `deltalake.write_deltalake`. See doc in
@@ -1000,8 +2573,11 @@ class IXFParser:
         bool:
             True if the parsing and conversion are ok.
         """
+        # deltalake is only loaded when it is used, it is slow to import
+        import deltalake
+
         # Init the parsing
-        self.__start_parsing()
+        self.__start_parsing(on_progress)
         self.pyarrow_schema = self.__get_or_create_pyarrow_schema(
             for_delta=True
         )
@@ -1028,4 +2604,83 @@ class IXFParser:
         return self.__check_parsing()
 
 
+_part_queues: List[Any] = []
+_part_stop: Optional[Any] = None
+
+
+def _init_part_worker(queues: List[Any], stop: Any):
+    """Gives a worker process the queues of the parts and the stop event."""
+    global _part_queues, _part_stop
+    _part_queues, _part_stop = queues, stop
+
+
+def _decode_part(
+    part: Union[str, Path, PathLike],
+    offset: int,
+    column_records: List[OrderedDict],
+    pyarrow_schema: Schema,
+    batch_size: Optional[int],
+    slot: int
+) -> Tuple[int, int, DecodeDiagnostics]:
+    """Decodes the data records of a part into the queue of its slot.
+
+    It runs in a worker process: the data records start at `offset` and are
+    decoded with the column records of the first part. The record batches
+    are put in the queue as arrow ipc buffers, followed by None.
+
+    Returns
+    -------
+    Tuple[int, int, DecodeDiagnostics]
+        Number of rows, of corrupted rows and the decoding problems.
+    """
+    queue = _part_queues[slot]
+    # The corruption rate is checked and the decoding problems are reported
+    # by the main process, on all the parts
+    parser = IXFParser(part, compression=None, accepted_corruption_rate=100)
+    parser.decode_diagnostics = DecodeDiagnostics(report=False)
+    parser.column_records = column_records
+    parser.pyarrow_schema = pyarrow_schema
+    parser.file.seek(offset)
+    try:
+        batches = parser.iter_pyarrow_record_batch(batch_size=batch_size)
+        for batch in batches:
+            if _part_stop.is_set():
+                break
+            queue.put(batch.serialize().to_pybytes())
+    finally:
+        parser.file.close()
+        queue.put(None)
+
+    return parser.number_rows, parser.number_corrupted_rows, \
+        parser.decode_diagnostics
+
+
+def _receive_part(
+    queue: Any,
+    future: Future,
+    pyarrow_schema: Schema
+) -> Iterable[RecordBatch]:
+    """Yields the record batches of a part decoded by `_decode_part`."""
+    while True:
+        try:
+            data = queue.get(timeout=1)
+        except Empty:
+            if future.done():
+                # Raises if the worker process died
+                future.result()
+            continue
+        if data is None:
+            return
+        yield read_record_batch(py_buffer(data), pyarrow_schema)
+
+
+def _drain_part(queue: Any, future: Future):
+    """Empties the queue of a part until its worker process is done."""
+    while not future.done():
+        try:
+            queue.get(timeout=0.1)
+        except Empty:
+            pass
+
+
 __all__ = ["IXFParser"]
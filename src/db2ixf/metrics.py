@@ -0,0 +1,471 @@
+# coding=utf-8
+"""Per-stage timings, throughput, progress and diagnostics of the parsing."""
+import logging
+
+from collections import defaultdict
+from db2ixf.constants import (
+    DB2IXF_DIAGNOSTICS_SAMPLES, DB2IXF_PROGRESS_INTERVAL, IXF_DTYPES,
+)
+from db2ixf.helpers import get_fallback_count
+from db2ixf.logger import logger
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+ProgressCallback = Callable[[int, int, int, float], None]
+"""Progress callback: `on_progress(bytes_read, total_bytes, rows, elapsed)`,
+`total_bytes` is 0 when the size of the input is unknown (pipes)."""
+
+PROGRESS_CHECK_ROWS = 256
+"""Number of rows parsed between two checks of the progress clock."""
+
+STAGES = ("read", "collect", "decode", "batch", "write")
+"""Stages of a conversion: record I/O, collectors of the non-character types,
+collectors of the character types (codec decoding), record batch assembly
+and writer calls."""
+
+CHARACTER_TYPES = {404, 408, 412, 448, 452, 456, 464, 468, 472}
+"""IXF data types whose collectors decode the cells with a codec."""
+
+
+class ParserStats:
+    """Timings and throughput of a parser.
+
+    Timings are only measured when the stats are enabled, the parser then
+    uses instrumented collectors and writers, otherwise it runs the plain
+    ones and only the elapsed time and the counters are kept.
+
+    Attributes
+    ----------
+    enabled : bool
+        Whether the stages are timed.
+    stages : Dict[str, float]
+        Seconds spent in each stage (see `STAGES`). Writers run on their
+        own threads, their time overlaps the other stages.
+    collectors : Dict[str, float]
+        Seconds spent in the collectors of each IXF data type.
+    batches : int
+        Number of record batches emitted.
+    peak_batch_bytes : int
+        Size in bytes of the biggest record batch.
+    """
+
+    def __init__(self, enabled: bool = False):
+        """Init the stats.
+
+        Parameters
+        ----------
+        enabled : bool
+            If True, the stages are timed.
+        """
+        self.enabled: bool = enabled
+        self.stages: Dict[str, float] = dict.fromkeys(STAGES, 0.0)
+        self.collectors: Dict[str, float] = defaultdict(float)
+        self.batches: int = 0
+        self.peak_batch_bytes: int = 0
+        self.rows: int = 0
+        self.bytes_read: int = 0
+        self._start: Optional[float] = None
+        self._stop: Optional[float] = None
+
+    def start(self):
+        """Starts the clock (again) of the elapsed time."""
+        self._start = perf_counter()
+        self._stop = None
+
+    def stop(self, rows: int, bytes_read: int):
+        """Stops the clock and records the totals of the parsing."""
+        self._stop = perf_counter()
+        self.rows = rows
+        self.bytes_read = bytes_read
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the start of the parsing (until its end)."""
+        if self._start is None:
+            return 0.0
+        end = self._stop if self._stop is not None else perf_counter()
+        return end - self._start
+
+    def add(self, stage: str, seconds: float):
+        """Adds time to a stage."""
+        self.stages[stage] += seconds
+
+    def add_batch(self, nbytes: int):
+        """Counts an emitted record batch of `nbytes` bytes."""
+        self.batches += 1
+        if nbytes > self.peak_batch_bytes:
+            self.peak_batch_bytes = nbytes
+
+    def timed(self, stage: str, func: Callable) -> Callable:
+        """Wraps a function to add its time to a stage (if enabled)."""
+        if not self.enabled:
+            return func
+
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.stages[stage] += perf_counter() - start
+
+        return wrapper
+
+    def instrument(
+        self,
+        collectors: Dict[int, Callable]
+    ) -> Dict[int, Callable]:
+        """Wraps the collectors to time them per data type (if enabled)."""
+        if not self.enabled:
+            return collectors
+
+        def instrumented(col_type: int, collector: Callable) -> Callable:
+            name = IXF_DTYPES.get(col_type, str(col_type))
+            stage = "decode" if col_type in CHARACTER_TYPES else "collect"
+
+            def wrapper(c, fields, pos):
+                start = perf_counter()
+                try:
+                    return collector(c, fields, pos)
+                finally:
+                    seconds = perf_counter() - start
+                    self.collectors[name] += seconds
+                    self.stages[stage] += seconds
+
+            return wrapper
+
+        return {t: instrumented(t, f) for t, f in collectors.items()}
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Stats as a json serializable dictionary."""
+        elapsed = self.elapsed
+        return {
+            "enabled": self.enabled,
+            "elapsed": round(elapsed, 6),
+            "rows": self.rows,
+            "bytes_read": self.bytes_read,
+            "rows_per_second": round(self.rows / elapsed, 3)
+            if elapsed else 0.0,
+            "bytes_per_second": round(self.bytes_read / elapsed, 3)
+            if elapsed else 0.0,
+            "batches": self.batches,
+            "peak_batch_bytes": self.peak_batch_bytes,
+            "stages": {k: round(v, 6) for k, v in self.stages.items()},
+            "collectors": {
+                k: round(v, 6) for k, v in sorted(self.collectors.items())
+            },
+        }
+
+
+FIXED_LENGTHS = {384: 10, 388: 8, 492: 8, 496: 4, 500: 2}
+"""Length in bytes of the IXF data types without a column length."""
+
+
+def column_length(c: Dict[str, Any]) -> int:
+    """Length in bytes of a column in the data records (0 if unknown)."""
+    col_type = int(c["IXFCTYPE"])
+    length = c["IXFCLENG"].strip()
+    if col_type in FIXED_LENGTHS:
+        return FIXED_LENGTHS[col_type]
+    if not length.isdigit():
+        return 0
+    if col_type == 484:
+        # Packed decimal: precision (3 digits) and scale (2 digits)
+        return int(length[0:3]) // 2 + 1
+    if col_type == 392:
+        # Timestamp: yyyy-mm-dd-hh.mm.ss followed by the fractional seconds
+        return 19 + (int(length) + 1 if int(length) else 0)
+    return int(length)
+
+
+class ColumnProfiler:
+    """Time, size, nulls and fallbacks of the collectors of each column.
+
+    Every collector invocation is timed, so a profiled parsing is slower
+    than a plain one: profiling is meant to find the columns eating the CPU
+    (e.g. strings decoded by a fallback codec or timestamps parsed twice).
+
+    Attributes
+    ----------
+    columns : Dict[str, Dict[str, Any]]
+        Counters per column name, in the order of the columns: `type`,
+        `seconds`, `calls`, `bytes`, `nulls`, `fallbacks` and `errors`.
+    """
+
+    def __init__(self, column_records: List[Dict[str, Any]]):
+        """Init the profiler.
+
+        Parameters
+        ----------
+        column_records : List[Dict[str, Any]]
+            Column descriptor records of the ixf file.
+        """
+        self.columns: Dict[str, Dict[str, Any]] = {}
+        for c in column_records:
+            col_type = int(c["IXFCTYPE"])
+            self.columns[str(c["IXFCNAME"], encoding="utf-8").strip()] = {
+                "type": IXF_DTYPES.get(col_type, str(col_type)),
+                "length": column_length(c),
+                "seconds": 0.0,
+                "calls": 0,
+                "bytes": 0,
+                "nulls": 0,
+                "fallbacks": 0,
+                "errors": 0,
+            }
+
+    def add_null(self, name: str):
+        """Counts a null cell of a column."""
+        self.columns[name]["nulls"] += 1
+
+    def collect(self, name: str, collector: Callable, c, fields, pos) -> Any:
+        """Calls the collector of a column and profiles it.
+
+        Parameters
+        ----------
+        name : str
+            Column name.
+        collector : Callable
+            Collector of the data type of the column.
+        c : dict
+            Column descriptor extracted from IXF file.
+        fields : bytes
+            Bytes string containing data of the row.
+        pos : int
+            Position of the column in the `fields`.
+
+        Returns
+        -------
+        Any
+            Collected value.
+        """
+        column = self.columns[name]
+        fallbacks = get_fallback_count()
+        start = perf_counter()
+        try:
+            value = collector(c, fields, pos)
+        except Exception:
+            column["errors"] += 1
+            raise
+        finally:
+            column["seconds"] += perf_counter() - start
+            column["calls"] += 1
+            column["fallbacks"] += get_fallback_count() - fallbacks
+
+        if isinstance(value, (str, bytes)):
+            column["bytes"] += len(value)
+        else:
+            column["bytes"] += column["length"]
+        return value
+
+    def as_rows(self, sort: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Profile of each column as json serializable dictionaries.
+
+        Parameters
+        ----------
+        sort : str
+            Key sorting the columns in descending order, e.g. `seconds`.
+            Defaults to the order of the columns.
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+            One dictionary per column: `column`, `type`, `seconds`, `calls`,
+            `avg_bytes` (length of strings and binaries, length of the
+            column otherwise), `null_rate`, `fallbacks` and `errors`.
+        """
+        rows = []
+        for name, column in self.columns.items():
+            cells = column["calls"] + column["nulls"]
+            rows.append(
+                {
+                    "column": name,
+                    "type": column["type"],
+                    "seconds": round(column["seconds"], 6),
+                    "calls": column["calls"],
+                    "avg_bytes": round(column["bytes"] / column["calls"], 1)
+                    if column["calls"] else 0.0,
+                    "null_rate": round(column["nulls"] / cells, 4)
+                    if cells else 0.0,
+                    "fallbacks": column["fallbacks"],
+                    "errors": column["errors"],
+                }
+            )
+        if sort is not None:
+            rows.sort(key=lambda r: r[sort], reverse=True)
+        return rows
+
+
+class ProgressReporter:
+    """Calls a progress callback at most every `interval` seconds.
+
+    Attributes
+    ----------
+    callback : ProgressCallback
+        Progress callback.
+    total_bytes : int
+        Size of the input, 0 if it is unknown.
+    interval : float
+        Minimum number of seconds between two calls (except the last one).
+    """
+
+    def __init__(
+        self,
+        callback: ProgressCallback,
+        total_bytes: int,
+        interval: Optional[float] = None
+    ):
+        """Init the progress reporter and start its clock.
+
+        Parameters
+        ----------
+        callback : ProgressCallback
+            Progress callback.
+        total_bytes : int
+            Size of the input, 0 if it is unknown.
+        interval : float
+            Minimum number of seconds between two calls. Defaults to
+            `DB2IXF_PROGRESS_INTERVAL`.
+        """
+        self.callback = callback
+        self.total_bytes = total_bytes
+        self.interval = DB2IXF_PROGRESS_INTERVAL if interval is None \
+            else interval
+        self._start: float = perf_counter()
+        self._last: float = self._start
+
+    def update(self, bytes_read: int, rows: int):
+        """Reports the progress if the interval has elapsed."""
+        now = perf_counter()
+        if now - self._last >= self.interval:
+            self._last = now
+            self.callback(bytes_read, self.total_bytes, rows, now - self._start)
+
+    def finish(self, bytes_read: int, rows: int):
+        """Reports the final progress."""
+        now = perf_counter()
+        self._last = now
+        self.callback(bytes_read, self.total_bytes, rows, now - self._start)
+
+
+class DecodeDiagnostics:
+    """Decoding problems counted per column and per kind.
+
+    Logging every cell decoded by a fallback codec or every row failing to
+    decode floods the logs and slows the parsing down: the problems are
+    counted instead, a few of them are kept as examples and a summary is
+    logged at the end of the parsing.
+
+    Attributes
+    ----------
+    counts : Dict[Tuple[str, str], int]
+        Number of problems per column and kind, e.g. `cp819 fallback to
+        cp437` or `DataCollectorError`.
+    samples : List[Dict[str, str]]
+        First `max_samples` problems: `column`, `kind` and `detail` (the
+        error or the cell).
+    errors : Set[Tuple[str, str]]
+        Columns and kinds of the problems losing their row.
+    """
+
+    def __init__(
+        self,
+        max_samples: Optional[int] = None,
+        report: bool = True
+    ):
+        """Init the diagnostics.
+
+        Parameters
+        ----------
+        max_samples : int
+            Number of problems kept as examples, defaults to
+            `DB2IXF_DIAGNOSTICS_SAMPLES`.
+        report : bool
+            Whether `report` logs the summary. The workers of a parallel
+            decoding do not, the main process reports the merged counters.
+        """
+        self.max_samples = DB2IXF_DIAGNOSTICS_SAMPLES if max_samples is None \
+            else max_samples
+        self.report_summary = report
+        self.counts: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.samples: List[Dict[str, str]] = []
+        self.errors: Set[Tuple[str, str]] = set()
+
+    def add(
+        self,
+        column: str,
+        kind: str,
+        detail: Any = None,
+        error: bool = False
+    ):
+        """Counts a problem, the detail is only formatted for the examples.
+
+        Parameters
+        ----------
+        column : str
+            Name of the column.
+        kind : str
+            Kind of problem.
+        detail : Any
+            Error or cell (bytes) of the problem.
+        error : bool
+            Whether the row of the cell is lost (logged as an error).
+        """
+        self.counts[(column, kind)] += 1
+        if error:
+            self.errors.add((column, kind))
+        if len(self.samples) < self.max_samples:
+            if isinstance(detail, (bytes, bytearray)):
+                detail = repr(bytes(detail[:64]))
+            self.samples.append({
+                "column": column,
+                "kind": kind,
+                "detail": "" if detail is None else str(detail),
+            })
+
+    def merge(self, other: "DecodeDiagnostics") -> "DecodeDiagnostics":
+        """Adds the counters and the examples of other diagnostics."""
+        for key, count in other.counts.items():
+            self.counts[key] += count
+        self.errors.update(other.errors)
+        room = max(self.max_samples - len(self.samples), 0)
+        self.samples.extend(other.samples[:room])
+        return self
+
+    @property
+    def total(self) -> int:
+        """Number of problems."""
+        return sum(self.counts.values())
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Counters (`column`, `kind` and `count`) and examples."""
+        return {
+            "total": self.total,
+            "counts": [
+                {"column": column, "kind": kind, "count": count}
+                for (column, kind), count in sorted(self.counts.items())
+            ],
+            "samples": list(self.samples),
+        }
+
+    def report(self):
+        """Logs a warning (an error if rows are lost) per column and kind,
+        the examples in debug."""
+        if not self.report_summary or not self.counts:
+            return
+        for (column, kind), count in sorted(self.counts.items()):
+            log = logger.error if (column, kind) in self.errors \
+                else logger.warning
+            log(f"Column {column}: {kind} ({count} times)")
+        if logger.isEnabledFor(logging.DEBUG):
+            for s in self.samples:
+                logger.debug(
+                    f"Example: column {s['column']}: {s['kind']}: "
+                    f"{s['detail']}"
+                )
+
+
+__all__ = [
+    "CHARACTER_TYPES", "ColumnProfiler", "DecodeDiagnostics", "FIXED_LENGTHS",
+    "PROGRESS_CHECK_ROWS", "ParserStats", "ProgressCallback",
+    "ProgressReporter", "STAGES", "column_length",
+]
@@ -0,0 +1,635 @@
+# coding=utf-8
+"""Packs the columns of record batches into the data records (D) of IXF.
+
+It is the other way of the collectors: each packer encodes a whole column at
+once, fixed-size data types straight from the arrow buffers (little-endian
+integers, big-endian floats, packed decimals, formatted dates and times) and
+strings in the code page of the column. The columns of a data record are
+then interleaved with strided copies, so only the varying-length columns
+cost a python operation per row.
+"""
+import sys
+from array import array as pyarray
+from datetime import datetime
+from itertools import chain
+from db2ixf.constants import (
+    COL_DESCRIPTOR_RECORD_TYPE, HEADER_RECORD_TYPE, TABLE_RECORD_TYPE,
+)
+from pyarrow import (
+    Array, RecordBatch, Schema, binary, date32, decimal128, float32, float64,
+    int16, int32, int64, large_binary, large_string, scalar, string, time32,
+    timestamp, types,
+)
+from struct import pack
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+DATA_RECORD_SIZE = 32000
+"""Size of the columns of a data record beyond which the next columns go to
+a new data record."""
+
+VARCHAR_LENGTH = 32672
+"""Maximum length of the strings and the binaries (DB2 VARCHAR limit)."""
+
+MAX_LOB_LENGTH = 999999 - 8 - 2 - 4
+"""Maximum length of the large strings and binaries: the length of a data
+record has 6 digits, minus its fields, the null indicator and the length of
+the LOB."""
+
+DBCS_CODE_PAGE = 1200
+"""Double-byte code page of the graphic columns (UTF-16)."""
+
+VARYING_TYPES = {404, 408, 448, 456, 464}
+"""IXF data types whose data has a varying length."""
+
+PADDED_VARYING_SIZE = 256
+"""Size up to which a varying-length column is padded to let the next
+columns in the same data record, longer ones end their data record."""
+
+_FIXED_SIZES = {384: 10, 388: 8, 492: 8, 496: 4, 500: 2}
+_NOT_NULL, _NULL = b"\x00\x00", b"\xff\xff"
+_SEPARATORS = bytes.maketrans(b" :", b"-.")
+
+
+def make_record(
+    record_type: Dict[str, int],
+    fields: Dict[str, bytes],
+    data: bytes = b""
+) -> bytes:
+    """Builds a record from its fields.
+
+    Parameters
+    ----------
+    record_type : Dict[str, int]
+        Names of the record fields and their length, e.g.
+        `HEADER_RECORD_TYPE`. The first one is the length of the record, it
+        is computed.
+    fields : Dict[str, bytes]
+        Values of the fields, padded with spaces (missing ones are blank).
+    data : bytes
+        Variable part of the record.
+
+    Returns
+    -------
+    bytes
+        Record.
+    """
+    parts = []
+    for name, width in list(record_type.items())[1:]:
+        parts.append(fields.get(name, b"").ljust(width, b" ")[:width])
+    body = b"".join(parts) + data
+    return b"%06d" % len(body) + body
+
+
+_IXF_TYPES: List[Tuple[Callable[[Any], bool], Tuple[int, int]]] = [
+    (types.is_boolean, (500, 2)),
+    (types.is_int8, (500, 2)),
+    (types.is_int16, (500, 2)),
+    (types.is_uint8, (500, 2)),
+    (types.is_int32, (496, 4)),
+    (types.is_uint16, (496, 4)),
+    (types.is_integer, (492, 8)),
+    (types.is_float16, (480, 4)),
+    (types.is_float32, (480, 4)),
+    (types.is_float64, (480, 8)),
+    (types.is_large_string, (408, MAX_LOB_LENGTH)),
+    (types.is_string, (448, VARCHAR_LENGTH)),
+    (types.is_large_binary, (404, MAX_LOB_LENGTH)),
+    (types.is_binary, (404, VARCHAR_LENGTH)),
+    (types.is_date, (384, 10)),
+    (types.is_time, (388, 8)),
+]
+"""Arrow data type predicates and their IXF data type and length, the first
+matching one wins."""
+
+
+def _ixf_type(
+    dtype,
+    name: str
+) -> Tuple[int, Union[int, Tuple[int, int]]]:
+    """IXF data type and length of an arrow data type."""
+    if types.is_dictionary(dtype):
+        return _ixf_type(dtype.value_type, name)
+    if types.is_decimal(dtype):
+        if dtype.precision > 31:
+            raise ValueError(
+                f"The column {name} has a precision of {dtype.precision}, "
+                f"DB2 decimals have at most 31 digits"
+            )
+        return 484, (dtype.precision, dtype.scale)
+    if types.is_fixed_size_binary(dtype):
+        return (912, dtype.byte_width) if dtype.byte_width <= 254 \
+            else (404, dtype.byte_width)
+    if types.is_timestamp(dtype):
+        return 392, 9 if dtype.unit == "ns" else 6
+    for predicate, ixf_type in _IXF_TYPES:
+        if predicate(dtype):
+            return ixf_type
+    raise ValueError(f"The column {name} has a non supported type {dtype}")
+
+
+def _column_size(column: Dict[str, Any]) -> int:
+    """Bytes reserved for a column in its data record."""
+    col_type, length = column["type"], column["length"]
+    size = 2 if column["nullable"] else 0
+    if col_type in (404, 408):
+        return size + 4 + length
+    if col_type in (448, 456):
+        return size + 2 + length
+    if col_type == 464:
+        return size + 2 + 2 * length
+    if col_type == 484:
+        return size + (length[0] + 2) // 2
+    if col_type == 392:
+        # Microseconds, nanoseconds beyond
+        return size + (26 if length <= 6 else 29)
+    return size + _FIXED_SIZES.get(col_type, length)
+
+
+def get_ixf_columns(
+    pyarrow_schema: Schema,
+    columns: Optional[Dict[str, Dict[str, Any]]] = None,
+    code_page: int = 1208,
+    record_size: int = DATA_RECORD_SIZE
+) -> List[Dict[str, Any]]:
+    """Describes the IXF columns of an arrow schema and their position.
+
+    Parameters
+    ----------
+    pyarrow_schema : Schema
+        Pyarrow schema.
+    columns : Dict[str, Dict[str, Any]]
+        Overrides per column name: `type` (IXF data type, e.g. 452 for a
+        CHAR), `length` (maximum length of the strings and binaries, 4 or 8
+        for the floats) and `code_page` (double-byte one for the graphics).
+    code_page : int
+        Single-byte code page of the character columns.
+    record_size : int
+        Size of the columns of a data record beyond which the next columns
+        go to a new data record.
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        One description per column: `name`, `type`, `length`, `nullable`,
+        `sbcp`, `dbcp`, `drid` (data record), `posn` (position in it) and
+        `size` (bytes reserved in the data record).
+    """
+    columns = columns or {}
+    unknown = set(columns) - set(pyarrow_schema.names)
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(sorted(unknown))}")
+
+    descriptions = []
+    drid, posn = 1, 1
+    for f in pyarrow_schema:
+        overrides = columns.get(f.name, {})
+        col_type, length = _ixf_type(f.type, f.name)
+        col_type = overrides.get("type", col_type)
+        if col_type != 484 and "length" in overrides:
+            length = overrides["length"]
+        if col_type == 392 and not isinstance(length, int):
+            length = 6
+        if col_type in (452, 912) and length > 254:
+            raise ValueError(
+                f"The column {f.name} is longer than 254 bytes, use a "
+                f"varying-length type"
+            )
+        if col_type not in packers:
+            raise ValueError(
+                f"The column {f.name} has a non supported IXF type {col_type}"
+            )
+
+        column = {
+            "name": f.name,
+            "type": col_type,
+            "length": length,
+            "nullable": f.nullable,
+            "sbcp": 0,
+            "dbcp": 0,
+        }
+        if col_type == 464:
+            column["dbcp"] = overrides.get("code_page", DBCS_CODE_PAGE)
+        elif col_type in (408, 448, 452, 456):
+            column["sbcp"] = overrides.get("code_page", code_page)
+        column["size"] = _column_size(column)
+
+        # A column does not straddle two data records
+        if posn > 1 and posn - 1 + column["size"] > record_size:
+            drid, posn = drid + 1, 1
+        column["drid"], column["posn"] = drid, posn
+        posn += column["size"]
+        # Padding long values wastes more than starting a new data record
+        if col_type in VARYING_TYPES \
+                and column["size"] > PADDED_VARYING_SIZE:
+            drid, posn = drid + 1, 1
+        descriptions.append(column)
+    return descriptions
+
+
+def make_header_record(
+    code_page: int = 1208,
+    records: int = 0,
+    created: Optional[datetime] = None
+) -> bytes:
+    """Builds the header record (H).
+
+    Parameters
+    ----------
+    code_page : int
+        Single-byte code page of the file.
+    records : int
+        Number of header, table and column records.
+    created : datetime
+        Date of the file, defaults to now.
+    """
+    created = created or datetime.now()
+    return make_record(
+        HEADER_RECORD_TYPE,
+        {
+            "IXFHRECT": b"H",
+            "IXFHID": b"IXF",
+            "IXFHVERS": b"0002",
+            "IXFHPROD": b"DB2    02.00",
+            "IXFHDATE": created.strftime("%Y%m%d").encode("ascii"),
+            "IXFHTIME": created.strftime("%H%M%S").encode("ascii"),
+            "IXFHHCNT": b"%05d" % records,
+            "IXFHSBCP": b"%05d" % code_page,
+            "IXFHDBCP": b"%05d" % DBCS_CODE_PAGE,
+        }
+    )
+
+
+def make_table_record(name: str, columns: List[Dict[str, Any]]) -> bytes:
+    """Builds the table record (T) of a table and its columns."""
+    name = name.encode("utf-8")[:256]
+    return make_record(
+        TABLE_RECORD_TYPE,
+        {
+            "IXFTRECT": b"T",
+            "IXFTNAML": b"%03d" % len(name),
+            "IXFTNAME": name,
+            "IXFTQULL": b"000",
+            "IXFTDATA": b"C",
+            "IXFTFORM": b"M",
+            "IXFTMFRM": b"PC",
+            "IXFTLOC": b"I",
+            "IXFTCCNT": b"%05d" % len(columns),
+            "IXFTPKNM": b"\x00" * 257,
+            "IXFTDSPC": b"\x00" * 257,
+            "IXFTISPC": b"\x00" * 257,
+            "IXFTLSPC": b"\x00" * 257,
+        }
+    )
+
+
+def make_column_record(column: Dict[str, Any]) -> bytes:
+    """Builds the column descriptor record (C) of a column."""
+    col_type, length = column["type"], column["length"]
+    if col_type == 484:
+        leng = b"%03d%02d" % length
+    elif col_type in _FIXED_SIZES:
+        leng = b""
+    else:
+        leng = b"%05d" % length
+    name = column["name"].encode("utf-8")[:256]
+    return make_record(
+        COL_DESCRIPTOR_RECORD_TYPE,
+        {
+            "IXFCRECT": b"C",
+            "IXFCNAML": b"%03d" % len(name),
+            "IXFCNAME": name,
+            "IXFCNULL": b"Y" if column["nullable"] else b"N",
+            "IXFCDEF": b"N",
+            "IXFCSLCT": b"Y",
+            "IXFCKPOS": b"N\x00",
+            "IXFCCLAS": b"R",
+            "IXFCTYPE": b"%03d" % col_type,
+            "IXFCSBCP": b"%05d" % column["sbcp"],
+            "IXFCDBCP": b"%05d" % column["dbcp"],
+            "IXFCLENG": leng,
+            "IXFCDRID": b"%03d" % column["drid"],
+            "IXFCPOSN": b"%06d" % column["posn"],
+            "IXFCLOBL": b"%020d" % (length if col_type in (404, 408) else 0),
+            "IXFCUDTL": b"000",
+            "IXFCDEFL": b"000",
+            "IXFCREF": b"0",
+            "IXFCNDIM": b"00",
+        },
+        # IXFCDSIZ
+        data=b"0" * 10
+    )
+
+
+def _values_buffer(values: Array, width: int) -> bytes:
+    """Bytes of the values of a fixed-width array (nulls included)."""
+    start = values.offset * width
+    buffer = values.buffers()[1]
+    return memoryview(buffer)[start:start + len(values) * width].tobytes()
+
+
+def _swapped(data: bytes, typecode: str, big_endian: bool) -> bytes:
+    """Numbers of the native byte order in the wanted byte order."""
+    if big_endian == (sys.byteorder == "big"):
+        return data
+    numbers = pyarray(typecode)
+    numbers.frombytes(data)
+    numbers.byteswap()
+    return numbers.tobytes()
+
+
+def _formatted(values: Array, width: int, name: str) -> bytes:
+    """Formats a temporal array into fixed-width ascii strings."""
+    import pyarrow.compute as pc
+
+    values = pc.fill_null(values, scalar(0, values.type))
+    # Casting to string is far faster than strftime, only the separators of
+    # the time differ from the IXF format
+    data = values.cast(string()).cast(binary())
+    offsets = memoryview(data.buffers()[1]).cast("i")
+    start, end = offsets[data.offset], offsets[data.offset + len(data)]
+    if end - start != len(values) * width:
+        raise ValueError(f"The column {name} has dates out of 0001-9999")
+    return data.buffers()[2].to_pybytes()[start:end].translate(_SEPARATORS)
+
+
+def pack_smallint(values: Array, c: Dict[str, Any]) -> bytes:  # noqa
+    """Packs SMALLINT values as little-endian 2 bytes integers."""
+    return _swapped(_values_buffer(values.cast(int16()), 2), "h", False)
+
+
+def pack_integer(values: Array, c: Dict[str, Any]) -> bytes:  # noqa
+    """Packs INTEGER values as little-endian 4 bytes integers."""
+    return _swapped(_values_buffer(values.cast(int32()), 4), "i", False)
+
+
+def pack_bigint(values: Array, c: Dict[str, Any]) -> bytes:  # noqa
+    """Packs BIGINT values as little-endian 8 bytes integers."""
+    return _swapped(_values_buffer(values.cast(int64()), 8), "q", False)
+
+
+def pack_floating_point(values: Array, c: Dict[str, Any]) -> bytes:
+    """Packs FLOATING POINT values as big-endian 4 or 8 bytes floats."""
+    if c["length"] == 4:
+        return _swapped(_values_buffer(values.cast(float32()), 4), "f", True)
+    return _swapped(_values_buffer(values.cast(float64()), 8), "d", True)
+
+
+def pack_decimal(values: Array, c: Dict[str, Any]) -> bytes:
+    """Packs DECIMAL values as packed decimals (BCD digits and a sign)."""
+    import pyarrow.compute as pc
+
+    precision, scale = c["length"]
+    digits = 2 * ((precision + 2) // 2) - 1
+    # Decimal256 values have 32 bytes, DB2 decimals fit in 16 bytes
+    values = values.cast(decimal128(precision, scale))
+    values = pc.fill_null(values, scalar(0, values.type))
+    buffer = memoryview(_values_buffer(values, 16))
+    order = sys.byteorder
+    packed = []
+    for i in range(0, len(buffer), 16):
+        unscaled = int.from_bytes(buffer[i:i + 16], order, signed=True)
+        sign = "d" if unscaled < 0 else "c"
+        packed.append(bytes.fromhex(f"{abs(unscaled):0{digits}d}{sign}"))
+    return b"".join(packed)
+
+
+def pack_date(values: Array, c: Dict[str, Any]) -> bytes:
+    """Packs DATE values as yyyy-mm-dd."""
+    return _formatted(values.cast(date32()), 10, c["name"])
+
+
+def pack_time(values: Array, c: Dict[str, Any]) -> bytes:
+    """Packs TIME values as hh.mm.ss (fractions of seconds are dropped)."""
+    return _formatted(
+        values.cast(time32("s"), safe=False), 8, c["name"]
+    )
+
+
+def pack_timestamp(values: Array, c: Dict[str, Any]) -> bytes:
+    """Packs TIMESTAMP values as yyyy-mm-dd-hh.mm.ss.nnnnnn.
+
+    Time zone aware values are written in UTC, as the parser reads them.
+    """
+    unit = "ns" if c["length"] > 6 else "us"
+    return _formatted(
+        values.cast(timestamp(unit), safe=False),
+        26 if unit == "us" else 29,
+        c["name"]
+    )
+
+
+def pack_binary(values: Array, c: Dict[str, Any]) -> bytes:
+    """Packs BINARY values (padded with zeros)."""
+    length = c["length"]
+    if types.is_fixed_size_binary(values.type) \
+            and values.type.byte_width == length:
+        return _values_buffer(values, length)
+    return b"".join(
+        v.ljust(length, b"\x00") for v in _encoded(values, c)
+    )
+
+
+def pack_char(values: Array, c: Dict[str, Any]) -> bytes:
+    """Packs CHAR values in the code page of the column (padded with
+    spaces)."""
+    length = c["length"]
+    space = " ".encode(f"cp{c['sbcp'] or 1208}")
+    return b"".join(v.ljust(length, space) for v in _encoded(values, c))
+
+
+def _encoded(values: Array, c: Dict[str, Any]) -> List[bytes]:
+    """Values as bytes: strings encoded in the code page of the column,
+    nulls are empty."""
+    code_page = c["dbcp"] or c["sbcp"]
+    if types.is_dictionary(values.type):
+        values = values.dictionary_decode()
+    if types.is_binary(values.type) or types.is_large_binary(values.type) \
+            or types.is_fixed_size_binary(values.type):
+        data = values.to_pylist()
+    elif code_page in (0, 1208, 1209):
+        # Arrow strings are utf-8: no need to decode them
+        data = values.cast(large_string()).cast(large_binary()).to_pylist()
+    else:
+        codec = f"cp{code_page}"
+        data = [
+            v.encode(codec) if v is not None else None
+            for v in values.cast(string()).to_pylist()
+        ]
+    data = [b"" if v is None else v for v in data]
+
+    units = 2 if c["type"] == 464 else 1
+    longest = max(map(len, data), default=0)
+    if longest > c["length"] * units:
+        raise ValueError(
+            f"The column {c['name']} has a value of {longest} bytes, its "
+            f"maximum length is {c['length']}"
+        )
+    return data
+
+
+def pack_varchar(values: Array, c: Dict[str, Any]) -> List[bytes]:
+    """Packs VARCHAR and LONGVARCHAR values: 2 bytes length and string."""
+    return [pack("<h", len(v)) + v for v in _encoded(values, c)]
+
+
+def pack_vargraphic(values: Array, c: Dict[str, Any]) -> List[bytes]:
+    """Packs VARGRAPHIC values: 2 bytes length (characters) and string."""
+    return [pack("<h", len(v) // 2) + v for v in _encoded(values, c)]
+
+
+def pack_lob(values: Array, c: Dict[str, Any]) -> List[bytes]:
+    """Packs CLOB and BLOB values: 4 bytes length and data."""
+    return [pack("<i", len(v)) + v for v in _encoded(values, c)]
+
+
+# Map between ixf data type code and its packer: fixed-size types give the
+# bytes of all the values, varying-length ones a list of values
+packers: Dict[int, Callable[[Array, Dict[str, Any]], Any]] = {
+    384: pack_date,
+    388: pack_time,
+    392: pack_timestamp,
+    404: pack_lob,
+    408: pack_lob,
+    448: pack_varchar,
+    452: pack_char,
+    456: pack_varchar,
+    464: pack_vargraphic,
+    480: pack_floating_point,
+    484: pack_decimal,
+    492: pack_bigint,
+    496: pack_integer,
+    500: pack_smallint,
+    912: pack_binary,
+}
+
+
+def _interleave(blocks: List[Tuple[bytes, int]], rows: int) -> bytearray:
+    """Interleaves fixed-width blocks of `rows` values into rows."""
+    width = sum(w for _, w in blocks)
+    out = bytearray(width * rows)
+    offset = 0
+    for data, w in blocks:
+        if w == width:
+            out[:] = data
+        elif w:
+            # One strided copy per byte of the value
+            for k in range(w):
+                out[offset + k::width] = data[k::w]
+        offset += w
+    return out
+
+
+def pack_record_batch(
+    batch: RecordBatch,
+    columns: List[Dict[str, Any]]
+) -> bytes:
+    """Packs a record batch into data records.
+
+    Parameters
+    ----------
+    batch : RecordBatch
+        Record batch having the columns described by `columns`.
+    columns : List[Dict[str, Any]]
+        IXF columns, see `get_ixf_columns`.
+
+    Returns
+    -------
+    bytes
+        Data records of the rows of the batch.
+    """
+    rows = batch.num_rows
+    records: Dict[int, List[Dict[str, Any]]] = {}
+    for c in columns:
+        records.setdefault(c["drid"], []).append(c)
+
+    # Segments of the rows: (bytes, width) for the parts having the same
+    # width in every row and (list, None) for the parts varying per row
+    segments: List[Tuple[Any, Optional[int]]] = []
+    for drid, record in sorted(records.items()):
+        body: List[Tuple[bytes, int]] = []
+        last_values = None
+        for c in record:
+            values = batch.column(c["name"])
+            if not c["nullable"] and values.null_count:
+                raise ValueError(f"The column {c['name']} is not nullable")
+            packed = packers[c["type"]](values, c)
+            valid = values.is_valid().to_pylist() if values.null_count \
+                else None
+
+            if isinstance(packed, list):
+                if c["nullable"]:
+                    valid = valid or [True] * rows
+                    packed = [
+                        _NOT_NULL + v if ok else _NULL
+                        for v, ok in zip(packed, valid)
+                    ]
+                if c is record[-1]:
+                    # The data record ends with the data of its last column
+                    last_values = packed
+                else:
+                    body.append((
+                        b"".join(v.ljust(c["size"], b"\x00") for v in packed),
+                        c["size"]
+                    ))
+                continue
+
+            if c["nullable"]:
+                indicators = _NOT_NULL * rows if valid is None else b"".join(
+                    _NOT_NULL if ok else _NULL for ok in valid
+                )
+                body.append((indicators, 2))
+            body.append((packed, c["size"] - 2 * c["nullable"]))
+
+        width = sum(w for _, w in body)
+        fields = b"D%03d    " % drid
+        if last_values is None:
+            header = b"%06d" % (width + 8) + fields
+            segments.append((header * rows, len(header)))
+        else:
+            segments.append(([
+                b"%06d" % (width + len(v) + 8) + fields for v in last_values
+            ], None))
+        segments.extend(body)
+        if last_values is not None:
+            segments.append((last_values, None))
+
+    return _join_segments(segments, rows)
+
+
+def _join_segments(
+    segments: List[Tuple[Any, Optional[int]]],
+    rows: int
+) -> bytes:
+    """Joins the segments of the rows into the bytes of the rows."""
+    merged: List[Tuple[Any, Optional[int]]] = []
+    blocks: List[Tuple[bytes, int]] = []
+    for data, width in segments + [(None, None)]:
+        if width is not None:
+            blocks.append((data, width))
+            continue
+        if blocks:
+            merged.append(
+                (_interleave(blocks, rows), sum(w for _, w in blocks))
+            )
+            blocks = []
+        if data is not None:
+            merged.append((data, None))
+
+    if len(merged) == 1 and merged[0][1] is not None:
+        return bytes(merged[0][0])
+
+    parts = [
+        data if width is None else [
+            data[i:i + width] for i in range(0, rows * width, width)
+        ]
+        for data, width in merged
+    ]
+    return b"".join(chain.from_iterable(zip(*parts)))
+
+
+__all__ = [
+    "DATA_RECORD_SIZE", "DBCS_CODE_PAGE", "MAX_LOB_LENGTH",
+    "PADDED_VARYING_SIZE", "VARCHAR_LENGTH", "VARYING_TYPES",
+    "get_ixf_columns", "make_column_record", "make_header_record",
+    "make_record", "make_table_record", "pack_record_batch", "packers",
+]
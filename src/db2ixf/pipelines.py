@@ -0,0 +1,300 @@
+# coding=utf-8
+"""Producer/consumer pipelines used to overlap parsing and writing."""
+import threading
+from db2ixf.constants import DB2IXF_WRITER_QUEUE_DEPTH
+from db2ixf.logger import logger
+from queue import Queue
+from typing import Any, Callable, Iterable, List, Optional
+
+_STOP = object()
+"""Sentinel telling the writer thread that no more items will come."""
+
+_ABORT = object()
+"""Sentinel telling the consumer threads that the producer failed."""
+
+
+class BackgroundWriter:
+    """Writes items on a dedicated thread fed by a bounded queue.
+
+    The parsing (GIL bound) stays in the calling thread while the writer
+    thread encodes, compresses and writes the items. Writers like pyarrow
+    release the GIL, so both stages overlap and the wall time tends to
+    max(parse, write) instead of their sum.
+
+    Attributes
+    ----------
+    write : Callable[[Any], Any]
+        Function called on the writer thread for each submitted item.
+    queue_depth : int
+        Maximum number of items waiting to be written. `0` disables the
+        thread and calls `write` directly in the calling thread.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[Any], Any],
+        queue_depth: Optional[int] = None,
+        name: str = "db2ixf-writer",
+    ):
+        """Init the background writer.
+
+        Parameters
+        ----------
+        write : Callable[[Any], Any]
+            Function called on the writer thread for each submitted item.
+        queue_depth : int
+            Maximum number of items waiting to be written. Defaults to
+            `DB2IXF_WRITER_QUEUE_DEPTH`, `0` means no background thread.
+        name : str
+            Name of the writer thread.
+        """
+        if queue_depth is None:
+            queue_depth = DB2IXF_WRITER_QUEUE_DEPTH
+
+        if not isinstance(queue_depth, int) or queue_depth < 0:
+            raise ValueError("`queue_depth` should be an integer >= 0")
+
+        self.write = write
+        self.queue_depth = queue_depth
+        self.name = name
+        self._queue: Optional[Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+        self._aborted: bool = False
+
+    def __enter__(self) -> "BackgroundWriter":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+    def __run(self):
+        """Consumes the queue until the stop sentinel is received."""
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            # Keep draining after a failure so the producer never blocks
+            if self._error is not None or self._aborted:
+                continue
+            try:
+                self.write(item)
+            except BaseException as err:  # noqa
+                logger.error(f"Writer thread failed: {err}")
+                self._error = err
+
+    def __raise_if_failed(self):
+        if self._error is not None:
+            raise self._error
+
+    def start(self) -> "BackgroundWriter":
+        """Starts the writer thread (if the pipeline is enabled)."""
+        if self.queue_depth == 0 or self._thread is not None:
+            return self
+
+        self._queue = Queue(maxsize=self.queue_depth)
+        self._thread = threading.Thread(
+            target=self.__run,
+            name=self.name,
+            daemon=True
+        )
+        self._thread.start()
+        logger.debug(f"Writer thread started (queue depth={self.queue_depth})")
+        return self
+
+    def submit(self, item: Any):
+        """Submits an item to write, blocks while the queue is full.
+
+        Raises
+        ------
+        BaseException
+            The error raised by the writer thread on a previous item.
+        """
+        self.__raise_if_failed()
+
+        if self._thread is None:
+            self.write(item)
+            return
+
+        self._queue.put(item)
+
+    def close(self):
+        """Waits until all submitted items are written.
+
+        Raises
+        ------
+        BaseException
+            The error raised by the writer thread, if any.
+        """
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+            logger.debug("Writer thread finished")
+
+        self.__raise_if_failed()
+
+    def abort(self):
+        """Drops the pending items and stops the writer thread."""
+        self._aborted = True
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+            logger.debug("Writer thread aborted")
+
+
+class FanOut:
+    """Feeds the same items to several consumers, each on its own thread.
+
+    Every consumer is a function receiving an iterable of the submitted
+    items, it runs on a dedicated thread fed by its own bounded queue. The
+    producer parses once and every item is shared (not copied) between the
+    consumers, so N outputs cost one parse plus N writes running in parallel.
+
+    Attributes
+    ----------
+    consumers : List[Callable[[Iterable[Any]], Any]]
+        Functions consuming the items (e.g. writing them to an output).
+    queue_depth : int
+        Maximum number of items waiting for each consumer.
+    """
+
+    def __init__(
+        self,
+        consumers: List[Callable[[Iterable[Any]], Any]],
+        queue_depth: Optional[int] = None,
+        name: str = "db2ixf-fanout",
+    ):
+        """Init the fan out.
+
+        Parameters
+        ----------
+        consumers : List[Callable[[Iterable[Any]], Any]]
+            Functions consuming the items (e.g. writing them to an output).
+        queue_depth : int
+            Maximum number of items waiting for each consumer. Defaults to
+            `DB2IXF_WRITER_QUEUE_DEPTH`, it is at least 1.
+        name : str
+            Prefix of the consumer thread names.
+        """
+        if queue_depth is None:
+            queue_depth = DB2IXF_WRITER_QUEUE_DEPTH
+
+        if not isinstance(queue_depth, int) or queue_depth < 0:
+            raise ValueError("`queue_depth` should be an integer >= 0")
+
+        self.consumers = consumers
+        self.queue_depth = max(queue_depth, 1)
+        self.name = name
+        self._queues: List[Queue] = []
+        self._threads: List[threading.Thread] = []
+        self._errors: List[Optional[BaseException]] = []
+        self._stopped: List[bool] = []
+
+    def __enter__(self) -> "FanOut":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+    def __iter_queue(self, index: int) -> Iterable[Any]:
+        """Yields the items of a queue until the stop sentinel."""
+        queue = self._queues[index]
+        while True:
+            item = queue.get()
+            if item is _STOP:
+                self._stopped[index] = True
+                return
+            if item is _ABORT:
+                raise RuntimeError("Producer failed, consumer aborted")
+            yield item
+
+    def __run(self, index: int):
+        """Runs a consumer then drains its queue until the stop sentinel."""
+        queue = self._queues[index]
+        try:
+            self.consumers[index](self.__iter_queue(index))
+        except BaseException as err:  # noqa
+            logger.error(f"Consumer thread {index} failed: {err}")
+            self._errors[index] = err
+        # Keep draining after a failure or a consumer returning before the
+        # end of the items (e.g. ignored output) so the producer never blocks
+        if not self._stopped[index]:
+            while queue.get() is not _STOP:
+                pass
+
+    def __raise_if_failed(self):
+        for err in self._errors:
+            if err is not None:
+                raise err
+
+    def start(self) -> "FanOut":
+        """Starts one thread per consumer."""
+        if self._threads:
+            return self
+
+        self._queues = [
+            Queue(maxsize=self.queue_depth) for _ in self.consumers
+        ]
+        self._errors = [None for _ in self.consumers]
+        self._stopped = [False for _ in self.consumers]
+        for index in range(len(self.consumers)):
+            thread = threading.Thread(
+                target=self.__run,
+                args=(index,),
+                name=f"{self.name}-{index}",
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        logger.debug(f"{len(self._threads)} consumer threads started")
+        return self
+
+    def submit(self, item: Any):
+        """Submits an item to all the consumers.
+
+        Raises
+        ------
+        BaseException
+            The error raised by a consumer thread.
+        """
+        self.__raise_if_failed()
+        for queue in self._queues:
+            queue.put(item)
+
+    def __stop(self, sentinels: List[Any]):
+        for queue in self._queues:
+            for sentinel in sentinels:
+                queue.put(sentinel)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def close(self):
+        """Waits until all the consumers have consumed all the items.
+
+        Raises
+        ------
+        BaseException
+            The first error raised by a consumer thread, if any.
+        """
+        self.__stop([_STOP])
+        logger.debug("Consumer threads finished")
+        self.__raise_if_failed()
+
+    def abort(self):
+        """Makes the consumers fail (so they clean up) and stops them."""
+        self.__stop([_ABORT, _STOP])
+        logger.debug("Consumer threads aborted")
+
+
+__all__ = ["BackgroundWriter", "FanOut"]
@@ -0,0 +1,247 @@
+# coding=utf-8
+"""Readers presenting several input files or a pipe as one binary stream."""
+import io
+import os
+from db2ixf.logger import logger
+from os import PathLike
+from pathlib import Path
+from typing import BinaryIO, List, Optional, Sequence, Union
+
+
+class MultiPartReader:
+    """Read-binary file-like object concatenating the parts of an ixf file.
+
+    Big exports are split into parts (`tab1.ixf.001`, `tab1.ixf.002`, ...)
+    which are the continuation of each other, the parser reads them as a
+    single file. Parts are opened lazily, one at a time.
+
+    Attributes
+    ----------
+    parts : List[Union[str, Path, PathLike]]
+        Paths of the parts, in order.
+    """
+
+    mode = "rb"
+
+    def __init__(self, parts: Sequence[Union[str, Path, PathLike]]):
+        """Init the multi-part reader.
+
+        Parameters
+        ----------
+        parts : Sequence[Union[str, Path, PathLike]]
+            Paths of the parts, in order.
+        """
+        if not parts:
+            raise ValueError("At least one part is needed")
+
+        self.parts: List[Union[str, Path, PathLike]] = list(parts)
+        self.sizes: List[int] = [os.path.getsize(p) for p in self.parts]
+        """Size in bytes of each part."""
+        self.offsets: List[int] = [0]
+        """Offset of each part in the concatenated stream."""
+        for size in self.sizes:
+            self.offsets.append(self.offsets[-1] + size)
+        self._index: int = 0
+        self._file: Optional[BinaryIO] = None
+        self._closed: bool = False
+        logger.debug(f"Multi-part input of {len(self.parts)} parts")
+
+    def __open(self, index: int, position: int = 0):
+        """Opens a part and moves to a position inside it."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._index = index
+        if index < len(self.parts):
+            self._file = open(self.parts[index], mode="rb")
+            self._file.seek(position)
+
+    @property
+    def size(self) -> int:
+        """Total size in bytes of the parts."""
+        return self.offsets[-1]
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        """Reads `size` bytes across the parts (all remaining bytes if < 0)."""
+        if size is None or size < 0:
+            size = self.size - self.tell()
+
+        if self._file is None and self._index < len(self.parts):
+            self.__open(self._index)
+
+        chunks = []
+        while size > 0 and self._file is not None:
+            chunk = self._file.read(size)
+            if not chunk:
+                self.__open(self._index + 1)
+                continue
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b"".join(chunks)
+
+    def tell(self) -> int:
+        """Offset in the concatenated stream."""
+        if self._index >= len(self.parts):
+            return self.size
+        position = self._file.tell() if self._file is not None else 0
+        return self.offsets[self._index] + position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        """Moves to an offset of the concatenated stream."""
+        if whence == os.SEEK_CUR:
+            offset += self.tell()
+        elif whence == os.SEEK_END:
+            offset += self.size
+        offset = min(max(offset, 0), self.size)
+
+        index = 0
+        while index < len(self.parts) and offset >= self.offsets[index + 1]:
+            index += 1
+        self.__open(index, offset - self.offsets[min(index, len(self.parts))])
+        return offset
+
+    def close(self):
+        """Closes the current part."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "MultiPartReader":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class StreamReader:
+    """Read-binary file-like object over a non-seekable input (pipe, stdin).
+
+    It counts the bytes read so `tell` works, can `peek` at the next bytes
+    without consuming them (e.g. to detect the compression) and only accepts
+    seeking to the current position, the input is read once from start to
+    end.
+
+    Attributes
+    ----------
+    raw : BinaryIO
+        Non-seekable input opened in read-binary mode.
+    """
+
+    mode = "rb"
+
+    def __init__(self, raw: BinaryIO):
+        """Init the stream reader.
+
+        Parameters
+        ----------
+        raw : BinaryIO
+            Non-seekable input opened in read-binary mode.
+        """
+        self.raw = raw
+        self._buffer: bytes = b""
+        self._position: int = 0
+
+    @property
+    def closed(self) -> bool:
+        return self.raw.closed
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def __read_raw(self, size: int) -> bytes:
+        """Reads `size` bytes from the input, pipes can return less."""
+        chunks = []
+        while size > 0:
+            chunk = self.raw.read(size)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b"".join(chunks)
+
+    def peek(self, size: int = 1) -> bytes:
+        """Returns the next `size` bytes (less at the end) without reading."""
+        if len(self._buffer) < size:
+            self._buffer += self.__read_raw(size - len(self._buffer))
+        return self._buffer[:size]
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        """Reads `size` bytes (all remaining bytes if < 0)."""
+        if size is None or size < 0:
+            data = self._buffer + self.raw.read()
+            self._buffer = b""
+        else:
+            data = self._buffer[:size]
+            self._buffer = self._buffer[size:]
+            data += self.__read_raw(size - len(data))
+        self._position += len(data)
+        return data
+
+    def tell(self) -> int:
+        """Number of bytes read."""
+        return self._position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        """Only seeking to the current position is supported."""
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        if whence == os.SEEK_END or offset != self._position:
+            raise io.UnsupportedOperation(
+                "Non-seekable input, it can only be read once"
+            )
+        return self._position
+
+    def close(self):
+        """Closes the input."""
+        self.raw.close()
+
+    def __enter__(self) -> "StreamReader":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def find_parts(path: Union[str, Path, PathLike]) -> List[Path]:
+    """Finds the parts of an ixf file.
+
+    Parameters
+    ----------
+    path : Union[str, Path, PathLike]
+        Path of the ixf file, e.g. `tab1.ixf`.
+
+    Returns
+    -------
+    List[Path]
+        `[tab1.ixf]` if it exists, otherwise the numbered parts
+        `[tab1.ixf.001, tab1.ixf.002, ...]` in order (empty if none exists).
+    """
+    path = Path(path)
+    if path.is_file():
+        return [path]
+
+    parts = []
+    for candidate in path.parent.glob(f"{path.name}.*"):
+        suffix = candidate.name[len(path.name) + 1:]
+        if suffix.isdigit() and candidate.is_file():
+            parts.append((int(suffix), candidate))
+    return [p for _, p in sorted(parts)]
+
+
+__all__ = ["MultiPartReader", "StreamReader", "find_parts"]
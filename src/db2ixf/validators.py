@@ -0,0 +1,505 @@
+# coding=utf-8
+"""Checks the structure of an ixf file without decoding its data.
+
+The records are walked by their length: record types, record lengths,
+positions of the columns inside the data records, lengths of the varying
+columns and the end of the file are checked. Strings, dates, decimals, ...
+are never decoded, so a validation runs at the speed of the reads.
+"""
+import re
+
+from collections import OrderedDict
+from db2ixf.collectors import collectors
+from db2ixf.constants import (
+    COL_DESCRIPTOR_RECORD_TYPE, HEADER_RECORD_TYPE, TABLE_RECORD_TYPE,
+    VALIDATION_READ_SIZE,
+)
+from db2ixf.logger import logger
+from db2ixf.metrics import column_length
+from struct import Struct
+from typing import Any, BinaryIO, Dict, List, Optional
+
+LENGTH_PREFIXES = {404: 4, 408: 4, 448: 2, 456: 2, 464: 2}
+"""Size in bytes of the length stored before the data of the varying data
+types."""
+
+_RECORD_START = re.compile(rb"[0-9]{6}[A-Z]")
+_NULL = b"\xff\xff"
+_NOT_NULL = b"\x00\x00"
+_UNPACK_LENGTH = {2: Struct("<h").unpack_from, 4: Struct("<i").unpack_from}
+
+
+def _split(record_type: OrderedDict, record: bytes) -> OrderedDict:
+    """Splits a record into its fields."""
+    fields = OrderedDict()
+    start = 0
+    for name, width in record_type.items():
+        fields[name] = record[start:start + width]
+        start += width
+    return fields
+
+
+def _is_record_start(data: bytes) -> bool:
+    """Whether the bytes are 6 digits of length followed by a record type."""
+    return _RECORD_START.match(data) is not None
+
+
+class IXFValidator:
+    """Validates the structure of an ixf file.
+
+    Attributes
+    ----------
+    problems : List[Dict[str, Any]]
+        First problems found: `offset` (in the decompressed input) and
+        `problem`.
+    records : int
+        Number of records walked.
+    rows : int
+        Number of complete rows.
+    complete : bool
+        False if the validation stopped at `max_problems`.
+    """
+
+    def __init__(
+        self,
+        file: BinaryIO,
+        max_problems: int = 10,
+        read_size: int = VALIDATION_READ_SIZE
+    ):
+        """Init the validator.
+
+        Parameters
+        ----------
+        file : BinaryIO
+            Ixf file, read from its current position.
+        max_problems : int
+            The validation stops at this number of problems.
+        read_size : int
+            Bytes read at once.
+        """
+        if not isinstance(max_problems, int) or max_problems < 1:
+            raise ValueError("`max_problems` should be an integer >= 1")
+
+        self.file = file
+        self.max_problems = max_problems
+        self.read_size = read_size
+        self.problems: List[Dict[str, Any]] = []
+        self.records: int = 0
+        self.rows: int = 0
+        self.complete: bool = True
+        # Bytes read ahead, the offset of their first byte and the position
+        # of the next record in them
+        self.__buffer: bytes = b""
+        self.__base: int = 0
+        self.__pos: int = 0
+        # Checks of the data records per record id (IXFDRID)
+        self.__layout: Dict[int, tuple] = {}
+        self.__drids: List[int] = []
+        # Index of the next record id of a row and the offset and length of
+        # the previous record
+        self.__index: int = 0
+        self.__previous: Optional[tuple] = None
+
+    def __fill(self, size: int) -> bool:
+        """Whether `size` bytes are available from the current position,
+        reads more bytes if needed."""
+        available = len(self.__buffer) - self.__pos
+        if available >= size:
+            return True
+        chunks = [self.__buffer[self.__pos:]]
+        self.__base += self.__pos
+        self.__pos = 0
+        while available < size:
+            chunk = self.file.read(max(self.read_size, size - available))
+            if not chunk:
+                break
+            chunks.append(chunk)
+            available += len(chunk)
+        self.__buffer = b"".join(chunks)
+        return available >= size
+
+    def __add_problem(self, offset: int, problem: str) -> bool:
+        """Records a problem, True once `max_problems` are found."""
+        logger.debug(f"Offset {offset}: {problem}")
+        self.problems.append({"offset": offset, "problem": problem})
+        if len(self.problems) >= self.max_problems:
+            self.complete = False
+            return True
+        return False
+
+    def __read_record(self, record_type: bytes, name: str) -> Optional[bytes]:
+        """Reads a header, table or column descriptor record, the application
+        records and the records of unknown types before it are skipped."""
+        while True:
+            offset = self.__base + self.__pos
+            if not self.__fill(7):
+                self.__add_problem(
+                    offset, f"{name} record expected, end of file"
+                )
+                return None
+
+            start = self.__buffer[self.__pos:self.__pos + 7]
+            if not _is_record_start(start) or record_type == b"H" \
+                    and start[6:7] != record_type:
+                self.__add_problem(
+                    offset, f"{name} record expected, found {start!r}"
+                )
+                return None
+
+            size = 6 + int(start[:6])
+            if not self.__fill(size):
+                self.__add_problem(
+                    offset, f"Truncated record: {size} bytes expected, "
+                            f"{len(self.__buffer) - self.__pos} found"
+                )
+                return None
+
+            record = self.__buffer[self.__pos:self.__pos + size]
+            self.__pos += size
+            self.records += 1
+            if start[6:7] == record_type:
+                return record
+
+    def __read_descriptors(self) -> bool:
+        """Checks the header, table and column descriptor records.
+
+        Returns
+        -------
+        bool
+            False if the data records can not be checked.
+        """
+        header = self.__read_record(b"H", "Header")
+        if header is None:
+            return False
+        if len(header) < sum(HEADER_RECORD_TYPE.values()):
+            self.__add_problem(0, f"Header record of {len(header)} bytes")
+            return False
+
+        offset = self.__base + self.__pos
+        table = self.__read_record(b"T", "Table")
+        if table is None:
+            return False
+        count = _split(TABLE_RECORD_TYPE, table)["IXFTCCNT"]
+        if not count.isdigit():
+            self.__add_problem(offset, f"Invalid number of columns {count!r}")
+            return False
+
+        columns = []
+        for _ in range(int(count)):
+            offset = self.__base + self.__pos
+            record = self.__read_record(b"C", "Column descriptor")
+            if record is None:
+                return False
+            c = _split(COL_DESCRIPTOR_RECORD_TYPE, record)
+            name = str(c["IXFCNAME"], "utf-8", "replace").strip()
+            col_type = c["IXFCTYPE"]
+            if not col_type.isdigit() or int(col_type) not in collectors:
+                problem = f"Column {name}: unknown data type {col_type!r}"
+            elif not (c["IXFCDRID"].isdigit() and c["IXFCPOSN"].isdigit()) \
+                    or int(c["IXFCDRID"]) < 1 or int(c["IXFCPOSN"]) < 1:
+                problem = f"Column {name}: invalid record id " \
+                          f"{c['IXFCDRID']!r} or position {c['IXFCPOSN']!r}"
+            elif int(col_type) in LENGTH_PREFIXES \
+                    and not c["IXFCLENG"].isdigit():
+                problem = f"Column {name}: invalid length {c['IXFCLENG']!r}"
+            else:
+                columns.append((name, c))
+                continue
+            if self.__add_problem(offset, problem):
+                return False
+
+        self.__set_layout(columns)
+        return True
+
+    def __set_layout(self, columns: List[tuple]):
+        """Prepares the checks of the data records of each record id."""
+        layout = {}
+        for name, c in columns:
+            drid = int(c["IXFCDRID"])
+            pos = int(c["IXFCPOSN"]) - 1
+            nullable = c["IXFCNULL"] == b"Y"
+            col_type = int(c["IXFCTYPE"])
+            end, nullables, varying = layout.setdefault(drid, [0, [], []])
+            if col_type in LENGTH_PREFIXES:
+                prefix = LENGTH_PREFIXES[col_type]
+                varying.append((
+                    pos, nullable, _UNPACK_LENGTH[prefix], prefix,
+                    int(c["IXFCLENG"]), 2 if col_type == 464 else 1, name
+                ))
+                # A null has no length
+                size = 0 if nullable else prefix
+            else:
+                if nullable:
+                    nullables.append((pos, name))
+                size = column_length(c)
+            layout[drid][0] = max(end, pos + 2 * nullable + size)
+        self.__layout = {k: tuple(v) for k, v in layout.items()}
+        self.__drids = sorted(layout)
+
+    def __resync(self) -> bool:
+        """Moves to the start of the next row or application record.
+
+        Returns
+        -------
+        bool
+            False at the end of the file.
+        """
+        first = self.__drids[0] if self.__drids else None
+        search = self.__pos + 1
+        while True:
+            buffer = self.__buffer
+            match = _RECORD_START.search(buffer, search)
+            if match is None:
+                # A record start can straddle two reads
+                keep = max(self.__pos, search, len(buffer) - 6)
+                self.__pos = keep
+                available = len(buffer) - keep
+                if not self.__fill(available + 1):
+                    self.__pos = len(self.__buffer)
+                    return False
+                search = self.__pos
+                continue
+
+            start = match.group()
+            search = match.start() + 1
+            if start[6:7] not in b"DA":
+                continue
+
+            self.__pos = match.start()
+            size = 6 + int(start[:6])
+            self.__fill(size + 7)
+            buffer, pos = self.__buffer, self.__pos
+            search = pos + 1
+            if start[6:7] == b"D" and (
+                    size < 14 or not buffer[pos + 7:pos + 10].isdigit()
+                    or int(buffer[pos + 7:pos + 10]) != first
+            ):
+                continue
+            following = buffer[pos + size:pos + size + 7]
+            if len(buffer) - pos == size or _is_record_start(following):
+                return True
+
+    def __frame_record(self) -> Optional[int]:
+        """Frames the record at the current position, the damaged record
+        starts are reported and skipped up to the next row.
+
+        Returns
+        -------
+        int
+            Size of the record, None at the end of the file or once the
+            validation stops.
+        """
+        while self.__fill(7):
+            buffer, pos = self.__buffer, self.__pos
+            offset = self.__base + pos
+            if buffer[pos:pos + 6].isdigit() \
+                    and buffer[pos + 6:pos + 7].isupper():
+                size = 6 + int(buffer[pos:pos + 6])
+                if not self.__fill(size):
+                    self.__add_problem(
+                        offset, f"Truncated record: {size} bytes expected, "
+                                f"{len(self.__buffer) - self.__pos} found"
+                    )
+                    return None
+                self.__previous = (offset, size - 6)
+                return size
+
+            problem = f"Invalid record start {buffer[pos:pos + 7]!r}"
+            if self.__previous is not None:
+                # Either this record or the length of the previous one is
+                # damaged
+                problem += " after a record of length {1} at offset " \
+                           "{0}".format(*self.__previous)
+            if self.__add_problem(offset, problem) or not self.__resync():
+                return None
+            self.__index = 0
+            self.__previous = None
+
+        self.__check_end()
+        return None
+
+    def __check_end(self):
+        """Checks the file ends with a complete row."""
+        remaining = len(self.__buffer) - self.__pos
+        if remaining:
+            self.__add_problem(
+                self.__base + self.__pos,
+                f"Truncated record at the end of the file: {remaining} bytes"
+            )
+        elif self.__index:
+            self.__add_problem(
+                self.__base + self.__pos,
+                "Incomplete row at the end of the file"
+            )
+
+    def __check_order(self, offset: int, drid: int) -> bool:
+        """Checks the data records of a row follow their record ids.
+
+        Returns
+        -------
+        bool
+            False once the validation stops.
+        """
+        drids = self.__drids
+        if drid != drids[self.__index]:
+            if self.__add_problem(
+                    offset, f"Data record {drid} found, data record "
+                            f"{drids[self.__index]} expected"
+            ):
+                return False
+            self.__index = drids.index(drid)
+
+        self.__index += 1
+        if self.__index == len(drids):
+            self.__index = 0
+            self.rows += 1
+        return True
+
+    def __check_indicators(
+        self,
+        columns: int,
+        nullables: List[tuple]
+    ) -> bool:
+        """Checks the null indicators of the fixed-size columns of a data
+        record whose columns start at `columns` in the buffer.
+
+        Returns
+        -------
+        bool
+            False once the validation stops.
+        """
+        buffer = self.__buffer
+        for p, name in nullables:
+            indicator = buffer[columns + p:columns + p + 2]
+            if indicator != _NULL and indicator != _NOT_NULL:
+                if self.__add_problem(
+                        self.__base + columns + p,
+                        f"Column {name}: invalid null indicator "
+                        f"{indicator!r}"
+                ):
+                    return False
+        return True
+
+    def __check_varying(
+        self,
+        columns: int,
+        end: int,
+        varying: List[tuple]
+    ) -> bool:
+        """Checks the null indicators and the lengths of the varying columns
+        of a data record whose columns start at `columns` and which ends at
+        `end` in the buffer.
+
+        Returns
+        -------
+        bool
+            False once the validation stops.
+        """
+        buffer, base = self.__buffer, self.__base
+        for p, nullable, unpack, prefix, maximum, unit, name in varying:
+            p += columns
+            if nullable:
+                indicator = buffer[p:p + 2]
+                if indicator == _NULL:
+                    # A null ends with its indicator
+                    continue
+                p += 2
+                if indicator != _NOT_NULL:
+                    problem = f"Column {name}: invalid null indicator " \
+                              f"{indicator!r}"
+                    if self.__add_problem(base + p - 2, problem):
+                        return False
+                    continue
+            n = unpack(buffer, p)[0] if p + prefix <= end else None
+            if n is None:
+                problem = f"Column {name}: its data record ends before its " \
+                          f"length"
+            elif not 0 <= n <= maximum:
+                problem = f"Column {name}: length {n} exceeds the maximum " \
+                          f"length {maximum}"
+            elif p + prefix + n * unit > end:
+                problem = f"Column {name}: length {n} exceeds its data record"
+            else:
+                continue
+            if self.__add_problem(base + p, problem):
+                return False
+        return True
+
+    def __check_data_record(self, start: int, size: int) -> bool:
+        """Checks the data record of `size` bytes at `start` in the buffer.
+
+        Returns
+        -------
+        bool
+            False once the validation stops.
+        """
+        buffer = self.__buffer
+        offset = self.__base + start
+        drid = buffer[start + 7:start + 10]
+        checks = self.__layout.get(int(drid)) \
+            if size >= 14 and drid.isdigit() else None
+        if checks is None:
+            return not self.__add_problem(
+                offset, f"Invalid data record id {drid!r}"
+            )
+        drid = int(drid)
+        if not self.__check_order(offset, drid):
+            return False
+
+        # Columns, up to the null indicators or the lengths of the
+        # varying columns
+        fixed, nullables, varying = checks
+        if fixed > size - 14:
+            return not self.__add_problem(
+                offset, f"Data record {drid} of {size - 14} bytes, its "
+                        f"columns need {fixed} bytes"
+            )
+        return self.__check_indicators(start + 14, nullables) \
+            and self.__check_varying(start + 14, start + size, varying)
+
+    def __read_data_records(self):
+        """Checks the data records up to the end of the file."""
+        self.__index = 0
+        self.__previous = None
+        while True:
+            size = self.__frame_record()
+            if size is None:
+                return
+            start = self.__pos
+            self.__pos += size
+            self.records += 1
+            # Application records and records of unknown types are skipped
+            # by the parser
+            if self.__buffer[start + 6:start + 7] == b"D" \
+                    and not self.__check_data_record(start, size):
+                return
+
+    def validate(self) -> Dict[str, Any]:
+        """Validates the structure of the ixf file.
+
+        Returns
+        -------
+        Dict[str, Any]
+            `valid`, `complete` (False if the validation stopped at
+            `max_problems`), `records`, `rows`, `bytes_read` and the
+            `problems` found (`offset` and `problem`).
+        """
+        if self.__read_descriptors():
+            self.__read_data_records()
+        else:
+            self.complete = False
+        return self.as_dict()
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Result of the validation."""
+        return {
+            "valid": not self.problems,
+            "complete": self.complete,
+            "records": self.records,
+            "rows": self.rows,
+            "bytes_read": self.__base + self.__pos,
+            "problems": self.problems,
+        }
+
+
+__all__ = ["IXFValidator", "LENGTH_PREFIXES"]
@@ -0,0 +1,722 @@
+# coding=utf-8
+"""Writers of pyarrow record batches into the supported output formats."""
+import json
+from abc import ABC, abstractmethod
+from contextlib import ExitStack
+from db2ixf.compressors import compressed_sink
+from db2ixf.encoders import JSONBatchSerializer
+from db2ixf.helpers import (
+    get_binary_sink, stringify_binary_columns, stringify_time_columns,
+)
+from db2ixf.logger import logger
+from db2ixf.packers import (
+    DATA_RECORD_SIZE, get_ixf_columns, make_column_record,
+    make_header_record, make_table_record, pack_record_batch,
+)
+from os import PathLike
+from pathlib import Path
+from pyarrow import RecordBatch, Schema, Table
+from pyarrow.ipc import IpcWriteOptions, new_file
+from typing import (
+    Any, BinaryIO, Callable, Dict, List, Literal, Optional, TextIO, Tuple,
+    Union,
+)
+
+COMPRESSED_SUFFIXES = {".gz": "gzip", ".bz2": "bz2", ".zst": "zstd"}
+"""Suffixes kept with the format suffix when numbering split outputs."""
+
+OUTPUT_FORMATS = {
+    ".json": "json",
+    ".jsonl": "jsonline",
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".arrow": "arrow_ipc",
+    ".feather": "arrow_ipc",
+    ".orc": "orc",
+    ".ixf": "ixf",
+}
+"""Output format of each file extension."""
+
+
+def check_output(
+    output: Union[str, Path, PathLike, TextIO, BinaryIO],
+    text: bool = True,
+    compression: Optional[str] = None
+) -> Union[str, Path, PathLike, TextIO, BinaryIO]:
+    """Checks that the output can receive the converted data.
+
+    Parameters
+    ----------
+    output : Union[str, Path, PathLike, TextIO, BinaryIO]
+        Output file.
+    text : bool
+        If True, file-like objects opened in text mode (utf-8) are accepted
+        too, otherwise only the binary mode is accepted.
+    compression : str
+        Compression of the output, it needs the binary mode.
+
+    Returns
+    -------
+    Union[str, Path, PathLike, TextIO, BinaryIO]
+        The output.
+
+    Raises
+    ------
+    TypeError
+        When the file-like object has no `mode` attribute.
+    ValueError
+        When the file-like object is not opened in the right mode.
+    """
+    if isinstance(output, (str, Path, PathLike)):
+        return output
+
+    if not hasattr(output, "mode"):
+        raise TypeError("File-like object should have `mode` attribute")
+
+    if not text and output.mode != "wb":
+        msg = "File-like object should be opened in write and binary mode"
+        raise ValueError(msg)
+
+    if output.mode not in ["w", "wt", "wb"]:
+        msg = "File-like object should be opened in write mode"
+        raise ValueError(msg)
+
+    # Force utf-8 encoding for text outputs
+    # (Maybe we only need to log without forcing)
+    if "b" not in output.mode and output.encoding != "utf-8":
+        raise ValueError("File-like object should be `utf-8` encoded")
+
+    if compression is not None and "b" not in output.mode:
+        msg = "Compressed output needs a file-like object opened in " \
+              "write and binary mode"
+        raise ValueError(msg)
+
+    return output
+
+
+def check_split_output(
+    output: Union[str, Path, PathLike, TextIO, BinaryIO],
+    max_rows_per_file: Optional[int] = None,
+    max_bytes_per_file: Optional[int] = None
+):
+    """Checks that the output can be split into several files.
+
+    Raises
+    ------
+    ValueError
+        When the output is not a path or the limits are not positive.
+    """
+    if max_rows_per_file is None and max_bytes_per_file is None:
+        return
+
+    if not isinstance(output, (str, Path, PathLike)):
+        raise ValueError("Splitting the output needs a path, not a file-like")
+
+    if max_rows_per_file is not None and max_rows_per_file <= 0:
+        raise ValueError("`max_rows_per_file` should be > 0")
+
+    if max_bytes_per_file is not None and max_bytes_per_file <= 0:
+        raise ValueError("`max_bytes_per_file` should be > 0")
+
+
+class BatchWriter(ABC):
+    """Writes record batches into one output.
+
+    It opens the output (when it is a path), wraps it for compression and
+    closes everything at the end. Subclasses implement `write_batch` and
+    `finish`. When aborted, an output opened from a path is removed.
+
+    Attributes
+    ----------
+    output : Union[str, Path, PathLike, TextIO, BinaryIO]
+        Output file.
+    sink : BinaryIO
+        Binary file-like object the subclasses write into.
+    rows : int
+        Number of written rows.
+    """
+
+    def __init__(
+        self,
+        output: Union[str, Path, PathLike, TextIO, BinaryIO],
+        compression: Optional[Literal["gzip", "bz2", "zstd"]] = None,
+        compression_level: Optional[int] = None
+    ):
+        """Init the writer and open the output.
+
+        Parameters
+        ----------
+        output : Union[str, Path, PathLike, TextIO, BinaryIO]
+            Output file.
+        compression : Optional[Literal["gzip", "bz2", "zstd"]]
+            Streaming compression of the output.
+        compression_level : int
+            Compression level.
+        """
+        self._stack = ExitStack()
+        self._path: Optional[Path] = None
+        if isinstance(output, (str, Path, PathLike)):
+            self._path = Path(output)
+            output = open(output, mode="wb")
+        self.output = self._stack.enter_context(output)
+        try:
+            self.sink: BinaryIO = self._stack.enter_context(
+                compressed_sink(
+                    get_binary_sink(output), compression, compression_level
+                )
+            )
+        except BaseException:
+            self._stack.close()
+            raise
+        self.rows: int = 0
+
+    @property
+    def bytes_written(self) -> int:
+        """Number of bytes written in the output (0 if it is unknown)."""
+        try:
+            return self.output.tell()
+        except (AttributeError, OSError, ValueError):
+            return 0
+
+    @abstractmethod
+    def write_batch(self, batch: Union[RecordBatch, Table]):
+        """Writes a record batch (or a table) in the format of the output."""
+
+    @abstractmethod
+    def finish(self):
+        """Writes what the format needs at the end of the output."""
+
+    def write(self, batch: Union[RecordBatch, Table]):
+        """Writes a record batch (or a table) into the output."""
+        self.write_batch(batch)
+        self.rows += batch.num_rows
+
+    def close(self):
+        """Finishes the output then closes it."""
+        try:
+            self.finish()
+        except BaseException as err:
+            self.abort(err)
+            raise
+        self._stack.close()
+
+    def abort(self, error: Optional[BaseException] = None):
+        """Closes the output after a failure."""
+        # Release the format writer (if any), the output is incomplete anyway
+        writer = getattr(self, "writer", None)
+        if writer is not None:
+            try:
+                writer.close()
+            except Exception:  # noqa
+                pass
+
+        if error is None:
+            error = RuntimeError("Writing aborted")
+        self._stack.__exit__(type(error), error, error.__traceback__)
+
+        # Do not leave a partial output behind
+        if self._path is not None:
+            self._path.unlink(missing_ok=True)
+            logger.debug(f"Partial output {self._path} removed")
+
+
+class CSVBatchWriter(BatchWriter):
+    """Writes record batches in csv format using the pyarrow csv writer."""
+
+    def __init__(
+        self,
+        output: Union[str, Path, PathLike, TextIO, BinaryIO],
+        schema: Schema,
+        sep: str = "|",
+        quoting: Literal["needed", "all_valid", "none"] = "needed",
+        null_string: str = "",
+        header: bool = True,
+        binary_format: Literal["base64", "hex"] = "base64",
+        compression: Optional[Literal["gzip", "bz2", "zstd"]] = None,
+        compression_level: Optional[int] = None
+    ):
+        # The format modules of pyarrow are imported when they are used
+        from pyarrow.csv import CSVWriter, WriteOptions as CSVWriteOptions
+
+        super().__init__(output, compression, compression_level)
+        self.binary_format = binary_format
+        csv_schema = stringify_binary_columns(
+            RecordBatch.from_pylist([], schema=schema)
+        ).schema
+        options = CSVWriteOptions(
+            include_header=header,
+            delimiter=sep,
+            null_string=null_string,
+            quoting_style=quoting,
+            quoting_header="all_valid" if quoting == "all_valid" else "none",
+        )
+        self.writer = CSVWriter(self.sink, csv_schema, write_options=options)
+
+    def write_batch(self, batch: RecordBatch):
+        self.writer.write_batch(
+            stringify_binary_columns(batch, self.binary_format)
+        )
+
+    def finish(self):
+        self.writer.close()
+
+
+class JSONLineBatchWriter(BatchWriter):
+    """Writes record batches in json line format (one json object a line)."""
+
+    def __init__(
+        self,
+        output: Union[str, Path, PathLike, TextIO, BinaryIO],
+        serializer: Optional[JSONBatchSerializer] = None,
+        compression: Optional[Literal["gzip", "bz2", "zstd"]] = None,
+        compression_level: Optional[int] = None
+    ):
+        super().__init__(output, compression, compression_level)
+        self.serializer = serializer or JSONBatchSerializer()
+
+    def write_batch(self, batch: RecordBatch):
+        rows = self.serializer.serialize(batch)
+        if rows:
+            rows.append(b"")
+            self.sink.write(b"\n".join(rows))
+
+    def finish(self):
+        self.sink.flush()
+
+
+class JSONBatchWriter(BatchWriter):
+    """Writes record batches in json format (one array of json objects)."""
+
+    def __init__(
+        self,
+        output: Union[str, Path, PathLike, TextIO, BinaryIO],
+        serializer: Optional[JSONBatchSerializer] = None,
+        compression: Optional[Literal["gzip", "bz2", "zstd"]] = None,
+        compression_level: Optional[int] = None
+    ):
+        super().__init__(output, compression, compression_level)
+        self.serializer = serializer or JSONBatchSerializer()
+        self.first_row = True
+        self.sink.write(b"[")
+
+    def write_batch(self, batch: RecordBatch):
+        rows = self.serializer.serialize(batch)
+        if not rows:
+            return
+        if not self.first_row:
+            self.sink.write(b",")
+        self.sink.write(b",".join(rows))
+        self.first_row = False
+
+    def finish(self):
+        self.sink.write(b"]")
+        self.sink.flush()
+
+
+class ParquetBatchWriter(BatchWriter):
+    """Writes tables (or record batches) in parquet format.
+
+    Each written table becomes exactly one row group.
+    """
+
+    def __init__(
+        self,
+        output: Union[str, Path, PathLike, BinaryIO],
+        schema: Schema,
+        **kwargs
+    ):
+        """Init the parquet writer.
+
+        Parameters
+        ----------
+        output : Union[str, Path, PathLike, BinaryIO]
+            Output file.
+        schema : Schema
+            Pyarrow schema.
+        **kwargs : Optional[dict]
+            Arguments of `pyarrow.parquet.ParquetWriter`.
+        """
+        from pyarrow.parquet import ParquetWriter
+
+        super().__init__(output)
+        self.writer = ParquetWriter(
+            where=self.sink,
+            schema=schema,
+            flavor="spark",
+            **kwargs
+        )
+
+    def write_batch(self, batch: Union[RecordBatch, Table]):
+        if isinstance(batch, RecordBatch):
+            batch = Table.from_batches([batch])
+        self.writer.write_table(batch, row_group_size=batch.num_rows)
+
+    def finish(self):
+        self.writer.close()
+
+
+class ArrowIPCBatchWriter(BatchWriter):
+    """Writes record batches in Arrow IPC file format (Feather v2).
+
+    The file can be memory-mapped by the reader without any decoding.
+    """
+
+    def __init__(
+        self,
+        output: Union[str, Path, PathLike, BinaryIO],
+        schema: Schema,
+        compression: Optional[Literal["lz4", "zstd"]] = None
+    ):
+        """Init the Arrow IPC writer.
+
+        Parameters
+        ----------
+        output : Union[str, Path, PathLike, BinaryIO]
+            Output file.
+        schema : Schema
+            Pyarrow schema.
+        compression : Optional[Literal["lz4", "zstd"]]
+            Compression of the record batch buffers, None means uncompressed.
+        """
+        if compression not in [None, "lz4", "zstd"]:
+            raise ValueError("Either `lz4`, `zstd` or None for `compression`")
+
+        super().__init__(output)
+        options = IpcWriteOptions(compression=compression)
+        self.writer = new_file(self.sink, schema, options=options)
+
+    def write_batch(self, batch: Union[RecordBatch, Table]):
+        self.writer.write(batch)
+
+    def finish(self):
+        self.writer.close()
+
+
+class ORCBatchWriter(BatchWriter):
+    """Writes record batches in ORC format.
+
+    ORC does not support the time datatype, time columns are written as
+    strings (see `stringify_time_columns`).
+    """
+
+    def __init__(
+        self,
+        output: Union[str, Path, PathLike, BinaryIO],
+        schema: Schema,
+        **kwargs
+    ):
+        """Init the ORC writer.
+
+        Parameters
+        ----------
+        output : Union[str, Path, PathLike, BinaryIO]
+            Output file.
+        schema : Schema
+            Pyarrow schema.
+        **kwargs : Optional[dict]
+            Arguments of `pyarrow.orc.ORCWriter`.
+        """
+        from pyarrow.orc import ORCWriter
+
+        super().__init__(output)
+        self.schema = schema
+        self.writer = ORCWriter(self.sink, **kwargs)
+
+    def write_batch(self, batch: RecordBatch):
+        self.writer.write(Table.from_batches([stringify_time_columns(batch)]))
+
+    def finish(self):
+        # ORC writes nothing without data, keep a readable empty file
+        if self.rows == 0:
+            self.write_batch(RecordBatch.from_pylist([], schema=self.schema))
+        self.writer.close()
+
+
+class IXFBatchWriter(BatchWriter):
+    """Writes record batches in PC/IXF format.
+
+    The header, table and column descriptor records are written when the
+    writer is created, then each batch is packed column-wise into data
+    records (see `db2ixf.packers`). The file can be loaded into DB2 or read
+    back by the parser.
+    """
+
+    def __init__(
+        self,
+        output: Union[str, Path, PathLike, BinaryIO],
+        schema: Schema,
+        table_name: Optional[str] = None,
+        code_page: int = 1208,
+        columns: Optional[Dict[str, Dict[str, Any]]] = None,
+        record_size: int = DATA_RECORD_SIZE,
+        compression: Optional[Literal["gzip", "bz2", "zstd"]] = None,
+        compression_level: Optional[int] = None
+    ):
+        """Init the IXF writer.
+
+        Parameters
+        ----------
+        output : Union[str, Path, PathLike, BinaryIO]
+            Output file.
+        schema : Schema
+            Pyarrow schema.
+        table_name : str
+            Name of the table, defaults to the name of the output file.
+        code_page : int
+            Single-byte code page of the character columns.
+        columns : Dict[str, Dict[str, Any]]
+            IXF data type, length or code page per column name, see
+            `db2ixf.packers.get_ixf_columns`.
+        record_size : int
+            Size of the columns of a data record beyond which the next columns
+            go to a new data record.
+        compression : Optional[Literal["gzip", "bz2", "zstd"]]
+            Streaming compression of the output.
+        compression_level : int
+            Compression level.
+
+        Raises
+        ------
+        ValueError
+            When a column has no IXF equivalent.
+        """
+        # Checked before opening the output
+        self.columns = get_ixf_columns(schema, columns, code_page, record_size)
+        if table_name is None:
+            table_name = Path(output).name.split(".")[0] \
+                if isinstance(output, (str, Path, PathLike)) else ""
+
+        super().__init__(output, compression, compression_level)
+        self.sink.write(
+            make_header_record(code_page, len(self.columns) + 2)
+        )
+        self.sink.write(make_table_record(table_name, self.columns))
+        for column in self.columns:
+            self.sink.write(make_column_record(column))
+
+    def write_batch(self, batch: Union[RecordBatch, Table]):
+        if isinstance(batch, Table):
+            for b in batch.to_batches():
+                self.sink.write(pack_record_batch(b, self.columns))
+        else:
+            self.sink.write(pack_record_batch(batch, self.columns))
+
+    def finish(self):
+        self.sink.flush()
+
+
+_COMPRESSION_OPTIONS = {"compression", "compression_level"}
+
+OUTPUT_WRITERS: Dict[str, Tuple[type, bool, set, Dict[str, Any]]] = {
+    "json": (
+        JSONBatchWriter, True,
+        {"backend", "binary_format"} | _COMPRESSION_OPTIONS,
+        {"backend": "auto", "binary_format": "base64"}
+    ),
+    "jsonline": (
+        JSONLineBatchWriter, True,
+        {"backend", "binary_format"} | _COMPRESSION_OPTIONS,
+        {"backend": "auto", "binary_format": "base64"}
+    ),
+    "csv": (
+        CSVBatchWriter, True,
+        {"sep", "quoting", "null_string", "header", "binary_format"}
+        | _COMPRESSION_OPTIONS,
+        {}
+    ),
+    "parquet": (
+        ParquetBatchWriter, False,
+        {
+            "parquet_version", "row_group_size", "row_group_bytes",
+            "use_dictionary", "write_statistics", "data_page_size",
+        } | _COMPRESSION_OPTIONS,
+        {"parquet_version": "2.6", "compression": "snappy"}
+    ),
+    "arrow_ipc": (ArrowIPCBatchWriter, False, {"compression"}, {}),
+    "orc": (
+        ORCBatchWriter, False, {"compression", "stripe_size"},
+        {"compression": "snappy"}
+    ),
+    "ixf": (
+        IXFBatchWriter, False,
+        {"table_name", "code_page", "columns", "record_size"}
+        | _COMPRESSION_OPTIONS,
+        {}
+    ),
+}
+"""Writer of each output format: writer class, whether text file-like objects
+are accepted, accepted options and default options."""
+
+SPLIT_OPTIONS = {"max_rows_per_file", "max_bytes_per_file"}
+"""Options splitting an output into several files (see `RollingWriter`)."""
+
+
+def split_suffix(path: Union[str, Path, PathLike]) -> Tuple[Path, str]:
+    """Splits a path into its stem path and its suffix.
+
+    The compression suffix is kept with the format suffix, e.g.
+    `data.csv.gz` gives `data` and `.csv.gz`.
+    """
+    path = Path(path)
+    suffixes = path.suffixes
+    if len(suffixes) >= 2 and suffixes[-1] in COMPRESSED_SUFFIXES:
+        suffix = "".join(suffixes[-2:])
+    else:
+        suffix = path.suffix
+    return path.with_name(path.name[:len(path.name) - len(suffix)]), suffix
+
+
+def infer_output_format(
+    path: Union[str, Path, PathLike]
+) -> Tuple[str, Optional[str]]:
+    """Infers the output format and compression from the file extension.
+
+    Parameters
+    ----------
+    path : Union[str, Path, PathLike]
+        Path of the output, e.g. `data.csv.gz`.
+
+    Returns
+    -------
+    Tuple[str, Optional[str]]
+        Output format (e.g. `csv`) and compression (e.g. `gzip`) or None.
+
+    Raises
+    ------
+    ValueError
+        When the extension is unknown.
+    """
+    suffixes = Path(path).suffixes or [""]
+    compression = COMPRESSED_SUFFIXES.get(suffixes[-1])
+    extension = suffixes[-2] if compression and len(suffixes) > 1 \
+        else suffixes[-1]
+    if extension not in OUTPUT_FORMATS:
+        msg = f"Unknown output format of `{path}`, expecting one of " \
+              f"{list(OUTPUT_FORMATS)} extensions"
+        raise ValueError(msg)
+    return OUTPUT_FORMATS[extension], compression
+
+
+class RollingWriter:
+    """Writes record batches into numbered files (`name-00001.ext`, ...).
+
+    It rolls to a new file once the current one reaches `max_rows` rows or
+    `max_bytes` bytes, batches are sliced so a file never exceeds `max_rows`.
+    When closed, it writes a manifest (`name.manifest.json`) listing the
+    files with their number of rows and size.
+
+    Attributes
+    ----------
+    path : Union[str, Path, PathLike]
+        Path of the output, it gives the name and the extension of the files.
+    open_writer : Callable[[Path], BatchWriter]
+        Function opening a writer for a given file path.
+    max_rows : int
+        Maximum number of rows of a file.
+    max_bytes : int
+        Target size in bytes of a file (it can be exceeded by one batch).
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path, PathLike],
+        open_writer: Callable[[Path], BatchWriter],
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None
+    ):
+        check_split_output(path, max_rows, max_bytes)
+        self.stem, self.suffix = split_suffix(path)
+        self.open_writer = open_writer
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.writer: Optional[BatchWriter] = None
+        self.files: List[Dict[str, Any]] = []
+        """Files already written with their number of rows and size."""
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.stem.with_name(f"{self.stem.name}.manifest.json")
+
+    def __next_path(self) -> Path:
+        index = len(self.files) + 1
+        return self.stem.with_name(
+            f"{self.stem.name}-{index:05d}{self.suffix}"
+        )
+
+    def __close_file(self):
+        if self.writer is None:
+            return
+        path = self.__next_path()
+        self.writer.close()
+        self.files.append(
+            {
+                "path": path.name,
+                "rows": self.writer.rows,
+                "bytes": path.stat().st_size,
+            }
+        )
+        logger.debug(f"Finished writing {path} ({self.writer.rows} rows)")
+        self.writer = None
+
+    def write(self, batch: Union[RecordBatch, Table]):
+        """Writes a batch, rolling to new files when the limits are hit."""
+        while batch.num_rows > 0:
+            if self.writer is None:
+                path = self.__next_path()
+                logger.debug(f"Start writing {path}")
+                self.writer = self.open_writer(path)
+
+            take = batch.num_rows
+            if self.max_rows is not None:
+                take = min(take, self.max_rows - self.writer.rows)
+
+            self.writer.write(batch.slice(0, take))
+            batch = batch.slice(take)
+
+            full_rows = self.max_rows is not None \
+                and self.writer.rows >= self.max_rows
+            full_bytes = self.max_bytes is not None \
+                and self.writer.bytes_written >= self.max_bytes
+            if full_rows or full_bytes:
+                self.__close_file()
+
+    def close(self) -> Dict[str, Any]:
+        """Closes the current file and writes the manifest.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Manifest: files with their number of rows and total of rows.
+        """
+        # Always produce at least one file (e.g. header only csv)
+        if self.writer is None and not self.files:
+            self.writer = self.open_writer(self.__next_path())
+        self.__close_file()
+
+        manifest = {
+            "files": self.files,
+            "rows": sum(f["rows"] for f in self.files),
+        }
+        with open(self.manifest_path, mode="w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        logger.debug(f"Manifest written in {self.manifest_path}")
+        return manifest
+
+    def abort(self, error: Optional[BaseException] = None):
+        """Closes the current file after a failure and removes the files
+        already written (the output is partial)."""
+        if self.writer is not None:
+            self.writer.abort(error)
+            self.writer = None
+        for f in self.files:
+            self.stem.with_name(f["path"]).unlink(missing_ok=True)
+        self.files = []
+
+
+__all__ = [
+    "ArrowIPCBatchWriter", "BatchWriter", "CSVBatchWriter", "IXFBatchWriter",
+    "JSONBatchWriter", "JSONLineBatchWriter", "ORCBatchWriter",
+    "ParquetBatchWriter", "OUTPUT_FORMATS", "OUTPUT_WRITERS", "RollingWriter",
+    "SPLIT_OPTIONS", "check_output", "check_split_output",
+    "infer_output_format",
+]
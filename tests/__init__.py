@@ -1,5 +1,7 @@
 # coding: utf-8
 """Tests package"""
+from db2ixf.packers import DATA_RECORD_SIZE
+from db2ixf.writers import IXFBatchWriter
 from pathlib import Path
 
 # Root directory
@@ -11,3 +13,31 @@ TARGET_DIR = ROOT_DIR / "target"
 
 # Resources directory
 RESOURCES_DIR = TEST_DIR / "resources"
+
+
+def write_ixf(ixf_file, table, record_size=DATA_RECORD_SIZE, **columns):
+    """
+    Writes a pyarrow table in an ixf file, to be damaged by a test.
+
+    Parameters
+    ----------
+    ixf_file : pathlib.Path
+        Path of the ixf file.
+    table : pyarrow.Table
+        Rows of the ixf file.
+    record_size : int
+        Maximum size of a data record.
+    **columns
+        Options of the columns by name (see `IXFBatchWriter`).
+
+    Returns
+    -------
+    bytearray
+        Content of the ixf file.
+    """
+    writer = IXFBatchWriter(
+        ixf_file, table.schema, columns=columns, record_size=record_size
+    )
+    writer.write(table)
+    writer.close()
+    return bytearray(ixf_file.read_bytes())
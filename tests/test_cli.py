@@ -1,5 +1,7 @@
 # coding=utf-8
 """Test db2ixf CLI (cli.py)."""
+import gzip
+import json
 import pytest
 import subprocess
 from tests import RESOURCES_DIR
@@ -89,6 +91,429 @@ def test_cli_conversion_to_csv(test_output_dir, separator, size):
     assert output_file.exists()
     assert output_file.is_file()
 
+
+def test_cli_conversion_to_parquet_with_queue_depth(test_output_dir):
+    """Test CLI db2ixf conversion to parquet using the writer thread."""
+    # Input file in IXF
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+
+    # Output in parquet
+    output_file = test_output_dir / "result.parquet"
+
+    # Run the db2ixf CLI command
+    command = [
+        "db2ixf",
+        "parquet",
+        "--queue-depth",
+        "2",
+        str(ixf_file),
+        str(output_file)
+    ]
+    result = subprocess.run(command, capture_output=True, text=True)
+
+    # Assert the expected output or behavior
+    assert result.returncode == 0  # Successful execution
+    assert output_file.exists()
+    assert output_file.is_file()
+
+
+def test_cli_conversion_to_parquet_with_options(test_output_dir):
+    """Test CLI db2ixf conversion to parquet with writer options."""
+    # Input file in IXF
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+
+    # Output in parquet
+    output_file = test_output_dir / "result.parquet"
+
+    # Run the db2ixf CLI command
+    command = [
+        "db2ixf",
+        "parquet",
+        "--compression",
+        "zstd",
+        "--compression-level",
+        "5",
+        "--row-group-size",
+        "1000",
+        "--dictionary-column",
+        "CHAR_COL",
+        "--no-statistics",
+        str(ixf_file),
+        str(output_file)
+    ]
+    result = subprocess.run(command, capture_output=True, text=True)
+
+    # Assert the expected output or behavior
+    assert result.returncode == 0  # Successful execution
+    assert output_file.exists()
+    assert output_file.is_file()
+
+
+def test_cli_conversion_to_parquet_dataset(test_output_dir):
+    """Test CLI db2ixf conversion to a partitioned parquet dataset."""
+    # Input file in IXF
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+
+    # Output in parquet dataset
+    output_dir = test_output_dir / "dataset"
+
+    # Run the db2ixf CLI command
+    command = [
+        "db2ixf",
+        "parquet-dataset",
+        "--partition-by",
+        "BOOLEAN_COL",
+        "--max-rows-per-file",
+        "1",
+        "--existing-data-behavior",
+        "delete_matching",
+        str(ixf_file),
+        str(output_dir)
+    ]
+    result = subprocess.run(command, capture_output=True, text=True)
+
+    # Assert the expected output or behavior
+    assert result.returncode == 0  # Successful execution
+    assert output_dir.exists()
+    assert output_dir.is_dir()
+
+
+def test_cli_conversion_to_csv_with_options(test_output_dir):
+    """Test CLI db2ixf conversion to csv with formatting options."""
+    # Input file in IXF
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+
+    # Output in csv
+    output_file = test_output_dir / "result.csv"
+
+    # Run the db2ixf CLI command
+    command = [
+        "db2ixf",
+        "csv",
+        "--quoting",
+        "all_valid",
+        "--null",
+        "NULL",
+        "--no-header",
+        "--binary-format",
+        "hex",
+        str(ixf_file),
+        str(output_file)
+    ]
+    result = subprocess.run(command, capture_output=True, text=True)
+
+    # Assert the expected output or behavior
+    assert result.returncode == 0  # Successful execution
+    assert output_file.exists()
+    assert output_file.is_file()
+
+
+def test_cli_conversion_to_jsonline_with_options(test_output_dir):
+    """Test CLI db2ixf conversion to json line with serializer options."""
+    # Input file in IXF
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+
+    # Output in json line
+    output_file = test_output_dir / "result.jsonl"
+
+    # Run the db2ixf CLI command
+    command = [
+        "db2ixf",
+        "jsonline",
+        "--backend",
+        "json",
+        "--binary-format",
+        "hex",
+        str(ixf_file),
+        str(output_file),
+    ]
+    result = subprocess.run(command, capture_output=True, text=True)
+
+    # Assert the expected output or behavior
+    assert result.returncode == 0  # Successful execution
+    assert output_file.exists()
+    assert output_file.is_file()
+
+
+def test_cli_conversion_to_compressed_csv(test_output_dir):
+    """Test CLI db2ixf conversion to gzip compressed csv."""
+    # Input file in IXF
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+
+    # Output in compressed csv
+    output_file = test_output_dir / "result.csv.gz"
+
+    # Run the db2ixf CLI command
+    command = [
+        "db2ixf",
+        "csv",
+        "--compression",
+        "gzip",
+        str(ixf_file),
+        str(output_file)
+    ]
+    result = subprocess.run(command, capture_output=True, text=True)
+
+    # Assert the expected output or behavior
+    assert result.returncode == 0  # Successful execution
+    assert output_file.exists()
+    assert output_file.read_bytes()[:2] == b"\x1f\x8b"  # gzip magic number
+
+
+def test_cli_conversion_of_compressed_input(test_output_dir):
+    """Test CLI db2ixf conversion of a gzip compressed ixf file."""
+    # Input file in compressed IXF
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+    compressed_file = test_output_dir / "sample.ixf.gz"
+    compressed_file.write_bytes(gzip.compress(ixf_file.read_bytes()))
+
+    # Output in json line
+    output_file = test_output_dir / "result.jsonl"
+
+    # Run the db2ixf CLI command
+    command = [
+        "db2ixf",
+        "jsonline",
+        str(compressed_file),
+        str(output_file),
+    ]
+    result = subprocess.run(command, capture_output=True, text=True)
+
+    # Assert the expected output or behavior
+    assert result.returncode == 0  # Successful execution
+    assert len(output_file.read_text(encoding="utf-8").splitlines()) == 2
+
+
+def test_cli_conversion_to_split_csv(test_output_dir):
+    """Test CLI db2ixf conversion to csv split by number of rows."""
+    # Input file in IXF
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+
+    # Output in csv files
+    output_file = test_output_dir / "split.csv"
+
+    # Run the db2ixf CLI command
+    command = [
+        "db2ixf",
+        "csv",
+        "--max-rows-per-file",
+        "1",
+        str(ixf_file),
+        str(output_file)
+    ]
+    result = subprocess.run(command, capture_output=True, text=True)
+
+    # Assert the expected output or behavior
+    assert result.returncode == 0  # Successful execution
+    assert (test_output_dir / "split-00001.csv").exists()
+    assert (test_output_dir / "split-00002.csv").exists()
+    assert (test_output_dir / "split.manifest.json").exists()
+
+
+@pytest.mark.parametrize("command_name, suffix", [
+    ("arrow-ipc", "arrow"),
+    ("orc", "orc"),
+])
+def test_cli_conversion_to_arrow_ipc_and_orc(
+    test_output_dir, command_name, suffix
+):
+    """Test CLI db2ixf conversion to arrow ipc and orc."""
+    # Input file in IXF
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+
+    # Output file
+    output_file = test_output_dir / f"result.{suffix}"
+
+    # Run the db2ixf CLI command
+    command = [
+        "db2ixf",
+        command_name,
+        "--compression",
+        "zstd",
+        str(ixf_file),
+        str(output_file)
+    ]
+    result = subprocess.run(command, capture_output=True, text=True)
+
+    # Assert the expected output or behavior
+    assert result.returncode == 0  # Successful execution
+    assert output_file.exists()
+
+
+def test_cli_convert_to_several_outputs(test_output_dir):
+    """Test CLI db2ixf conversion to several outputs in one pass."""
+    # Input file in IXF
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+
+    # Outputs
+    parquet_file = test_output_dir / "result.parquet"
+    csv_file = test_output_dir / "result.csv"
+
+    # Run the db2ixf CLI command
+    command = [
+        "db2ixf",
+        "convert",
+        str(ixf_file),
+        "-o",
+        str(parquet_file),
+        "-o",
+        str(csv_file),
+    ]
+    result = subprocess.run(command, capture_output=True, text=True)
+
+    # Assert the expected output or behavior
+    assert result.returncode == 0  # Successful execution
+    assert parquet_file.exists()
+    assert csv_file.exists()
+
+
+def test_cli_batch_conversion(test_output_dir):
+    """Test CLI db2ixf batch conversion of many files."""
+    # Input files in IXF
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+    list_file = test_output_dir / "files.txt"
+    list_file.write_text(f"{ixf_file}\n", encoding="utf-8")
+
+    # Output directory
+    output_dir = test_output_dir / "output"
+
+    # Run the db2ixf CLI command
+    command = [
+        "db2ixf",
+        "batch",
+        "--files-from",
+        str(list_file),
+        "--output-dir",
+        str(output_dir),
+        "--format",
+        "csv",
+        "--workers",
+        "2",
+    ]
+    result = subprocess.run(command, capture_output=True, text=True)
+
+    # Assert the expected output or behavior
+    assert result.returncode == 0  # Successful execution
+    assert (output_dir / "sample.csv").exists()
+    assert (output_dir / "report.json").exists()
+
+
+def test_cli_db2move_conversion(test_output_dir):
+    """Test CLI db2ixf conversion of a db2move export."""
+    # db2move export
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+    export_dir = test_output_dir / "export"
+    export_dir.mkdir(exist_ok=True)
+    (export_dir / "tab1.ixf").write_bytes(ixf_file.read_bytes())
+    (export_dir / "db2move.lst").write_text(
+        '!"DB2INST1"."EMPLOYEE"!tab1.ixf!tab1.msg!\n', encoding="utf-8"
+    )
+
+    # Output directory
+    output_dir = test_output_dir / "output"
+
+    # Run the db2ixf CLI command
+    command = [
+        "db2ixf",
+        "db2move",
+        str(export_dir),
+        "--output-dir",
+        str(output_dir),
+        "--format",
+        "jsonline",
+    ]
+    result = subprocess.run(command, capture_output=True, text=True)
+
+    # Assert the expected output or behavior
+    assert result.returncode == 0  # Successful execution
+    assert (output_dir / "DB2INST1" / "EMPLOYEE.jsonl").exists()
+
+
+def test_cli_conversion_from_stdin_to_stdout():
+    """Test CLI db2ixf conversion of a piped (compressed) input to stdout."""
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+    ixf_data = gzip.compress(ixf_file.read_bytes())
+
+    command = ["db2ixf", "jsonline", "-", "-"]
+    result = subprocess.run(command, input=ixf_data, capture_output=True)
+
+    assert result.returncode == 0
+    rows = result.stdout.decode("utf-8").splitlines()
+    assert len(rows) == 2
+    assert json.loads(rows[0])["ID"] == 1
+
+
+def test_cli_conversion_with_stats(test_output_dir):
+    """Test CLI db2ixf conversion printing the stats."""
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+    output_file = test_output_dir / "result.parquet"
+
+    command = [
+        "db2ixf", "parquet", str(ixf_file), str(output_file), "--stats",
+    ]
+    result = subprocess.run(command, capture_output=True, text=True)
+
+    assert result.returncode == 0
+    stats = json.loads(result.stderr)
+    assert stats["rows"] == 2
+    assert stats["stages"]["write"] > 0
+
+
+def test_cli_conversion_with_progress(test_output_dir):
+    """Test CLI db2ixf conversion showing a progress bar."""
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+    output_file = test_output_dir / "result.csv"
+
+    command = [
+        "db2ixf", "csv", str(ixf_file), str(output_file), "--progress",
+    ]
+    result = subprocess.run(command, capture_output=True, text=True)
+
+    assert result.returncode == 0
+    assert "2 rows" in result.stderr
+    assert output_file.read_text(encoding="utf-8").count("\n") == 3
+
+
+def test_cli_profile():
+    """Test CLI db2ixf profile of the columns."""
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+
+    command = ["db2ixf", "profile", str(ixf_file), "--json"]
+    result = subprocess.run(command, capture_output=True, text=True)
+
+    assert result.returncode == 0
+    rows = json.loads(result.stdout)
+    assert len(rows) == 16
+    assert all(r["calls"] == 2 for r in rows)
+
+    command = ["db2ixf", "profile", str(ixf_file)]
+    result = subprocess.run(command, capture_output=True, text=True)
+
+    assert result.returncode == 0
+    assert "Fallbacks" in result.stdout
+
+
+def test_cli_validate(test_output_dir):
+    """Test CLI db2ixf validate."""
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+
+    command = ["db2ixf", "validate", str(ixf_file), "--json"]
+    result = subprocess.run(command, capture_output=True, text=True)
+
+    assert result.returncode == 0
+    assert json.loads(result.stdout)["valid"] is True
+
+    truncated = test_output_dir / "truncated.ixf"
+    truncated.write_bytes(ixf_file.read_bytes()[:-10])
+
+    command = ["db2ixf", "validate", str(truncated)]
+    result = subprocess.run(command, capture_output=True, text=True)
+
+    assert result.returncode == 1
+    assert "Truncated record" in result.stdout
+    assert "not valid" in result.stdout
+
+
 # parquet_param_data = [
 #     ("1.0", None), ("2.4", None), ("2.6", None),
 #     ("1.0", 100), ("2.4", 100), ("2.6", 100),
@@ -1,8 +1,40 @@
 # coding=utf-8
 """Test db2ixf package"""
+import base64
+import bz2
+import gzip
+import json
+import logging
+import os
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.orc as orc
+import pyarrow.parquet as pq
 import pytest
-from db2ixf import IXFParser
-from tests import RESOURCES_DIR
+import shutil
+import subprocess
+import sys
+from datetime import date, datetime
+from db2ixf import IXFParser, convert_many
+from db2ixf.collectors import collect_timestamp
+from db2ixf.constants import APPLICATION_RECORD_TYPE
+from db2ixf.conversions import admit_task
+from db2ixf.encoders import format_json_column
+from db2ixf.exceptions import IXFParsingError
+from db2ixf.exports import convert_db2move
+from db2ixf.helpers import (
+    decode_cell, get_fallback_count, set_decode_diagnostics,
+)
+from db2ixf.metrics import DecodeDiagnostics, ProgressReporter
+from db2ixf.packers import make_record
+from db2ixf.pipelines import BackgroundWriter, FanOut
+from db2ixf.writers import IXFBatchWriter
+from decimal import Decimal
+from deltalake import DeltaTable
+from itertools import islice
+from pathlib import Path
+from tests import RESOURCES_DIR, write_ixf
+from threading import Thread
 
 
 def test_pkg_parser(test_output_dir):
@@ -61,6 +93,988 @@ def test_pkg_csv_conversion(test_output_dir, separator, size):
     assert output.exists()
     assert output.is_file()
 
+
+@pytest.mark.parametrize("queue_depth", [0, 1, 4])
+def test_pkg_parquet_pipelined_conversion(test_output_dir, queue_depth):
+    """Test parquet conversion with and without the writer thread."""
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+
+    with open(ixf_file, mode="rb") as fo:
+        parser = IXFParser(fo)
+        output = test_output_dir / "result.parquet"
+        with open(output, mode="wb") as out:
+            assert parser.to_parquet(
+                out,
+                batch_size=1,
+                queue_depth=queue_depth
+            ) is True
+
+    assert pq.read_table(output).num_rows == parser.number_rows
+
+
+def test_pkg_background_writer_propagates_errors():
+    """Test that errors of the writer thread reach the parsing thread."""
+
+    def failing_write(item):
+        raise RuntimeError(f"Cannot write {item}")
+
+    with pytest.raises(RuntimeError):
+        with BackgroundWriter(failing_write, queue_depth=2) as pipeline:
+            for i in range(100):
+                pipeline.submit(i)
+
+
+def test_pkg_fan_out_consumer_returning_early():
+    """Test a consumer leaving items unread does not block the producer."""
+    received = []
+
+    def ignore(items):
+        # e.g. an output written with mode="ignore" which already exists
+        return
+
+    def run():
+        with FanOut([ignore, received.extend], queue_depth=1) as fan_out:
+            for i in range(100):
+                fan_out.submit(i)
+
+    producer = Thread(target=run, daemon=True)
+    producer.start()
+    producer.join(timeout=10)
+    assert not producer.is_alive()
+    assert received == list(range(100))
+
+
+@pytest.mark.parametrize("row_group_size, row_groups", [(None, 1), (1, 2)])
+def test_pkg_parquet_row_groups(test_output_dir, row_group_size, row_groups):
+    """Test that batches are coalesced into row groups."""
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+
+    with open(ixf_file, mode="rb") as fo:
+        parser = IXFParser(fo)
+        output = test_output_dir / "result.parquet"
+        assert parser.to_parquet(
+            output,
+            batch_size=1,
+            row_group_size=row_group_size,
+            compression="zstd",
+            compression_level=3,
+            use_dictionary=["CHAR_COL"],
+            write_statistics=False,
+        ) is True
+
+    metadata = pq.ParquetFile(output).metadata
+    assert metadata.num_row_groups == row_groups
+    assert metadata.row_group(0).column(0).compression == "ZSTD"
+
+
+def test_pkg_parquet_dataset_conversion(test_output_dir):
+    """Test partitioned parquet dataset conversion with file rolling."""
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+
+    with open(ixf_file, mode="rb") as fo:
+        parser = IXFParser(fo)
+        output = test_output_dir / "dataset"
+        assert parser.to_parquet_dataset(
+            output,
+            partition_by=["BOOLEAN_COL"],
+            max_rows_per_file=1,
+            existing_data_behavior="delete_matching",
+            batch_size=1,
+        ) is True
+
+    assert sorted(p.name for p in output.iterdir()) == [
+        "BOOLEAN_COL=0", "BOOLEAN_COL=1"
+    ]
+    dataset = ds.dataset(output, partitioning="hive")
+    assert dataset.count_rows() == parser.number_rows
+
+
+def test_pkg_csv_conversion_with_options(test_output_dir):
+    """Test csv conversion with quoting, null, header and binary options."""
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+
+    with open(ixf_file, mode="rb") as fo:
+        parser = IXFParser(fo)
+        output = test_output_dir / "result.csv"
+        with open(output, mode="wb") as out:
+            assert parser.to_csv(
+                out,
+                sep=";",
+                quoting="none",
+                null_string="NULL",
+                header=False,
+                binary_format="hex",
+            ) is True
+
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == parser.number_rows
+    assert b"Sample BLOB Data".hex() in lines[0].split(";")
+
+
+@pytest.mark.parametrize("backend", ["json", "orjson", json.dumps])
+def test_pkg_jsonline_serializer_backends(test_output_dir, backend):
+    """Test json line conversion with the different serializer backends."""
+    if backend == "orjson":
+        pytest.importorskip("orjson")
+
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+
+    with open(ixf_file, mode="rb") as fo:
+        parser = IXFParser(fo)
+        output = test_output_dir / "result.jsonl"
+        assert parser.to_jsonline(
+            output,
+            backend=backend,
+            binary_format="hex",
+        ) is True
+
+    with open(output, mode="rt", encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f]
+
+    assert len(rows) == parser.number_rows
+    assert rows[0]["BLOB_COL"] == b"Sample BLOB Data".hex()
+    assert rows[0]["DATE_COL"] == "2022-01-15"
+
+
+@pytest.mark.parametrize("compression", ["gzip", "bz2", "zstd"])
+def test_pkg_compressed_jsonline_conversion(test_output_dir, compression):
+    """Test compressed json line conversion."""
+    if compression == "zstd":
+        zstandard = pytest.importorskip("zstandard")
+        decompress = zstandard.open
+    else:
+        decompress = {"gzip": gzip.open, "bz2": bz2.open}[compression]
+
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+
+    with open(ixf_file, mode="rb") as fo:
+        parser = IXFParser(fo)
+        output = test_output_dir / f"result.jsonl.{compression}"
+        assert parser.to_jsonline(output, compression=compression) is True
+
+    with decompress(output, mode="rt", encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f]
+
+    assert len(rows) == parser.number_rows
+
+
+def test_pkg_compressed_csv_needs_binary_output(test_output_dir):
+    """Test that compressed csv conversion refuses text file-like objects."""
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+
+    with open(ixf_file, mode="rb") as fo:
+        parser = IXFParser(fo)
+        output = test_output_dir / "result.csv.gz"
+        with open(output, mode="wt", encoding="utf-8") as out:
+            with pytest.raises(ValueError):
+                parser.to_csv(out, compression="gzip")
+
+
+@pytest.mark.parametrize("compression", ["gzip", "bz2", "zstd"])
+def test_pkg_compressed_input(test_output_dir, compression):
+    """Test parsing of a compressed ixf file."""
+    if compression == "zstd":
+        zstandard = pytest.importorskip("zstandard")
+        compress = zstandard.compress
+    else:
+        compress = {"gzip": gzip.compress, "bz2": bz2.compress}[compression]
+
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+    compressed_file = test_output_dir / f"sample.ixf.{compression}"
+    compressed_file.write_bytes(compress(ixf_file.read_bytes()))
+
+    with open(ixf_file, mode="rb") as fo:
+        expected = IXFParser(fo).get_all_rows()
+
+    with open(compressed_file, mode="rb") as fo:
+        parser = IXFParser(fo)
+        assert parser.file_size == compressed_file.stat().st_size
+        assert parser.get_all_rows() == expected
+
+    # Given a path, the parser opens and decompresses the file itself
+    parser = IXFParser(compressed_file)
+    assert parser.to_parquet(test_output_dir / "result.parquet") is True
+    assert parser.number_rows == len(expected)
+
+
+@pytest.mark.parametrize(
+    "method, extension", [
+        ("to_csv", "csv"),
+        ("to_jsonline", "jsonl"),
+        ("to_parquet", "parquet"),
+    ]
+)
+def test_pkg_split_output(test_output_dir, method, extension):
+    """Test splitting the output into several files with a manifest."""
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+    output = test_output_dir / f"split.{extension}"
+
+    parser = IXFParser(ixf_file)
+    assert getattr(parser, method)(output, max_rows_per_file=1) is True
+
+    files = [f"split-0000{i}.{extension}" for i in (1, 2)]
+    assert not output.exists()
+    assert all((test_output_dir / f).is_file() for f in files)
+
+    manifest = json.loads(
+        (test_output_dir / "split.manifest.json").read_text("utf-8")
+    )
+    assert manifest == parser.manifest
+    assert manifest["rows"] == parser.number_rows == 2
+    assert [f["path"] for f in manifest["files"]] == files
+    assert [f["rows"] for f in manifest["files"]] == [1, 1]
+
+    # Splitting needs a path
+    with open(test_output_dir / f"single.{extension}", mode="wb") as out:
+        with pytest.raises(ValueError):
+            getattr(IXFParser(ixf_file), method)(out, max_rows_per_file=1)
+
+
+@pytest.mark.parametrize("compression", [None, "lz4", "zstd"])
+def test_pkg_arrow_ipc_conversion(test_output_dir, compression):
+    """Test Arrow IPC (feather v2) conversion."""
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+    output = test_output_dir / "result.arrow"
+
+    parser = IXFParser(ixf_file)
+    assert parser.to_arrow_ipc(output, compression=compression) is True
+
+    with pa.memory_map(str(output)) as source:
+        table = pa.ipc.open_file(source).read_all()
+    assert table.schema == parser.pyarrow_schema
+    assert table.num_rows == parser.number_rows == 2
+
+
+def test_pkg_orc_conversion(test_output_dir):
+    """Test ORC conversion, time columns are written as strings."""
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+    output = test_output_dir / "result.orc"
+
+    parser = IXFParser(ixf_file)
+    assert parser.to_orc(output, compression="zstd") is True
+
+    table = orc.read_table(output)
+    assert table.num_rows == parser.number_rows == 2
+    assert table.schema.field("TIME_COL").type == pa.string()
+    assert table.column("TIME_COL").to_pylist()[0] == "12:34:56"
+
+
+def test_pkg_convert_to_several_outputs(test_output_dir):
+    """Test parsing once and converting to several outputs."""
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+    delta_dir = test_output_dir / "deltalake"
+    shutil.rmtree(delta_dir, ignore_errors=True)
+
+    parser = IXFParser(ixf_file)
+    assert parser.convert(
+        [
+            test_output_dir / "result.parquet",
+            test_output_dir / "result.csv.gz",
+            {"output": test_output_dir / "result.txt", "format": "jsonline"},
+            {"output": delta_dir, "format": "deltalake"},
+        ]
+    ) is True
+    assert parser.number_rows == 2
+
+    assert pq.read_table(test_output_dir / "result.parquet").num_rows == 2
+    with gzip.open(test_output_dir / "result.csv.gz", mode="rt") as f:
+        assert len(f.read().splitlines()) == 3
+    lines = (test_output_dir / "result.txt").read_text("utf-8").splitlines()
+    assert len(lines) == 2
+    assert DeltaTable(str(delta_dir)).to_pyarrow_table().num_rows == 2
+
+    with pytest.raises(ValueError):
+        IXFParser(ixf_file).convert([test_output_dir / "result.unknown"])
+    # Options of another output format are refused before the parsing
+    parser = IXFParser(ixf_file)
+    with pytest.raises(ValueError, match="`batch_size`"):
+        parser.convert(
+            [{"output": test_output_dir / "refused.csv", "batch_size": 10}]
+        )
+    assert parser.number_rows == 0
+    assert not (test_output_dir / "refused.csv").exists()
+
+
+def test_pkg_convert_propagates_output_errors(test_output_dir):
+    """Test a failing output stops the conversion."""
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+
+    def failing_dumps(obj):
+        raise RuntimeError("boom")
+
+    parser = IXFParser(ixf_file)
+    with pytest.raises(RuntimeError, match="boom"):
+        parser.convert(
+            [
+                test_output_dir / "result.parquet",
+                {
+                    "output": test_output_dir / "result.jsonl",
+                    "backend": failing_dumps,
+                },
+            ]
+        )
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_pkg_convert_many(test_output_dir, workers):
+    """Test converting many files in parallel, failures do not stop it."""
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+    input_dir = test_output_dir / "input"
+    output_dir = test_output_dir / "output"
+    input_dir.mkdir(exist_ok=True)
+    for name in ["first.ixf", "second.ixf"]:
+        shutil.copy(ixf_file, input_dir / name)
+    (input_dir / "broken.ixf").write_bytes(b"not an ixf file")
+    report = test_output_dir / "report.json"
+
+    results = convert_many(
+        str(input_dir / "*.ixf"),
+        output_dir,
+        output_format="jsonline",
+        workers=workers,
+        report=report
+    )
+
+    # Largest files first
+    assert [Path(r["file"]).name for r in results][-1] == "broken.ixf"
+    statuses = {Path(r["file"]).name: r["status"] for r in results}
+    assert statuses == {
+        "first.ixf": "ok", "second.ixf": "ok", "broken.ixf": "failed",
+    }
+    assert results[-1]["error"] is not None
+    assert (output_dir / "first.jsonl").exists()
+
+    summary = json.loads(report.read_text("utf-8"))
+    assert summary["total"]["files"] == 3
+    assert summary["total"]["failed"] == 1
+    assert summary["total"]["rows"] == 4
+
+
+def test_pkg_convert_db2move(test_output_dir):
+    """Test converting a db2move export with a multi-part table."""
+    ixf_data = (RESOURCES_DIR / "data" / "sample.ixf").read_bytes()
+    export_dir = test_output_dir / "export"
+    output_dir = test_output_dir / "output"
+    shutil.rmtree(output_dir, ignore_errors=True)
+    export_dir.mkdir(exist_ok=True)
+    (export_dir / "tab1.ixf").write_bytes(ixf_data)
+    (export_dir / "tab2.ixf.001").write_bytes(ixf_data[:1000])
+    (export_dir / "tab2.ixf.002").write_bytes(ixf_data[1000:])
+    (export_dir / "db2move.lst").write_text(
+        '!"DB2INST1"."EMPLOYEE"!tab1.ixf!tab1.msg!\n'
+        '!"DB2INST1"."SALES"!tab2.ixf!tab2.msg!\n'
+        '!"OTHER"."MISSING"!tab3.ixf!tab3.msg!\n',
+        encoding="utf-8"
+    )
+
+    results = convert_db2move(export_dir, output_dir, workers=2)
+
+    statuses = {(r["schema"], r["table"]): r["status"] for r in results}
+    assert statuses == {
+        ("DB2INST1", "EMPLOYEE"): "ok",
+        ("DB2INST1", "SALES"): "ok",
+        ("OTHER", "MISSING"): "failed",
+    }
+    for table in ["EMPLOYEE", "SALES"]:
+        output = output_dir / "DB2INST1" / f"{table}.parquet"
+        assert pq.read_table(output).num_rows == 2
+
+
+@pytest.mark.parametrize("workers", [None, 3])
+def test_pkg_multi_part_input(test_output_dir, workers):
+    """Test parsing the parts of a file, decoded in parallel or not."""
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+    ixf_data = ixf_file.read_bytes()
+    parts = []
+    # Part 1: header, table, columns and first row, part 2: second row,
+    # part 3: application record
+    for i, (start, end) in enumerate([(0, 16191), (16191, 16663),
+                                      (16663, None)]):
+        part = test_output_dir / f"sample.ixf.00{i + 1}"
+        part.write_bytes(ixf_data[start:end])
+        parts.append(part)
+
+    output = test_output_dir / "parts.arrow"
+    parser = IXFParser(parts, workers=workers)
+    assert parser.to_arrow_ipc(output)
+    assert parser.number_rows == 2
+    assert parser.number_corrupted_rows == 0
+
+    with open(ixf_file, mode="rb") as fo:
+        expected = IXFParser(fo).get_pyarrow_record_batch()
+        expected = pa.Table.from_batches(list(expected))
+    with pa.memory_map(str(output)) as source:
+        assert pa.ipc.open_file(source).read_all().equals(expected)
+
+
+def test_pkg_multi_part_input_needs_valid_workers():
+    """Test the number of processes decoding the parts."""
+    with pytest.raises(ValueError):
+        IXFParser(RESOURCES_DIR / "data" / "sample.ixf", workers=0)
+
+
+def test_pkg_non_seekable_input(test_output_dir):
+    """Test parsing a non-seekable (piped) input."""
+    table = pa.table(
+        {
+            "ID": pa.array(range(5000), pa.int32()),
+            "NAME": [f"n{i:04d}" for i in range(5000)],
+        }
+    )
+    # Larger than the buffer of a pipe (64KB): written while it is read
+    ixf_data = write_ixf(test_output_dir / "piped.ixf", table)
+    assert len(ixf_data) > 64 * 1024
+    read_fd, write_fd = os.pipe()
+
+    def write():
+        with os.fdopen(write_fd, mode="wb") as pipe:
+            pipe.write(ixf_data)
+
+    writer = Thread(target=write)
+    writer.start()
+    output = test_output_dir / "piped.jsonl"
+    with os.fdopen(read_fd, mode="rb") as pipe:
+        parser = IXFParser(pipe)
+        assert parser.to_jsonline(output)
+        assert parser.number_rows == 5000
+        with pytest.raises(IXFParsingError):
+            parser.to_jsonline(output)
+    writer.join()
+
+    assert len(output.read_text(encoding="utf-8").splitlines()) == 5000
+
+
+def test_pkg_import_is_lazy():
+    """Test that importing the parser is fast and skips heavy dependencies."""
+    # Generous budget (seconds), the import takes ~0.1s on a laptop
+    budget = 1.0
+    heavy = [
+        "chardet", "deltalake", "ebcdic", "pyarrow.csv", "pyarrow.dataset",
+        "pyarrow.orc", "pyarrow.parquet",
+    ]
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "from db2ixf import IXFParser\n"
+        "duration = time.perf_counter() - start\n"
+        f"loaded = [m for m in {heavy!r} if m in sys.modules]\n"
+        "print(json.dumps({'duration': duration, 'loaded': loaded}))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True
+    )
+
+    assert result.returncode == 0, result.stderr
+    startup = json.loads(result.stdout)
+    assert startup["loaded"] == []
+    assert startup["duration"] < budget
+
+
+@pytest.mark.parametrize("enabled", [True, False])
+def test_pkg_parser_stats(test_output_dir, enabled):
+    """Test the timings and the throughput of the parsing."""
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+    output = test_output_dir / "stats.csv"
+
+    parser = IXFParser(ixf_file, stats=enabled)
+    assert parser.to_csv(output)
+
+    stats = parser.stats.as_dict()
+    assert stats["rows"] == 2
+    assert stats["bytes_read"] == ixf_file.stat().st_size
+    assert stats["batches"] == 1
+    assert stats["peak_batch_bytes"] > 0
+    assert stats["rows_per_second"] > 0
+    timed = [s for s, t in stats["stages"].items() if t > 0]
+    if enabled:
+        assert set(timed) == {"read", "collect", "decode", "batch", "write"}
+        assert "VARCHAR" in stats["collectors"]
+    else:
+        assert timed == []
+        assert stats["collectors"] == {}
+
+
+def test_pkg_progress_callback(test_output_dir):
+    """Test the progress reported while converting."""
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+    calls = []
+
+    def on_progress(bytes_read, total_bytes, rows, elapsed):
+        calls.append((bytes_read, total_bytes, rows, elapsed))
+
+    parser = IXFParser(ixf_file)
+    assert parser.to_jsonline(
+        test_output_dir / "progress.jsonl", on_progress=on_progress
+    )
+    rows = list(IXFParser(ixf_file).get_row(on_progress=on_progress))
+
+    size = ixf_file.stat().st_size
+    assert len(rows) == 2
+    assert [c[:3] for c in calls] == [(size, size, 2), (size, size, 2)]
+    assert all(c[3] >= 0 for c in calls)
+
+
+def test_pkg_progress_is_throttled():
+    """Test that the progress is reported at most every interval."""
+    calls = []
+    reporter = ProgressReporter(
+        lambda *args: calls.append(args), 100, interval=3600
+    )
+    for i in range(10):
+        reporter.update(i * 10, i)
+    assert calls == []
+
+    reporter.finish(100, 10)
+    assert [c[:3] for c in calls] == [(100, 100, 10)]
+
+    reporter.interval = 0
+    reporter.update(100, 10)
+    assert len(calls) == 2
+
+
+def test_pkg_column_profile():
+    """Test the profile of the collectors of each column."""
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+
+    parser = IXFParser(ixf_file)
+    assert len(list(parser.get_row())) == 2
+    assert parser.column_profile is None
+
+    parser = IXFParser(ixf_file, profile_columns=True)
+    assert len(list(parser.get_row())) == 2
+
+    rows = parser.column_profile.as_rows()
+    assert [r["column"] for r in rows] == [
+        str(c["IXFCNAME"], encoding="utf-8").strip()
+        for c in parser.column_records
+    ]
+    profile = {r["column"]: r for r in rows}
+    assert all(r["calls"] == 2 for r in rows)
+    assert all(r["null_rate"] == 0 and r["errors"] == 0 for r in rows)
+    assert profile["ID"]["avg_bytes"] == 4
+    assert profile["TIMESTAMP_COL"]["avg_bytes"] == 26
+    assert profile["CHAR_COL"]["type"] == "CHAR"
+
+    by_time = parser.column_profile.as_rows("seconds")
+    assert by_time[0]["seconds"] >= by_time[-1]["seconds"]
+
+
+def test_pkg_decoding_fallbacks_are_counted():
+    """Test the count of the cells decoded by a fallback codec."""
+    before = get_fallback_count()
+    assert decode_cell(b"abc", 1252) == "abc"
+    assert get_fallback_count() == before
+    # 0x81 is not defined in cp1252, cp437 decodes it
+    assert decode_cell(b"\x81", 1252) == "ü"
+    assert get_fallback_count() == before + 1
+
+    # The same fallbacks are counted per column in the diagnostics
+    diagnostics = DecodeDiagnostics()
+    column = {"IXFCNAME": b"NAME  "}
+    set_decode_diagnostics(diagnostics)
+    try:
+        assert decode_cell(b"\x81", 1252, c=column) == "ü"
+        assert collect_timestamp(column, b"2024-01-02-03.04.05", 0) == \
+            datetime(2024, 1, 2, 3, 4, 5)
+    finally:
+        set_decode_diagnostics(None)
+    assert get_fallback_count() == before + 3
+    assert diagnostics.counts == {
+        ("NAME", "cp1252 fallback to cp437"): 1,
+        ("NAME", "timestamp without fractional seconds"): 1,
+    }
+
+
+def test_pkg_ixf_conversion(test_output_dir):
+    """Test converting an ixf file to ixf gives back the same rows."""
+    ixf_file = RESOURCES_DIR / "data" / "sample.ixf"
+    output = test_output_dir / "result.ixf"
+
+    assert IXFParser(ixf_file).convert([output]) is True
+
+    rows = list(IXFParser(ixf_file).get_row())
+    parser = IXFParser(output)
+    assert list(parser.get_row()) == rows
+    assert parser.number_corrupted_rows == 0
+
+
+@pytest.mark.parametrize("record_size", [32000, 40])
+def test_pkg_ixf_writer(test_output_dir, record_size):
+    """Test writing arrow record batches in ixf format."""
+    output = test_output_dir / "result.ixf"
+    table = pa.table(
+        {
+            "ID": pa.array([1, 2, 3], pa.int64()),
+            "FLAG": pa.array([True, None, False]),
+            "PRICE": pa.array(
+                [Decimal("1.23"), Decimal("-45.60"), None],
+                pa.decimal128(7, 2)
+            ),
+            "RATIO": pa.array([0.5, None, -2.25], pa.float32()),
+            "CODE": pa.array(["é", "abc", None]),
+            "NOTE": pa.array(["x" * 300, "", None], pa.large_string()),
+            "DATA": pa.array([b"\x00\x01", None, b""]),
+            "DAY": pa.array([date(2024, 1, 2), None, date(1, 1, 1)]),
+            "AT": pa.array(
+                [datetime(2024, 1, 2, 3, 4, 5, 123456), None,
+                 datetime(2000, 1, 1)],
+                pa.timestamp("us", tz="UTC")
+            ),
+            "WIDE": pa.array(
+                [Decimal("1.5"), Decimal("-2.5"), Decimal("3.0")],
+                pa.decimal256(5, 1)
+            ),
+        }
+    )
+    columns = {"CODE": {"type": 452, "length": 5, "code_page": 1252}}
+
+    writer = IXFBatchWriter(
+        output, table.schema, columns=columns, record_size=record_size
+    )
+    for batch in table.to_batches(max_chunksize=2):
+        writer.write(batch)
+    writer.close()
+
+    parser = IXFParser(output)
+    rows = list(parser.get_row())
+    assert [r["ID"] for r in rows] == [1, 2, 3]
+    assert [r["FLAG"] for r in rows] == [1, None, 0]
+    assert rows[1]["PRICE"] == Decimal("-45.60")
+    assert [r["CODE"] for r in rows] == ["é", "abc", None]
+    assert rows[0]["NOTE"] == "x" * 300
+    assert [r["DATA"] for r in rows] == [b"\x00\x01", None, b""]
+    assert rows[2]["DAY"] == date(1, 1, 1)
+    assert rows[0]["AT"] == datetime(2024, 1, 2, 3, 4, 5, 123456)
+    assert [r["WIDE"] for r in rows] == [
+        Decimal("1.5"), Decimal("-2.5"), Decimal("3.0")
+    ]
+    assert int(parser.column_records[4]["IXFCTYPE"]) == 452
+    if record_size == 40:
+        assert max(int(c["IXFCDRID"]) for c in parser.column_records) > 1
+
+    with pytest.raises(ValueError):
+        IXFBatchWriter(output, pa.schema([("L", pa.list_(pa.int8()))]))
+    writer = IXFBatchWriter(
+        output, table.schema, columns={"CODE": {"length": 1}}
+    )
+    with pytest.raises(ValueError):
+        writer.write(table)
+    writer.abort()
+
+
+def test_pkg_corruption_rate_aborts_early(test_output_dir):
+    """Test the parsing stops once the corruption rate is too high."""
+    ixf_file = test_output_dir / "corrupted.ixf"
+    table = pa.table(
+        {
+            "ID": pa.array(range(200), pa.int32()),
+            "NAME": ["ko" if i % 2 else "ok" for i in range(200)],
+        }
+    )
+    data = write_ixf(ixf_file, table, NAME={"length": 5})
+    # Half of the rows get a length exceeding the maximum length
+    ixf_file.write_bytes(data.replace(b"\x02\x00ko", b"\x09\x00ko"))
+
+    parser = IXFParser(
+        ixf_file, accepted_corruption_rate=10, min_sample_size=20
+    )
+    with pytest.raises(IXFParsingError, match="after 20 rows"):
+        list(parser.get_row())
+    assert parser.number_rows == 10
+
+    output = test_output_dir / "corrupted.csv"
+    parts = test_output_dir / "parts.jsonl"
+    dataset = test_output_dir / "corrupted_dataset"
+    shutil.rmtree(dataset, ignore_errors=True)
+    parser = IXFParser(
+        ixf_file, accepted_corruption_rate=10, min_sample_size=150
+    )
+    with pytest.raises(IXFParsingError, match="after 150 rows"):
+        parser.convert(
+            [
+                output,
+                {"output": parts, "max_rows_per_file": 10},
+                {"output": dataset, "format": "parquet_dataset"},
+            ],
+            batch_size=10
+        )
+    # The partial outputs are removed
+    assert not output.exists()
+    assert not list(test_output_dir.glob("parts-*.jsonl"))
+    assert not dataset.exists()
+
+    # The whole file is checked at the end
+    assert IXFParser(ixf_file, accepted_corruption_rate=50).to_csv(output)
+    with pytest.raises(ValueError):
+        IXFParser(ixf_file, accepted_corruption_rate=101)
+
+
+def test_pkg_resync_on_damaged_records(test_output_dir):
+    """Test the parsing resumes after damaged records with `resync`."""
+    ixf_file = test_output_dir / "damaged.ixf"
+    dead_letter = test_output_dir / "damaged.jsonl"
+    table = pa.table(
+        {
+            "ID": pa.array(range(100), pa.int32()),
+            "NAME": [f"n{i:03d}" for i in range(100)],
+            "X": pa.array(range(100), pa.int64()),
+        }
+    )
+    # Three data records per row
+    data = write_ixf(ixf_file, table, record_size=12, NAME={"length": 5})
+    # Damaged length of a data record
+    i = data.rfind(b"D002", 0, data.find(b"n020")) - 6
+    data[i:i + 6] = b"00X016"
+    # Garbage at the end of a row
+    i = data.rfind(b"D001", 0, data.find(b"n041")) - 6
+    data[i:i] = b"garbage!D001" * 3
+    # Length above the maximum length of the column
+    i = data.find(b"n060")
+    data[i - 2:i] = b"\x09\x00"
+    # Truncated last row
+    del data[-5:]
+    ixf_file.write_bytes(data)
+
+    with pytest.raises(IXFParsingError):
+        list(IXFParser(ixf_file).get_row())
+
+    parser = IXFParser(
+        ixf_file, resync=True, dead_letter=dead_letter,
+        accepted_corruption_rate=10
+    )
+    rows = list(parser.get_row())
+    assert [r["ID"] for r in rows] == [
+        i for i in range(100) if i not in (20, 40, 60, 99)
+    ]
+    assert all(r["NAME"] == f"n{r['ID']:03d}" for r in rows)
+    assert parser.number_corrupted_rows == 4
+    assert parser.check_parsing() is True
+
+    # The corrupted rows are counted as they are met, not at the end
+    partial = IXFParser(ixf_file, resync=True, accepted_corruption_rate=10)
+    assert len(list(islice(partial.get_row(), 25))) == 25
+    assert partial.number_corrupted_rows == 1
+
+    entries = [
+        json.loads(line)
+        for line in dead_letter.read_text("utf-8").splitlines()
+    ]
+    assert len(entries) == parser.number_skipped_records
+    assert sum(e["length"] for e in entries) == parser.number_skipped_bytes
+    skipped = {
+        e["offset"]: base64.b64decode(e["data"]) for e in entries
+    }
+    assert all(data[o:o + len(d)] == d for o, d in skipped.items())
+    assert any(b"garbage!" in d for d in skipped.values())
+
+    with pytest.raises(ValueError):
+        IXFParser(ixf_file, dead_letter=dead_letter)
+
+
+def test_pkg_validate(test_output_dir):
+    """Test the structural validation of ixf files."""
+    parser = IXFParser(RESOURCES_DIR / "data" / "sample.ixf")
+    result = parser.validate()
+    assert result["valid"] is True
+    assert result["rows"] == 2
+    assert result["problems"] == []
+    # The file can still be parsed
+    assert len(list(parser.get_row())) == 2
+
+    # A null in the last varying column of a data record ends the record
+    # with its null indicator
+    nulls_file = test_output_dir / "nulls.ixf"
+    table = pa.table({"ID": pa.array([1, 2], pa.int32()), "NOTE": ["a", None]})
+    write_ixf(nulls_file, table)
+    result = IXFParser(nulls_file).validate()
+    assert result["valid"] is True, result["problems"]
+    assert result["rows"] == 2
+    rows = IXFParser(nulls_file).get_row()
+    assert [r["NOTE"] for r in rows] == ["a", None]
+
+    ixf_file = test_output_dir / "invalid.ixf"
+    table = pa.table(
+        {
+            "ID": pa.array(range(10), pa.int32()),
+            "NAME": [f"n{i:03d}" for i in range(10)],
+        }
+    )
+    data = write_ixf(ixf_file, table, record_size=6, NAME={"length": 5})
+    # Length above the maximum length of the column
+    length = data.find(b"n003") - 2
+    data[length:length + 2] = b"\x09\x00"
+    # Data record of the wrong record id
+    record = data.rfind(b"D002", 0, data.find(b"n006")) - 6
+    data[record + 7:record + 10] = b"001"
+    # Truncated last record
+    del data[-3:]
+    ixf_file.write_bytes(data)
+
+    result = IXFParser(ixf_file).validate()
+    assert result["valid"] is False
+    assert result["complete"] is True
+    assert [p["offset"] for p in result["problems"]] == [
+        length, record, record + 22, len(data) - 19
+    ]
+    assert "exceeds the maximum length 5" in result["problems"][0]["problem"]
+    assert "Truncated record" in result["problems"][-1]["problem"]
+
+    result = IXFParser(ixf_file).validate(max_problems=2)
+    assert result["complete"] is False
+    assert len(result["problems"]) == 2
+
+
+def test_pkg_decode_diagnostics(test_output_dir, caplog):
+    """Test the decoding problems are counted instead of logged per cell."""
+    ixf_file = test_output_dir / "diagnostics.ixf"
+    table = pa.table(
+        {
+            "ID": pa.array(range(100), pa.int32()),
+            "NAME": [f"n{i:03d}" for i in range(100)],
+        }
+    )
+    data = write_ixf(ixf_file, table, NAME={"length": 5, "code_page": 1252})
+    # Undefined in cp1252: decoded by the cp437 fallback
+    for i in range(0, 60, 2):
+        data = data.replace(f"n{i:03d}".encode(), b"\x81%03d" % i)
+    # Length above the maximum length of the column: the row is lost
+    for i in range(1, 11, 2):
+        data = data.replace(
+            b"\x04\x00" + f"n{i:03d}".encode(), b"\x09\x00n000"
+        )
+    ixf_file.write_bytes(data)
+
+    caplog.set_level(logging.DEBUG, logger="db2ixf")
+    parser = IXFParser(ixf_file, accepted_corruption_rate=10)
+    rows = list(parser.get_row())
+    assert len(rows) == 95
+    assert rows[0]["NAME"] == "ü000"
+
+    diagnostics = parser.decode_diagnostics
+    assert diagnostics.counts == {
+        ("NAME", "cp1252 fallback to cp437"): 30,
+        ("NAME", "DataCollectorError"): 5,
+    }
+    assert len(diagnostics.samples) == 10
+    assert diagnostics.as_dict()["total"] == 35
+
+    # One line per column and kind, plus the examples
+    messages = [
+        r.getMessage() for r in caplog.records if "Column NAME" in
+        r.getMessage()
+    ]
+    assert len(messages) == 2
+    assert sum("Example" in r.getMessage() for r in caplog.records) == 10
+
+
+def test_pkg_skip_application_records(test_output_dir):
+    """Test the application records and unknown records are skipped."""
+    ixf_file = test_output_dir / "application.ixf"
+    table = pa.table(
+        {
+            "ID": pa.array(range(20), pa.int32()),
+            "NAME": [f"n{i:03d}" for i in range(20)],
+        }
+    )
+    write_ixf(ixf_file, table)
+
+    application = make_record(
+        APPLICATION_RECORD_TYPE,
+        {"IXFARECT": b"A", "IXFAPPID": b"APP"},
+        b"application data"
+    )
+    unknown = make_record(APPLICATION_RECORD_TYPE, {"IXFARECT": b"Z"})
+    data = ixf_file.read_bytes()
+    table_record = 6 + int(data[:6])
+    column_record = table_record + 6 + int(data[table_record:][:6])
+    data_record = data.find(b"D001") - 6
+    middle = data.rfind(b"D001", 0, data.find(b"n010")) - 6
+    data = data[:table_record] + application + data[table_record:middle] \
+        + unknown + application + data[middle:] + application
+    data = data[:column_record + len(application)] + application \
+        + data[column_record + len(application):]
+    data = data[:data_record + 2 * len(application)] + unknown \
+        + data[data_record + 2 * len(application):]
+    ixf_file.write_bytes(data)
+
+    assert IXFParser(ixf_file).validate()["valid"] is True
+
+    skipped = []
+    parser = IXFParser(ixf_file, on_skipped_record=skipped.append)
+    rows = list(parser.get_row())
+    assert rows == [
+        {"ID": i, "NAME": f"n{i:03d}"} for i in range(20)
+    ]
+    assert parser.number_application_records == 6
+    assert skipped.count(application) == 4
+    assert skipped.count(unknown) == 2
+
+    parser = IXFParser(ixf_file, resync=True)
+    assert len(list(parser.get_row())) == 20
+    assert parser.number_corrupted_rows == 0
+
+
+def test_pkg_decimal_31_digits(test_output_dir):
+    """Test decimals of 31 digits are read without rounding."""
+    output = test_output_dir / "decimals.ixf"
+    values = [
+        Decimal("1234567890123456789012345678.901"),
+        Decimal("-9999999999999999999999999999.999"),
+        Decimal("0.001"),
+    ]
+    table = pa.table({"AMOUNT": pa.array(values, pa.decimal128(31, 3))})
+    write_ixf(output, table)
+
+    rows = list(IXFParser(output).get_row())
+    assert [r["AMOUNT"] for r in rows] == values
+    assert str(rows[0]["AMOUNT"]) == "1234567890123456789012345678.901"
+
+
+def test_pkg_admit_task():
+    """Test the conversions are admitted within the memory budget."""
+    sizes = [100, 60, 30]
+    assert admit_task([0, 1, 2], sizes, 0, 0, None) == 0
+    # A task always runs when nothing else runs
+    assert admit_task([0, 1, 2], sizes, 0, 0, 50) == 0
+    assert admit_task([1, 2], sizes, 1, 100, 150) == 2
+    assert admit_task([1], sizes, 1, 100, 150) is None
+
+
+@pytest.mark.parametrize("tz", [None, "UTC", "Europe/Paris"])
+def test_pkg_json_timestamps(tz):
+    """Test the json timestamps are the iso format of the datetimes."""
+    values = pa.array(
+        [datetime(2024, 1, 1, 1, 2, 3), datetime(2024, 7, 1, 1, 2, 3, 123456),
+         None],
+        pa.timestamp("us", tz=tz)
+    )
+    expected = [v and v.isoformat() for v in values.to_pylist()]
+    assert format_json_column(values).to_pylist() == expected
+
+
+def test_pkg_multi_part_input_closed_early(test_output_dir):
+    """Test stopping the parallel decoding while the workers are blocked."""
+    ixf_data = (RESOURCES_DIR / "data" / "sample.ixf").read_bytes()
+    parts = []
+    # Every part after the first one holds the second row repeated more
+    # times than the batches buffered by a worker
+    for i, data in enumerate([ixf_data[:16191]]
+                             + [ixf_data[16191:16663] * 50] * 3):
+        part = test_output_dir / f"early.ixf.00{i + 1}"
+        part.write_bytes(data)
+        parts.append(part)
+
+    parser = IXFParser(parts, workers=2)
+    batches = parser.get_pyarrow_record_batch(batch_size=1)
+    assert sum(b.num_rows for b in islice(batches, 10)) == 10
+    batches.close()
+
+    parser = IXFParser(parts, workers=2)
+    rows = parser.get_pyarrow_record_batch(batch_size=7)
+    assert sum(b.num_rows for b in rows) == 151
+    assert parser.number_rows == 151
+
+
 # parquet_param_data = [
 #     ("1.0", None), ("2.4", None), ("2.6", None),
 #     ("1.0", 100), ("2.4", 100), ("2.6", 100),